@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'core',
     'user',
     'recipe',
@@ -47,7 +48,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Đầu tiên để đo cả thời gian của các middleware phía sau.
+    'core.middleware.RequestTimingMiddleware',
+    # Nén body cuối cùng, sau khi mọi middleware phía sau đã xử lý xong.
+    'core.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Đọc từ read replica cho request an toàn (xem core.db_router).
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -80,16 +87,172 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# Connection pool của mỗi process (core.db_pool). DB_POOL_MAX_SIZE=0 tắt
+# pool và dùng backend postgresql mặc định. Connection rảnh quá
+# DB_POOL_CHECK_INTERVAL giây được ping (SELECT 1) trước khi dùng lại.
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 20))
+DB_POOL = {
+    'max_size': DB_POOL_MAX_SIZE,
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 5)),
+    'check_interval': float(os.environ.get('DB_POOL_CHECK_INTERVAL', 30)),
+    'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', 1800)),
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql', # ENGINE: Định nghĩa loại cơ sở dữ liệu, ở đây là PostgreSQL
+        'ENGINE': (
+            'core.backends.postgresql_pool' if DB_POOL_MAX_SIZE
+            else 'django.db.backends.postgresql'
+        ), # ENGINE: Định nghĩa loại cơ sở dữ liệu, ở đây là PostgreSQL
         'HOST': os.environ.get('DB_HOST'), #os.environ.get(...): Lấy giá trị từ biến môi trường, đảm bảo bảo mật và linh hoạt cho nhiều môi trường (dev, production).
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        # Với pool, Django "đóng" connection (trả về pool) cuối mỗi request;
+        # không có pool thì giữ connection của mỗi thread DB_CONN_MAX_AGE giây.
+        'CONN_MAX_AGE': 0 if DB_POOL_MAX_SIZE else int(
+            os.environ.get('DB_CONN_MAX_AGE', 60)
+        ),
+        'POOL': DB_POOL,
     }
 }
 
+# Read replica: DB_REPLICA_HOSTS là danh sách host, cách nhau bởi dấu phẩy.
+# Replica dùng cùng tên DB/user/mật khẩu với primary nếu không đặt riêng;
+# khi chạy test, replica đọc chính test DB của primary (MIRROR).
+DB_REPLICAS = []
+for index, host in enumerate(
+    filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(','))
+):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'NAME': os.environ.get(
+            'DB_REPLICA_NAME', DATABASES['default']['NAME']
+        ),
+        'USER': os.environ.get(
+            'DB_REPLICA_USER', DATABASES['default']['USER']
+        ),
+        'PASSWORD': os.environ.get(
+            'DB_REPLICA_PASS', DATABASES['default']['PASSWORD']
+        ),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DB_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+# Sau một request ghi, client đọc từ primary trong chừng ấy giây (nên lớn
+# hơn độ trễ replication). Cache phải dùng chung giữa các process/server
+# thì stickiness mới đúng với nhiều worker: mặc định 'default' là
+# LocMemCache riêng từng process, khi WEB_CONCURRENCY > 1 đặt
+# DB_REPLICA_STICKY_CACHE thành alias cache chung (core.checks, W002).
+DB_REPLICA_STICKY_SECONDS = float(
+    os.environ.get('DB_REPLICA_STICKY_SECONDS', 5)
+)
+DB_REPLICA_STICKY_CACHE = os.environ.get('DB_REPLICA_STICKY_CACHE', 'default')
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+# Số worker process phục vụ request (uWSGI processes, uvicorn workers).
+# Dùng cho core.checks: cache riêng từng process không an toàn khi > 1.
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Cache token -> user cho CachedTokenAuthentication.
+    # LocMemCache loại bỏ entry ít dùng nhất (LRU) khi vượt MAX_ENTRIES.
+    # LocMemCache riêng cho từng process: xóa token hay khóa user chỉ
+    # invalidate cache của worker xử lý thay đổi, worker khác vẫn chấp nhận
+    # tới hết TOKEN_CACHE_TTL. Chạy nhiều worker thì dùng cache chung
+    # (TOKEN_CACHE_BACKEND), xem core.checks.
+    'auth_tokens': {
+        'BACKEND': os.environ.get(
+            'TOKEN_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('TOKEN_CACHE_LOCATION', 'auth-tokens'),
+        'TIMEOUT': int(os.environ.get('TOKEN_CACHE_TTL', 300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES', 10000)),
+        },
+    },
+    # Cache response list/retrieve của RecipeViewSet, theo từng user.
+    'recipe_responses': {
+        'BACKEND': os.environ.get(
+            'RECIPE_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('RECIPE_CACHE_LOCATION', 'recipe-responses'),
+        'TIMEOUT': int(os.environ.get('RECIPE_CACHE_TTL', 300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('RECIPE_CACHE_MAX_ENTRIES', 5000)),
+        },
+    },
+    # Bucket của throttle (core.throttling): một số float mỗi key. Dùng
+    # cache chung (Redis, memcached) để giới hạn chung cho mọi process.
+    'throttle': {
+        'BACKEND': os.environ.get(
+            'THROTTLE_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('THROTTLE_CACHE_LOCATION', 'throttle'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(
+                os.environ.get('THROTTLE_CACHE_MAX_ENTRIES', 100000)
+            ),
+        },
+    },
+}
+
+TOKEN_AUTH_CACHE = 'auth_tokens'
+RECIPE_RESPONSE_CACHE = 'recipe_responses'
+THROTTLE_CACHE = 'throttle'
+
+
+# Password hashing
+# PASSWORD_HASHER chọn hasher cho mật khẩu mới: argon2 (mặc định), bcrypt
+# hoặc pbkdf2. Các hasher còn lại vẫn kiểm tra được hash cũ, và hash cũ
+# được hash lại bằng hasher ưu tiên khi user đăng nhập.
+PASSWORD_HASHER_CHOICES = {
+    'argon2': 'core.hashers.Argon2PasswordHasher',
+    'bcrypt': 'core.hashers.BCryptSHA256PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'argon2')
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    hasher for name, hasher in PASSWORD_HASHER_CHOICES.items()
+    if name != PASSWORD_HASHER
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Chi phí Argon2id (mặc định theo OWASP) và số vòng bcrypt.
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get('PASSWORD_ARGON2_TIME_COST', 2))
+PASSWORD_ARGON2_MEMORY_COST = int(
+    os.environ.get('PASSWORD_ARGON2_MEMORY_COST', 19456)  # KiB
+)
+PASSWORD_ARGON2_PARALLELISM = int(
+    os.environ.get('PASSWORD_ARGON2_PARALLELISM', 1)
+)
+PASSWORD_BCRYPT_ROUNDS = int(os.environ.get('PASSWORD_BCRYPT_ROUNDS', 12))
+
+# Thread pool băm mật khẩu (core.hashing): số worker, số việc chờ tối đa,
+# và số giây chờ chỗ trống trước khi trả 503.
+PASSWORD_HASH_WORKERS = int(
+    os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+)
+PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', 64))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(
+    os.environ.get('PASSWORD_HASH_QUEUE_TIMEOUT', 5)
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -137,6 +300,83 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # chỉ định model User trong app core được sử dụng cho xác thực
 AUTH_USER_MODEL = 'core.User'
 
+# Browsable API (HTML) chỉ bật khi DEBUG hoặc API_BROWSABLE=1: production
+# không load renderer và template của nó.
+API_BROWSABLE = bool(int(os.environ.get('API_BROWSABLE', int(DEBUG))))
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-}
\ No newline at end of file
+    # JSON bằng orjson và MessagePack, chọn theo Accept/Content-Type.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'core.renderers.MessagePackRenderer',
+    ] + (
+        ['rest_framework.renderers.BrowsableAPIRenderer']
+        if API_BROWSABLE else []
+    ),
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'core.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Giới hạn theo throttle_scope của view, xem THROTTLE_RATES.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.ScopedTokenBucketThrottle',
+    ],
+    # Số reverse proxy tin cậy đứng trước app. 0: IP của client là
+    # REMOTE_ADDR, X-Forwarded-For (client tự đặt được) bị bỏ qua; đặt
+    # đúng số proxy thì throttle theo IP lấy IP từ X-Forwarded-For.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+}
+
+# Throttle: mỗi scope một token bucket cho từng user (IP nếu chưa đăng
+# nhập). '20/min' là tối đa 20 request liền nhau, sau đó một request mỗi
+# 3 giây. Biến môi trường rỗng bỏ giới hạn của scope; THROTTLE_ENABLED=0
+# tắt hẳn (benchmark tải).
+THROTTLE_ENABLED = bool(int(os.environ.get('THROTTLE_ENABLED', 1)))
+THROTTLE_RATES = {
+    # Cấp token (băm mật khẩu, dò mật khẩu) và tạo user: chặt.
+    'token': os.environ.get('THROTTLE_RATE_TOKEN', '20/min') or None,
+    'user-create': (
+        os.environ.get('THROTTLE_RATE_USER_CREATE', '20/min') or None
+    ),
+    'user': os.environ.get('THROTTLE_RATE_USER', '120/min') or None,
+    # Đọc recipe (list, retrieve, export, stats): rộng.
+    'recipe-read': (
+        os.environ.get('THROTTLE_RATE_RECIPE_READ', '600/min') or None
+    ),
+    'recipe-write': (
+        os.environ.get('THROTTLE_RATE_RECIPE_WRITE', '120/min') or None
+    ),
+}
+
+# Nén response (core.middleware.CompressionMiddleware): gzip, cùng brotli và
+# zstd nếu đã cài package brotli/zstandard. Body nhỏ hơn COMPRESSION_MIN_SIZE
+# byte gửi nguyên; response stream luôn được nén.
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_CONTENT_TYPES = [
+    'application/json',
+    'application/msgpack',
+    'application/x-ndjson',
+    'application/vnd.oai.openapi',
+    'application/javascript',
+    'text/csv',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/javascript',
+    'image/svg+xml',
+]
+
+# Bulk recipe endpoint (/api/recipe/recipes/bulk/)
+# Số dòng mỗi câu INSERT/UPDATE và số item tối đa mỗi request.
+RECIPE_BULK_BATCH_SIZE = int(os.environ.get('RECIPE_BULK_BATCH_SIZE', 500))
+RECIPE_BULK_MAX_ITEMS = int(os.environ.get('RECIPE_BULK_MAX_ITEMS', 10000))
+
+# Số request của view async (recipe.async_views) được dùng DB cùng lúc
+# trong mỗi process, để không vượt max_connections của Postgres.
+ASYNC_DB_CONCURRENCY = int(os.environ.get('ASYNC_DB_CONCURRENCY', 20))
+
+# Số dòng đọc mỗi lần từ server-side cursor khi export recipes.
+RECIPE_EXPORT_CHUNK_SIZE = int(os.environ.get('RECIPE_EXPORT_CHUNK_SIZE', 2000))
@@ -18,6 +18,8 @@ from rest_framework import permissions
 from django.contrib import admin
 from django.urls import path, include
 
+from core.views import DatabasePoolStatsView, MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
@@ -25,4 +27,11 @@ urlpatterns = [
     path('api/user/', include('user.urls')),
     # Include URLs của recipe app với prefix /api/recipe/.
     path('api/recipe/', include('recipe.urls')),
+    # Thống kê connection pool của DB (staff).
+    path(
+        'api/db/pool-stats/', DatabasePoolStatsView.as_view(),
+        name='db-pool-stats',
+    ),
+    # Histogram thời gian request theo URL name (Prometheus, staff).
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ]
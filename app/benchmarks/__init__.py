@@ -0,0 +1,6 @@
+"""
+    Benchmarks cho API.
+
+    Không chạy cùng test thường (file tên bench_*.py), chạy riêng bằng:
+        python manage.py test benchmarks --pattern="bench_*.py"
+"""
@@ -0,0 +1,345 @@
+"""
+    Benchmark tải cho REST API: token, create, list, retrieve và me.
+
+    Seed --users user, mỗi user --recipes recipe (dùng lại nếu đã có), rồi
+    với mỗi kịch bản mở --connections kết nối keep-alive cùng lúc trong
+    --duration giây, mỗi kết nối đóng vai một user (token riêng). Kết quả
+    (RPS, p50/p95/p99) ghi ra JSON; với --baseline thì so với một file kết
+    quả cũ và exit 1 nếu có kịch bản chậm đi quá --threshold.
+
+    Kịch bản create ghi thêm recipe vào DB, nên dùng DB riêng cho benchmark.
+    Chạy trong thư mục app, với DB đã migrate:
+        python -m benchmarks.apibench --output bench.json
+        python -m benchmarks.apibench --baseline bench.json
+        python -m benchmarks.apibench --compare new.json --baseline old.json
+
+    --server uwsgi (mặc định) chạy uWSGI như production; --server inprocess
+    chạy server WSGI đa thread của Django trong chính process này (không
+    cần uWSGI, nhưng client và server tranh GIL); --url đo server có sẵn.
+"""
+import argparse
+import asyncio
+import collections
+import datetime
+import json
+import os
+import random
+import sys
+import threading
+from urllib.parse import urlsplit
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+# Mọi kết nối đến từ 127.0.0.1 (cả server uWSGI khởi chạy từ đây): tắt
+# throttle, trừ khi đặt rõ THROTTLE_ENABLED.
+os.environ.setdefault('THROTTLE_ENABLED', '0')
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.core.servers.basehttp import (  # noqa: E402
+    ThreadedWSGIServer, WSGIRequestHandler,
+)
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+
+from benchmarks.loadtest import (  # noqa: E402
+    connection_loop, raise_open_files_limit, start_server, summarize,
+)
+from core.models import Recipe  # noqa: E402
+
+PASSWORD = 'benchpass123'
+EMAIL = 'bench{}@example.com'
+SCENARIOS = ['token', 'create', 'list', 'retrieve', 'me']
+# Chỉ số cao hơn là tốt hơn (rps) hay thấp hơn là tốt hơn (độ trễ).
+METRICS = {'rps': True, 'p50_ms': False, 'p95_ms': False, 'p99_ms': False}
+
+
+def seed(users, recipes):
+    """Create the benchmark users, tokens and recipes that are missing.
+
+    Trả về list (email, token, [recipe id]) cho mỗi user.
+    """
+    User = get_user_model()
+    emails = [EMAIL.format(i) for i in range(users)]
+    existing = set(
+        User.objects.filter(email__in=emails).values_list('email', flat=True)
+    )
+    # Băm mật khẩu một lần cho mọi user: Argon2 tốn hàng chục ms mỗi lần.
+    password = make_password(PASSWORD)
+    User.objects.bulk_create(
+        User(email=email, name='Bench', password=password)
+        for email in emails if email not in existing
+    )
+    accounts = list(User.objects.filter(email__in=emails).order_by('id'))
+    with_token = set(
+        Token.objects.filter(user__in=accounts)
+        .values_list('user_id', flat=True)
+    )
+    Token.objects.bulk_create(
+        Token(user=user, key=Token.generate_key())
+        for user in accounts if user.pk not in with_token
+    )
+
+    recipe_ids = {user.pk: [] for user in accounts}
+    for user_id, recipe_id in Recipe.objects.filter(
+        user__in=accounts
+    ).values_list('user_id', 'id'):
+        recipe_ids[user_id].append(recipe_id)
+    missing = [
+        Recipe(
+            user=user, title=f'Bench recipe {i}', time_minutes=i % 120 + 1,
+            price=f'{i % 50}.99', description='Seeded for benchmarks.',
+        )
+        for user in accounts
+        for i in range(len(recipe_ids[user.pk]), recipes)
+    ]
+    added = collections.Counter(recipe.user_id for recipe in missing)
+    for recipe in Recipe.objects.bulk_create(missing, batch_size=5000):
+        recipe_ids[recipe.user_id].append(recipe.pk)
+    for user in accounts:
+        User.objects.touch_recipes(user.pk, added[user.pk])
+
+    tokens = dict(
+        Token.objects.filter(user__in=accounts)
+        .values_list('user_id', 'key')
+    )
+    return [
+        (user.email, tokens[user.pk], recipe_ids[user.pk])
+        for user in accounts
+    ]
+
+
+def request_factory(scenario, netloc, account):
+    """Return a function building the next raw request of scenario."""
+    email, token, recipe_ids = account
+    body = b''
+    method, path = 'GET', '/api/recipe/recipes/'
+    if scenario == 'token':
+        method, path = 'POST', '/api/user/token/'
+        body = json.dumps({'email': email, 'password': PASSWORD}).encode()
+    elif scenario == 'create':
+        method = 'POST'
+        body = json.dumps({
+            'title': 'Bench create', 'time_minutes': 10, 'price': '4.50',
+        }).encode()
+    elif scenario == 'me':
+        path = '/api/user/me/'
+
+    head = (
+        f'Host: {netloc}\r\n'
+        'Accept: application/json\r\n'
+        'Connection: keep-alive\r\n'
+    )
+    if scenario != 'token':
+        head += f'Authorization: Token {token}\r\n'
+    if body:
+        head += (
+            'Content-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n'
+        )
+    if scenario == 'retrieve':
+        # Mỗi request đọc một recipe ngẫu nhiên của user.
+        return lambda: (
+            f'GET {path}{random.choice(recipe_ids)}/ HTTP/1.1\r\n'
+            f'{head}\r\n'
+        ).encode()
+    request = f'{method} {path} HTTP/1.1\r\n{head}\r\n'.encode() + body
+    return lambda: request
+
+
+async def run_scenario(scenario, base_url, accounts, connections, duration):
+    """Drive one scenario, each connection acting as one user."""
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    result = {'latencies': [], 'errors': 0}
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    start = loop.time()
+    await asyncio.gather(*(
+        connection_loop(
+            host, port,
+            request_factory(
+                scenario, parts.netloc, accounts[index % len(accounts)]
+            ),
+            deadline, result,
+        )
+        for index in range(connections)
+    ))
+    result['elapsed'] = loop.time() - start
+    return result
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """Request handler without one log line per request."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_inprocess_server(port):
+    """Serve the project from a thread of this process."""
+    server = ThreadedWSGIServer(('127.0.0.1', port), QuietRequestHandler)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(args):
+    """Seed the data, run every scenario and return the results."""
+    accounts = seed(args.users, args.recipes)
+    raise_open_files_limit(args.connections)
+    server = process = None
+    base_url = args.url
+    if base_url is None:
+        base_url = f'http://127.0.0.1:{args.port}'
+        if args.server == 'uwsgi':
+            process = start_server(
+                'wsgi', args.port, args.workers, args.connections
+            )
+        else:
+            server = start_inprocess_server(args.port)
+
+    results = []
+    try:
+        for scenario in args.scenarios:
+            # Làm nóng (import, connection DB, cache) trước khi đo.
+            asyncio.run(run_scenario(scenario, base_url, accounts, 4, 1))
+            raw = asyncio.run(run_scenario(
+                scenario, base_url, accounts, args.connections, args.duration
+            ))
+            results.append(summarize(scenario, raw))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    return {
+        'created_at': datetime.datetime.now(datetime.timezone.utc)
+        .isoformat(timespec='seconds'),
+        'config': {
+            'users': args.users,
+            'recipes_per_user': args.recipes,
+            'connections': args.connections,
+            'duration': args.duration,
+            'server': 'url' if args.url else args.server,
+            'workers': args.workers,
+            'database': settings.DATABASES['default']['ENGINE'],
+            'python': sys.version.split()[0],
+            'django': django.get_version(),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Return one row per scenario and metric present in both runs.
+
+    Mỗi dòng là (scenario, metric, baseline, current, thay đổi tương đối,
+    có bị chậm đi quá threshold hay không). Số request lỗi tăng cũng là
+    regression.
+    """
+    previous = {row['scenario']: row for row in baseline['results']}
+    rows = []
+    for row in current['results']:
+        old = previous.get(row['scenario'])
+        if old is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before, after = old.get(metric), row.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            rows.append((
+                row['scenario'], metric, before, after, change,
+                worse > threshold,
+            ))
+        if row['errors'] > old['errors']:
+            rows.append((
+                row['scenario'], 'errors', old['errors'], row['errors'],
+                None, True,
+            ))
+    return rows
+
+
+def print_results(report):
+    columns = ['scenario', 'requests', 'errors', 'rps', 'mean_ms',
+               'p50_ms', 'p95_ms', 'p99_ms']
+    print(''.join(f'{column:>12}' for column in columns))
+    for row in report['results']:
+        print(''.join(f'{str(row[column]):>12}' for column in columns))
+
+
+def print_comparison(rows):
+    print(f'{"scenario":>12}{"metric":>10}{"baseline":>12}{"current":>12}'
+          f'{"change":>10}')
+    for scenario, metric, before, after, change, regressed in rows:
+        change = '' if change is None else f'{change:+.1%}'
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{scenario:>12}{metric:>10}{before:>12}{after:>12}'
+              f'{change:>10}{flag}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--recipes', type=int, default=50,
+                        help='recipes per user')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        type=lambda value: value.split(','))
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--server', choices=['uwsgi', 'inprocess'],
+                        default='uwsgi')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--port', type=int, default=8003)
+    parser.add_argument('--url', help='base URL of a running server')
+    parser.add_argument('--output', help='write the results JSON here')
+    parser.add_argument('--baseline', help='results JSON to compare with')
+    parser.add_argument('--compare', metavar='RESULTS',
+                        help='compare this results JSON instead of running')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='allowed relative slowdown (default 0.10)')
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f'unknown scenarios: {", ".join(sorted(unknown))}')
+    if args.compare and not args.baseline:
+        parser.error('--compare needs --baseline')
+
+    if args.compare:
+        with open(args.compare) as file:
+            report = json.load(file)
+    else:
+        report = run(args)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    print_results(report)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        rows = compare(report, baseline, args.threshold)
+        print()
+        # So hai lần chạy khác cấu hình (số kết nối, server...) thì vô nghĩa.
+        changed = [
+            key for key, value in report['config'].items()
+            if baseline.get('config', {}).get(key) != value
+        ]
+        if changed:
+            print(f'warning: config differs from baseline: '
+                  f'{", ".join(changed)}')
+        print_comparison(rows)
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark CPU cost and ratio of the response compression codecs."""
+import zlib
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from benchmarks.utils import median_time
+from core import compression
+from core.models import Recipe
+from recipe.exports import EXPORT_FORMATS
+
+ROWS = 10_000
+MIN_RATIO = 3
+MAX_MS_PER_MB = 50
+
+
+class CompressionBenchmark(TestCase):
+    """Compress a recipe export one-shot and streamed with every codec."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email='bench@example.com', password='benchpass123'
+        )
+        Recipe.objects.bulk_create(
+            (
+                Recipe(
+                    user=user,
+                    title=f'Recipe {i}',
+                    description='Sample description ' * 5,
+                    time_minutes=i % 120,
+                    price=Decimal(i % 1000) / 100,
+                    link=f'http://example.com/recipes/{i}',
+                )
+                for i in range(ROWS)
+            ),
+            batch_size=5000,
+        )
+
+    def export_rows(self, export_type):
+        """Return the export body as the per-row chunks the view streams."""
+        iter_rows, _ = EXPORT_FORMATS[export_type]
+        return [
+            row.encode() for row in iter_rows(
+                Recipe.objects.order_by('id'),
+                settings.RECIPE_EXPORT_CHUNK_SIZE,
+            )
+        ]
+
+    def test_codecs(self):
+        chunks = self.export_rows('ndjson')
+        payload = b''.join(chunks)
+        megabytes = len(payload) / 1024 / 1024
+
+        print(f'\n{len(payload) / 1024:.0f}KiB ndjson, '
+              f'{len(chunks)} rows:')
+        for name, codec in compression.CODECS.items():
+            for mode, func in (
+                ('one-shot', lambda: codec.compress(payload)),
+                ('stream', lambda: b''.join(codec.stream(iter(chunks)))),
+            ):
+                ratio = len(payload) / len(func())
+                ms_per_mb = median_time(func, repeat=5) * 1000 / megabytes
+                print(f'  {name:<5} {mode:<9} {ms_per_mb:6.1f}ms/MB '
+                      f'ratio {ratio:5.1f}x')
+                with self.subTest(codec=name, mode=mode):
+                    self.assertGreaterEqual(ratio, MIN_RATIO)
+                    self.assertLessEqual(ms_per_mb, MAX_MS_PER_MB)
+
+    def test_small_body_window(self):
+        """A size-fitted window is cheaper than zlib's default setup."""
+        body = b''.join(self.export_rows('ndjson'))[:2048]
+
+        def default_window():
+            compressor = zlib.compressobj(
+                compression.GZIP_LEVEL, zlib.DEFLATED, 16 + 15
+            )
+            return compressor.compress(body) + compressor.flush()
+
+        fitted = median_time(
+            lambda: compression.CODECS['gzip'].compress(body), repeat=2000
+        )
+        default = median_time(default_window, repeat=2000)
+        print(f'\n2KiB gzip: fitted window {fitted * 1e6:.1f}µs, '
+              f'default window {default * 1e6:.1f}µs')
+
+        self.assertLess(fitted, default)
@@ -0,0 +1,79 @@
+"""Benchmark memory use of the streaming recipe export."""
+import os
+import resource
+import tracemalloc
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+
+export_url = reverse('recipe:recipe-export')
+
+ROWS = int(os.environ.get('BENCH_EXPORT_ROWS', 1_000_000))
+# Bộ nhớ Python tối đa khi stream, không phụ thuộc số dòng.
+MAX_PEAK_BYTES = 50 * 1024 * 1024
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process (ru_maxrss is in KiB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RecipeExportMemoryBenchmark(TestCase):
+    """Exporting 1M recipes keeps memory flat."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='bench@example.com', password='benchpass123'
+        )
+        Recipe.objects.bulk_create(
+            (
+                Recipe(
+                    user=cls.user,
+                    title=f'Recipe {i}',
+                    description='Sample description ' * 5,
+                    time_minutes=i % 120,
+                    price=Decimal('5.00'),
+                )
+                for i in range(ROWS)
+            ),
+            batch_size=5000,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def consume(self, params):
+        """Stream the export and return (rows, bytes, peak traced bytes)."""
+        rss_before = peak_rss_bytes()
+        tracemalloc.start()
+        res = self.client.get(export_url, params)
+        lines = size = 0
+        for chunk in res.streaming_content:
+            lines += chunk.count(b'\n')
+            size += len(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_growth = peak_rss_bytes() - rss_before
+        print(f'\n{params["type"]}: {lines} lines, {size / 1e6:.1f}MB, '
+              f'peak traced {peak / 1e6:.1f}MB, '
+              f'peak RSS growth {rss_growth / 1e6:.1f}MB')
+        return lines, peak, rss_growth
+
+    def test_ndjson_memory_flat(self):
+        lines, peak, rss_growth = self.consume({'type': 'ndjson'})
+        self.assertEqual(lines, ROWS)
+        self.assertLess(peak, MAX_PEAK_BYTES)
+        self.assertLess(rss_growth, MAX_PEAK_BYTES)
+
+    def test_csv_memory_flat(self):
+        lines, peak, rss_growth = self.consume({'type': 'csv'})
+        self.assertEqual(lines, ROWS + 1)
+        self.assertLess(peak, MAX_PEAK_BYTES)
+        self.assertLess(rss_growth, MAX_PEAK_BYTES)
@@ -0,0 +1,66 @@
+"""Benchmark keyset pagination of the recipe list endpoint."""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.pagination import Cursor
+from rest_framework.test import APIClient
+
+from benchmarks.utils import median_time
+from core.models import Recipe
+from recipe.pagination import RecipeCursorPagination
+
+recipes_url = reverse('recipe:recipe-list')
+
+ROWS = 100_000
+
+
+class RecipeListPaginationBenchmark(TestCase):
+    """Latency of the first page and of a deep page over 100k rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='bench@example.com', password='benchpass123'
+        )
+        Recipe.objects.bulk_create(
+            (
+                Recipe(
+                    user=cls.user,
+                    title=f'Recipe {i}',
+                    time_minutes=i % 120,
+                    price=Decimal('5.00'),
+                )
+                for i in range(ROWS)
+            ),
+            batch_size=5000,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def deep_cursor_url(self):
+        """Return the list URL positioned just above the oldest recipe."""
+        paginator = RecipeCursorPagination()
+        paginator.base_url = 'http://testserver' + recipes_url
+        oldest = Recipe.objects.filter(user=self.user).order_by('id')
+        page_size = RecipeCursorPagination.page_size
+        position = oldest.values_list('id', flat=True)[page_size]
+        cursor = Cursor(offset=0, reverse=False, position=str(position))
+        return paginator.encode_cursor(cursor)
+
+    def test_deep_page_latency_is_flat(self):
+        """A page at the end of the table costs about the same as page one."""
+        deep_url = self.deep_cursor_url()
+        res = self.client.get(deep_url)
+        self.assertEqual(
+            len(res.data['results']), RecipeCursorPagination.page_size
+        )
+
+        first = median_time(lambda: self.client.get(recipes_url))
+        deep = median_time(lambda: self.client.get(deep_url))
+        print(f'\nfirst page: {first * 1000:.2f}ms, '
+              f'deep page ({ROWS} rows): {deep * 1000:.2f}ms')
+        self.assertLess(deep, first * 2)
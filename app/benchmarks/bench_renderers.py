@@ -0,0 +1,72 @@
+"""Benchmark render time and payload size of the API renderers."""
+from decimal import Decimal
+
+import msgpack
+import orjson
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks.utils import median_time
+from core.models import Recipe
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+from recipe.serializers import RecipeListSerializer
+
+ROWS = 10_000
+MIN_ORJSON_SPEEDUP = 3
+
+
+class RendererBenchmark(TestCase):
+    """Render a 10k recipe list with each renderer."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email='bench@example.com', password='benchpass123'
+        )
+        Recipe.objects.bulk_create(
+            (
+                Recipe(
+                    user=user,
+                    title=f'Recipe {i}',
+                    description='Simmer slowly with fresh herbs.',
+                    time_minutes=i % 120,
+                    price=Decimal(i % 1000) / 100,
+                    link=f'http://example.com/{i}',
+                )
+                for i in range(ROWS)
+            ),
+            batch_size=5000,
+        )
+
+    def test_render_time_and_size(self):
+        rows = RecipeListSerializer.values(Recipe.objects.order_by('-id'))
+        data = RecipeListSerializer(rows).data
+        renderers = {
+            'json (DRF)': JSONRenderer(),
+            'orjson': ORJSONRenderer(),
+            'msgpack': MessagePackRenderer(),
+        }
+
+        results = {}
+        for name, renderer in renderers.items():
+            payload = renderer.render(data)
+            seconds = median_time(lambda: renderer.render(data), repeat=10)
+            results[name] = (seconds, len(payload))
+        print(f'\n{ROWS} recipes:')
+        for name, (seconds, size) in results.items():
+            print(f'  {name:<11} {seconds * 1000:7.2f}ms '
+                  f'{size / 1024:8.1f}KiB')
+
+        json_payload = renderers['json (DRF)'].render(data)
+        self.assertEqual(
+            orjson.loads(renderers['orjson'].render(data)),
+            orjson.loads(json_payload),
+        )
+        self.assertEqual(
+            msgpack.unpackb(renderers['msgpack'].render(data)),
+            orjson.loads(json_payload),
+        )
+        speedup = results['json (DRF)'][0] / results['orjson'][0]
+        self.assertGreaterEqual(speedup, MIN_ORJSON_SPEEDUP)
+        self.assertLess(results['msgpack'][1], results['orjson'][1])
@@ -0,0 +1,58 @@
+"""Benchmark the fast list serializer against RecipeSerializer."""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks.utils import median_time
+from core.models import Recipe
+from recipe.serializers import RecipeListSerializer, RecipeSerializer
+
+ROWS = 10_000
+MIN_SPEEDUP = 3
+
+
+class RecipeListSerializerBenchmark(TestCase):
+    """Rendering 10k recipes is at least 3x faster on the fast path."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email='bench@example.com', password='benchpass123'
+        )
+        Recipe.objects.bulk_create(
+            (
+                Recipe(
+                    user=user,
+                    title=f'Recipe {i}',
+                    time_minutes=i % 120,
+                    price=Decimal(i % 1000) / 100,
+                    link=f'http://example.com/{i}',
+                )
+                for i in range(ROWS)
+            ),
+            batch_size=5000,
+        )
+
+    def test_fast_serializer_speedup(self):
+        """Query + serialize + render JSON, as the list view does."""
+        queryset = Recipe.objects.order_by('-id')
+        renderer = JSONRenderer()
+
+        def drf():
+            data = RecipeSerializer(queryset.all(), many=True).data
+            return renderer.render(data)
+
+        def fast():
+            rows = RecipeListSerializer.values(queryset.all())
+            return renderer.render(RecipeListSerializer(rows).data)
+
+        self.assertEqual(fast(), drf())
+        drf_time = median_time(drf, repeat=5)
+        fast_time = median_time(fast, repeat=5)
+        speedup = drf_time / fast_time
+        print(f'\n{ROWS} rows: RecipeSerializer {drf_time * 1000:.1f}ms, '
+              f'RecipeListSerializer {fast_time * 1000:.1f}ms '
+              f'({speedup:.1f}x)')
+        self.assertGreaterEqual(speedup, MIN_SPEEDUP)
@@ -0,0 +1,50 @@
+"""Benchmark the cost of one throttle check."""
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, override_settings
+
+from benchmarks.utils import median_time
+from core.throttling import ScopedTokenBucketThrottle, get_throttle_cache
+
+CHECKS = 10_000
+MAX_MICROSECONDS = 20
+
+
+@override_settings(THROTTLE_ENABLED=True, THROTTLE_RATES={
+    'allowed': f'{CHECKS * 1000}/s', 'denied': '1/day',
+})
+class ThrottleBenchmark(SimpleTestCase):
+    """Time allow_request() on the configured throttle cache."""
+
+    def check_time(self, scope):
+        """Return the median seconds of one allow_request()."""
+        throttle = ScopedTokenBucketThrottle()
+        view = SimpleNamespace(throttle_scope=scope)
+        # Nhiều user khác nhau: mỗi user một key trong cache.
+        requests = [
+            SimpleNamespace(
+                user=SimpleNamespace(is_authenticated=True, pk=i), META={}
+            )
+            for i in range(100)
+        ]
+
+        def run():
+            for i in range(CHECKS):
+                throttle.allow_request(requests[i % 100], view)
+
+        run()
+        return median_time(run, repeat=5) / CHECKS
+
+    def test_check_cost(self):
+        get_throttle_cache().clear()
+        results = {
+            'allowed': self.check_time('allowed'),
+            'denied': self.check_time('denied'),
+        }
+        print('\nthrottle check: ' + ', '.join(
+            f'{name} {seconds * 1e6:.1f}µs'
+            for name, seconds in results.items()
+        ))
+
+        for seconds in results.values():
+            self.assertLess(seconds * 1e6, MAX_MICROSECONDS)
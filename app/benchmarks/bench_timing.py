@@ -0,0 +1,40 @@
+"""Benchmark the overhead of RequestTimingMiddleware."""
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import resolve
+
+from benchmarks.utils import median_time
+from core.metrics import request_metrics
+from core.middleware import RequestTimingMiddleware
+
+CALLS = 10_000
+MAX_OVERHEAD = 50e-6  # giây mỗi request
+
+
+class RequestTimingOverheadBenchmark(SimpleTestCase):
+    """The timing middleware adds less than 50µs per request."""
+
+    def test_middleware_overhead(self):
+        request = RequestFactory().get('/api/recipe/recipes/')
+        request.resolver_match = resolve('/api/recipe/recipes/')
+
+        def view(request):
+            return HttpResponse()
+
+        middleware = RequestTimingMiddleware(view)
+
+        def bare():
+            for _ in range(CALLS):
+                view(request)
+
+        def timed():
+            for _ in range(CALLS):
+                middleware(request)
+
+        bare_time = median_time(bare, repeat=5) / CALLS
+        timed_time = median_time(timed, repeat=5) / CALLS
+        request_metrics.reset()
+        overhead = timed_time - bare_time
+        print(f'\nRequestTimingMiddleware overhead: '
+              f'{overhead * 1e6:.1f}µs per request')
+        self.assertLess(overhead, MAX_OVERHEAD)
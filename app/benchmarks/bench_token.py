@@ -0,0 +1,47 @@
+"""Benchmark token issuance throughput per core for each hasher."""
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+token_url = reverse('user:token')
+
+REQUESTS = 20
+HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'argon2': 'core.hashers.Argon2PasswordHasher',
+    'bcrypt': 'core.hashers.BCryptSHA256PasswordHasher',
+}
+# Argon2 mặc định phải nhanh hơn PBKDF2 mặc định của Django ít nhất 2 lần.
+MIN_ARGON2_SPEEDUP = 2
+
+
+# Đo băm mật khẩu, không đo throttle 'token' (20 request liền nhau/IP).
+@override_settings(THROTTLE_ENABLED=False)
+class TokenIssuanceBenchmark(TestCase):
+    """Requests per second of /api/user/token/ on one core."""
+
+    def issue_tokens(self, hasher):
+        """Return token requests per second with hasher preferred."""
+        payload = {'email': f'{hasher}@example.com', 'password': 'pass12345'}
+        with override_settings(PASSWORD_HASHERS=[HASHERS[hasher]]):
+            get_user_model().objects.create_user(**payload)
+            client = APIClient()
+            # Một request tuần tự tại một thời điểm = throughput trên một
+            # core; thread pool chỉ chạy một lần băm cho mỗi request.
+            start = time.perf_counter()
+            for _ in range(REQUESTS):
+                res = client.post(token_url, payload)
+                self.assertEqual(res.status_code, 200)
+            return REQUESTS / (time.perf_counter() - start)
+
+    def test_token_throughput_per_core(self):
+        rates = {hasher: self.issue_tokens(hasher) for hasher in HASHERS}
+        print('\ntoken requests/s per core: ' + ', '.join(
+            f'{hasher} {rate:.1f}' for hasher, rate in rates.items()
+        ))
+        self.assertGreaterEqual(
+            rates['argon2'], rates['pbkdf2'] * MIN_ARGON2_SPEEDUP
+        )
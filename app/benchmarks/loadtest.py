@@ -0,0 +1,251 @@
+"""
+    Load test: WSGI (uWSGI) so với ASGI (uvicorn) cho API recipe.
+
+    Mở --connections kết nối keep-alive cùng lúc (mặc định 1000), mỗi kết
+    nối gửi GET liên tục trong --duration giây, rồi in RPS và độ trễ
+    p50/p95/p99 cho từng kịch bản:
+        wsgi-sync   uWSGI  + RecipeViewSet     (/api/recipe/recipes/)
+        asgi-sync   uvicorn + RecipeViewSet     (/api/recipe/recipes/)
+        asgi-async  uvicorn + view async        (/api/recipe/async/recipes/)
+
+    Chạy trong thư mục app, với DB đã migrate và một token có sẵn
+    (POST /api/user/token/):
+        python benchmarks/loadtest.py --token <token> --workers 4
+
+    Mặc định script tự chạy uwsgi và uvicorn; dùng --wsgi-url/--asgi-url
+    để đo server đang chạy sẵn. Client chỉ dùng asyncio của thư viện chuẩn.
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+SCENARIOS = [
+    ('wsgi-sync', 'wsgi', '/api/recipe/recipes/'),
+    ('asgi-sync', 'asgi', '/api/recipe/recipes/'),
+    ('asgi-async', 'asgi', '/api/recipe/async/recipes/'),
+]
+
+
+def raise_open_files_limit(connections):
+    """Allow one file descriptor per connection (plus some spare)."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = connections + 256
+    if soft < wanted:
+        if hard != resource.RLIM_INFINITY:
+            wanted = min(wanted, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response; return (status, keep_alive)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed')
+    status = int(status_line.split()[1])
+    length, chunked, keep_alive = 0, False, True
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value:
+            chunked = True
+        elif name == 'connection' and value == 'close':
+            keep_alive = False
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def connection_loop(host, port, next_request, deadline, result):
+    """Send next_request() over one keep-alive connection until deadline."""
+    loop = asyncio.get_running_loop()
+    reader = writer = None
+    while loop.time() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            request = next_request()
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await read_response(reader)
+            result['latencies'].append(time.perf_counter() - start)
+            if not 200 <= status < 300:
+                result['errors'] += 1
+            if not keep_alive:
+                writer.close()
+                writer = None
+        except (OSError, ConnectionError, asyncio.IncompleteReadError,
+                ValueError, IndexError):
+            result['errors'] += 1
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.01)
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(url, token, connections, duration):
+    """Drive url with keep-alive connections; return the raw results."""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    request = (
+        f'GET {path} HTTP/1.1\r\n'
+        f'Host: {parts.netloc}\r\n'
+        f'Authorization: Token {token}\r\n'
+        'Accept: application/json\r\n'
+        'Connection: keep-alive\r\n\r\n'
+    ).encode()
+    result = {'latencies': [], 'errors': 0}
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        connection_loop(host, port, lambda: request, deadline, result)
+        for _ in range(connections)
+    ))
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def summarize(name, result):
+    latencies = sorted(result['latencies'])
+    to_ms = (lambda value: None if value is None
+             else round(value * 1000, 2))
+    return {
+        'scenario': name,
+        'requests': len(latencies),
+        'errors': result['errors'],
+        'rps': round(len(latencies) / result['elapsed'], 1),
+        'mean_ms': to_ms(statistics.mean(latencies) if latencies else None),
+        'p50_ms': to_ms(percentile(latencies, 0.50)),
+        'p95_ms': to_ms(percentile(latencies, 0.95)),
+        'p99_ms': to_ms(percentile(latencies, 0.99)),
+    }
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def start_server(kind, port, workers, listen):
+    """Start uwsgi or uvicorn for the project in the current directory."""
+    # Server cũ còn chạy trên cổng này sẽ bị đo thay cho server mới.
+    with socket.socket() as sock:
+        if sock.connect_ex(('127.0.0.1', port)) == 0:
+            raise RuntimeError(f'port {port} is already in use')
+    if kind == 'wsgi':
+        command = [
+            'uwsgi', '--http', f'127.0.0.1:{port}', '--module', 'app.wsgi',
+            '--master', '--processes', str(workers), '--threads', '4',
+            '--listen', str(listen), '--http-keepalive',
+            # Mặc định uWSGI coi SIGTERM là reload, không phải thoát.
+            '--die-on-term', '--disable-logging',
+        ]
+    else:
+        command = [
+            sys.executable, '-m', 'uvicorn', 'app.asgi:application',
+            '--host', '127.0.0.1', '--port', str(port),
+            '--workers', str(workers), '--backlog', str(listen),
+            '--no-access-log',
+        ]
+    # Mọi kết nối đến từ 127.0.0.1: tắt throttle, trừ khi đặt rõ
+    # THROTTLE_ENABLED để đo cả throttle.
+    env = dict(os.environ)
+    env.setdefault('THROTTLE_ENABLED', '0')
+    process = subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+    except RuntimeError:
+        process.kill()
+        raise
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--token', required=True)
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--wsgi-url', help='base URL of a running uWSGI')
+    parser.add_argument('--asgi-url', help='base URL of a running ASGI app')
+    parser.add_argument('--json', action='store_true', help='print JSON')
+    args = parser.parse_args()
+
+    raise_open_files_limit(args.connections)
+    bases = {'wsgi': args.wsgi_url, 'asgi': args.asgi_url}
+    ports = {'wsgi': 8001, 'asgi': 8002}
+    servers = []
+    try:
+        for kind, base in bases.items():
+            if base is None:
+                servers.append(start_server(
+                    kind, ports[kind], args.workers, args.connections
+                ))
+                bases[kind] = f'http://127.0.0.1:{ports[kind]}'
+
+        results = []
+        for name, kind, path in SCENARIOS:
+            url = bases[kind].rstrip('/') + path
+            # Làm nóng (import, connection DB, cache) trước khi đo.
+            asyncio.run(run_load(url, args.token, 10, 1))
+            raw = asyncio.run(
+                run_load(url, args.token, args.connections, args.duration)
+            )
+            results.append(summarize(name, raw))
+    finally:
+        for process in servers:
+            process.terminate()
+            process.wait()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f'{args.connections} connections, {args.duration:g}s each, '
+          f'{args.workers} worker(s)')
+    columns = ['scenario', 'requests', 'errors', 'rps', 'mean_ms',
+               'p50_ms', 'p95_ms', 'p99_ms']
+    print(''.join(f'{column:>12}' for column in columns))
+    for row in results:
+        print(''.join(f'{str(row[column]):>12}' for column in columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+"""Helpers shared by the benchmarks."""
+import statistics
+import time
+
+
+def median_time(func, repeat=20):
+    """Call func repeat times and return the median wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Đăng ký system checks cho cache dùng chung.
+        from core import checks  # noqa: F401
+        from core.metrics import install_query_timing
+
+        # Đo query của mọi connection, trong mọi thread (RequestTiming).
+        connection_created.connect(install_query_timing)
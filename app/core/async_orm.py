@@ -0,0 +1,19 @@
+"""
+    Async ORM helpers cho Django 4.0.
+
+    Django 4.1 mới có QuerySet.aget()/acreate(); ở 4.0 các hàm dưới đây làm
+    đúng việc 4.1 làm bên trong: chạy câu query trong thread sync dùng chung
+    (thread_sensitive) để connection DB luôn ở một thread. Khi nâng cấp
+    Django chỉ cần thay aget(qs, ...) bằng qs.aget(...).
+"""
+from asgiref.sync import sync_to_async
+
+
+async def aget(queryset, *args, **kwargs):
+    """Async QuerySet.get()."""
+    return await sync_to_async(queryset.get)(*args, **kwargs)
+
+
+async def acreate(queryset, **kwargs):
+    """Async QuerySet.create()."""
+    return await sync_to_async(queryset.create)(**kwargs)
@@ -0,0 +1,68 @@
+"""
+    Backend PostgreSQL lấy connection từ pool (core.db_pool).
+
+    Cấu hình như django.db.backends.postgresql, thêm key POOL (tham số của
+    ConnectionPool) trong DATABASES. Nên đặt CONN_MAX_AGE = 0 để Django trả
+    connection về pool cuối mỗi request.
+"""
+import functools
+
+import psycopg2.extras
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base, creation
+
+from core.db_pool import close_pools, get_pool
+
+
+def connect(conn_params, isolation_level=None):
+    """Open a raw connection, set up like Django's get_new_connection."""
+    connection = base.Database.connect(**conn_params)
+    if (
+        isolation_level is not None
+        and isolation_level != connection.isolation_level
+    ):
+        connection.set_session(isolation_level=isolation_level)
+    psycopg2.extras.register_default_jsonb(
+        conn_or_curs=connection, loads=lambda x: x
+    )
+    return connection
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Postgres không cho DROP DATABASE khi còn connection, kể cả rảnh.
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    pool = None
+
+    def get_new_connection(self, conn_params):
+        # Connection tạm tới database "postgres" (tạo/xóa test DB) không
+        # đi qua pool.
+        if self.alias == NO_DB_ALIAS:
+            return super().get_new_connection(conn_params)
+        options = self.settings_dict['OPTIONS']
+        self.pool = get_pool(
+            self.alias, conn_params,
+            functools.partial(
+                connect, conn_params, options.get('isolation_level')
+            ),
+            **self.settings_dict.get('POOL', {}),
+        )
+        connection = self.pool.getconn()
+        self.isolation_level = options.get(
+            'isolation_level', connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+        # Sau lỗi DB, connection có thể đã hỏng dù chưa bị đóng.
+        discard = self.errors_occurred and not self.is_usable()
+        with self.wrap_database_errors:
+            self.pool.putconn(self.connection, discard=discard)
@@ -0,0 +1,48 @@
+"""
+    System checks cho cấu hình cache cần dùng chung giữa các process.
+
+    LocMemCache chỉ sống trong một process: invalidate (hay ghi) ở worker
+    này không tới được các worker khác. Khi WEB_CONCURRENCY > 1 các cache
+    dưới đây phải là cache dùng chung (Redis, memcached...).
+"""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+PROCESS_LOCAL_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+def process_local(alias):
+    """Return whether the cache alias is private to each process."""
+    return settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_BACKENDS
+
+
+@register()
+def check_token_cache(app_configs, **kwargs):
+    """Warn when revoked tokens stay cached in the other workers."""
+    if settings.WEB_CONCURRENCY > 1 and \
+            process_local(settings.TOKEN_AUTH_CACHE):
+        return [Warning(
+            'TOKEN_AUTH_CACHE is a per-process cache: a deleted token or a '
+            'deactivated user is only invalidated in the worker that made '
+            'the change, the others accept it until TOKEN_CACHE_TTL.',
+            hint='Set TOKEN_CACHE_BACKEND to a shared cache.',
+            id='core.W001',
+        )]
+    return []
+
+
+@register()
+def check_replica_sticky_cache(app_configs, **kwargs):
+    """Warn when read-your-writes stickiness is only seen by one worker."""
+    if settings.DB_REPLICAS and settings.WEB_CONCURRENCY > 1 and \
+            process_local(settings.DB_REPLICA_STICKY_CACHE):
+        return [Warning(
+            'DB_REPLICA_STICKY_CACHE is a per-process cache: after a write '
+            'only the worker that handled it reads from the primary, the '
+            'others may serve stale data from a lagging replica.',
+            hint='Set DB_REPLICA_STICKY_CACHE to a shared cache alias.',
+            id='core.W002',
+        )]
+    return []
@@ -0,0 +1,162 @@
+"""
+    Nén response: gzip luôn có, brotli và zstd khi cài package tương ứng.
+
+    Body nhỏ được nén một lần với cửa sổ (window) vừa đủ kích thước body,
+    không cấp phát bộ đệm mặc định hàng trăm KB của zlib/brotli. Body stream
+    được gom thành khối STREAM_BUFFER_SIZE byte, nén và flush sau mỗi khối,
+    nên client nhận dữ liệu dần và server không phải giữ cả response trong
+    bộ nhớ.
+"""
+import threading
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Mức nén cho response động: ưu tiên CPU thấp hơn tỉ lệ nén tối đa.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+# Export stream yield từng dòng (~100 byte). Flush sau mỗi dòng thì mỗi
+# lần flush thêm vài byte marker và reset match, tỉ lệ nén gần như bằng 1;
+# gom đủ khối rồi mới nén/flush.
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def _window_bits(size, minimum, maximum):
+    """Return the log2 window just large enough for size bytes."""
+    return max(minimum, min(maximum, (size - 1).bit_length()))
+
+
+def _blocks(chunks, size=STREAM_BUFFER_SIZE):
+    """Yield chunks joined into blocks of at least size bytes."""
+    buffer, buffered = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield b''.join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+class Gzip:
+    name = 'gzip'
+
+    def compress(self, data):
+        # wbits + 16: định dạng gzip (header và CRC) thay vì zlib.
+        compressor = zlib.compressobj(
+            GZIP_LEVEL, zlib.DEFLATED, 16 + _window_bits(len(data), 9, 15)
+        )
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self, chunks):
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + 15)
+        for block in _blocks(chunks):
+            data = compressor.compress(block)
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class Brotli:
+    name = 'br'
+
+    def compress(self, data):
+        return brotli.compress(
+            data, quality=BROTLI_QUALITY,
+            lgwin=_window_bits(len(data), 10, 22),
+        )
+
+    def stream(self, chunks):
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for block in _blocks(chunks):
+            data = compressor.process(block) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class Zstd:
+    name = 'zstd'
+
+    def __init__(self):
+        # ZstdCompressor giữ context nén, tạo lại mỗi request thì tốn;
+        # không dùng chung giữa các thread.
+        self._local = threading.local()
+
+    def compressor(self):
+        compressor = getattr(self._local, 'compressor', None)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            self._local.compressor = compressor
+        return compressor
+
+    def compress(self, data):
+        # Biết trước kích thước nên zstd tự chọn tham số cho body nhỏ.
+        return self.compressor().compress(data)
+
+    def stream(self, chunks):
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        for block in _blocks(chunks):
+            data = compressor.compress(block)
+            data += compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+# Thứ tự ưu tiên của server khi client chấp nhận nhiều encoding như nhau.
+CODECS = {}
+if zstandard is not None:
+    CODECS[Zstd.name] = Zstd()
+if brotli is not None:
+    CODECS[Brotli.name] = Brotli()
+CODECS[Gzip.name] = Gzip()
+
+
+def parse_accept_encoding(header):
+    """Return {coding: q} of an Accept-Encoding header."""
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_codec(header):
+    """Return the codec with the highest q accepted by the client, or None.
+
+    Khi q bằng nhau, chọn theo thứ tự ưu tiên của CODECS.
+    """
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    default = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for name, codec in CODECS.items():
+        q = accepted.get(name, default)
+        if q > best_q:
+            best, best_q = codec, q
+    return best
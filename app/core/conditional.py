@@ -0,0 +1,44 @@
+"""
+    HTTP conditional GET (ETag / Last-Modified) cho các API view.
+
+    View tự tính validator từ dữ liệu rẻ (version marker, updated_at) trước
+    khi serialize; nếu client đã có bản mới nhất thì trả 304 không có body.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """Return a quoted ETag built from the given parts."""
+    digest = hashlib.sha256(
+        ':'.join(str(part) for part in parts).encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _timestamp(last_modified):
+    return int(last_modified.timestamp()) if last_modified else None
+
+
+def not_modified(request, etag, last_modified=None):
+    """Return a 304 response if the client copy is current, else None.
+
+    If-None-Match được ưu tiên; If-Modified-Since chỉ được xét khi request
+    không gửi If-None-Match (RFC 7232).
+    """
+    response = get_conditional_response(
+        request, etag=etag, last_modified=_timestamp(last_modified)
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    """Set the ETag and Last-Modified headers of response."""
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(_timestamp(last_modified))
+    return response
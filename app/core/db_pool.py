@@ -0,0 +1,226 @@
+"""
+    Pool connection Postgres dùng chung giữa các thread của một process.
+
+    Django 4.0 chỉ có CONN_MAX_AGE (giữ connection riêng cho từng thread),
+    chưa có pool: backend core.backends.postgresql_pool lấy connection từ
+    đây khi mở và trả lại khi Django đóng connection (cuối mỗi request).
+    Connection được kiểm tra khi lấy ra; pool giới hạn tổng số connection
+    và đếm số đang dùng, đang rảnh và thời gian chờ.
+"""
+import os
+import threading
+import time
+
+import psycopg2
+from psycopg2 import extensions
+
+
+class ConnectionPool:
+    """Bounded, thread safe pool of DB-API connections made by factory."""
+
+    def __init__(self, factory, max_size, timeout=5, check_interval=30,
+                 max_lifetime=1800):
+        self.factory = factory
+        self.max_size = max_size
+        self.timeout = timeout
+        # Chỉ ping (SELECT 1) connection đã rảnh lâu hơn check_interval giây;
+        # connection vừa trả về thì chỉ kiểm tra trạng thái (không tốn query).
+        self.check_interval = check_interval
+        self.max_lifetime = max_lifetime
+        self._cond = threading.Condition()
+        self._idle = []  # (connection, thời điểm trả về), dùng như stack
+        self._created_at = {}
+        self.in_use = 0
+        self.waiting = 0
+        self.checkouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.health_check_failures = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def getconn(self):
+        """Check out a healthy connection, waiting up to timeout seconds."""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        with self._cond:
+            self.waiting += 1
+            try:
+                while True:
+                    if self._idle:
+                        connection, returned_at = self._idle.pop()
+                        break
+                    if self.in_use + len(self._idle) < self.max_size:
+                        connection = returned_at = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise psycopg2.OperationalError(
+                            f'connection pool exhausted: {self.max_size} '
+                            f'connections in use for {self.timeout}s'
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+            # Giữ chỗ trước khi kiểm tra/mở connection ngoài lock.
+            self.in_use += 1
+            self.checkouts += 1
+            waited = time.monotonic() - start
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+        if connection is not None and not self._is_healthy(
+            connection, returned_at
+        ):
+            self._discard(connection)
+            connection = None
+        if connection is None:
+            try:
+                connection = self.factory()
+            except Exception:
+                self._release_slot()
+                raise
+            with self._cond:
+                self._created_at[connection] = time.monotonic()
+                self.created += 1
+        return connection
+
+    def putconn(self, connection, discard=False):
+        """Return a connection to the pool (or close it if unusable)."""
+        keep = not discard and self._reset(connection)
+        if keep and self._expired(connection):
+            keep = False
+        with self._cond:
+            self.in_use -= 1
+            if keep:
+                self._idle.append((connection, time.monotonic()))
+            self._cond.notify()
+        if not keep:
+            self._discard(connection)
+
+    def close_idle(self):
+        """Close all idle connections."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def stats(self):
+        """Return usage counters and wait times of the pool."""
+        with self._cond:
+            checkouts = self.checkouts
+            return {
+                'max_size': self.max_size,
+                'in_use': self.in_use,
+                'idle': len(self._idle),
+                'waiting': self.waiting,
+                'checkouts': checkouts,
+                'created': self.created,
+                'discarded': self.discarded,
+                'health_check_failures': self.health_check_failures,
+                'timeouts': self.timeouts,
+                'wait_time_total_ms': round(self.wait_time_total * 1000, 3),
+                'wait_time_mean_ms': round(
+                    self.wait_time_total * 1000 / checkouts, 3
+                ) if checkouts else 0.0,
+                'wait_time_max_ms': round(self.wait_time_max * 1000, 3),
+            }
+
+    def _is_healthy(self, connection, returned_at):
+        if connection.closed or self._expired(connection):
+            return False
+        if time.monotonic() - returned_at < self.check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not connection.autocommit:
+                connection.rollback()
+        except psycopg2.Error:
+            with self._cond:
+                self.health_check_failures += 1
+            return False
+        return True
+
+    def _reset(self, connection):
+        """Roll back an open transaction; return False if unusable."""
+        if connection.closed:
+            return False
+        transaction_status = connection.info.transaction_status
+        if transaction_status == extensions.TRANSACTION_STATUS_IDLE:
+            return True
+        if transaction_status not in (
+            extensions.TRANSACTION_STATUS_INTRANS,
+            extensions.TRANSACTION_STATUS_INERROR,
+        ):
+            return False
+        try:
+            connection.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    def _expired(self, connection):
+        created_at = self._created_at.get(connection)
+        return bool(
+            self.max_lifetime and created_at is not None
+            and time.monotonic() - created_at > self.max_lifetime
+        )
+
+    def _discard(self, connection):
+        with self._cond:
+            self._created_at.pop(connection, None)
+            self.discarded += 1
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+    def _release_slot(self):
+        with self._cond:
+            self.in_use -= 1
+            self._cond.notify()
+
+
+# Pool theo (pid, alias, tham số kết nối): sau fork (uWSGI master -> worker)
+# process con tạo pool mới, không dùng chung socket với process cha.
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, conn_params, factory, **options):
+    """Return the pool of this process for alias and conn_params."""
+    key = (os.getpid(), alias, tuple(sorted(
+        (name, str(value)) for name, value in conn_params.items()
+    )))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(factory, **options)
+    return pool
+
+
+def _process_pools(database=None):
+    pid = os.getpid()
+    for (pool_pid, alias, params), pool in list(_pools.items()):
+        name = dict(params).get('database')
+        if pool_pid == pid and database in (None, name):
+            yield alias, name, pool
+
+
+def close_pools(database=None):
+    """Close idle connections of this process (to one database or all)."""
+    for _, _, pool in _process_pools(database):
+        pool.close_idle()
+
+
+def pool_stats():
+    """Return the stats of every pool of this process."""
+    return [
+        {'alias': alias, 'database': name, **pool.stats()}
+        for alias, name, pool in _process_pools()
+    ]
@@ -0,0 +1,81 @@
+"""
+    Định tuyến query đọc sang read replica (settings.DB_REPLICAS).
+
+    Mặc định mọi query đi vào primary ('default'). Chỉ code chạy trong
+    read_from_replica() (ReplicaRoutingMiddleware bọc các request GET/HEAD/
+    OPTIONS) mới đọc từ replica; ghi luôn vào primary. use_primary() và
+    pin_to_primary() ép đọc từ primary khi dữ liệu cần đọc có thể chưa
+    sang replica.
+"""
+import contextlib
+import contextvars
+import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY = 'primary'
+REPLICA = 'replica'
+
+# ContextVar thay vì threading.local: đúng cho cả thread (WSGI) và task
+# asyncio (ASGI); sync_to_async chép context sang thread chạy query.
+_reads = contextvars.ContextVar('db_reads', default=PRIMARY)
+
+
+@contextlib.contextmanager
+def _reading_from(target):
+    token = _reads.set(target)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+def read_from_replica():
+    """Send the reads made inside the block to a read replica."""
+    return _reading_from(REPLICA)
+
+
+def use_primary():
+    """Send the reads made inside the block to the primary."""
+    return _reading_from(PRIMARY)
+
+
+def pin_to_primary():
+    """Send the remaining reads of the current request to the primary.
+
+    Giá trị cũ được khôi phục khi khối read_from_replica() bao ngoài kết
+    thúc (cuối request).
+    """
+    _reads.set(PRIMARY)
+
+
+def reading_from_replica():
+    """Return True if reads currently go to a replica."""
+    return _reads.get() == REPLICA and bool(settings.DB_REPLICAS)
+
+
+class PrimaryReplicaRouter:
+    """Route reads to a random replica when allowed, writes to default."""
+
+    def db_for_read(self, model, **hints):
+        if not reading_from_replica():
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DB_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica là bản sao của primary: object đọc từ replica được gán
+        # vào object sẽ ghi vào primary.
+        databases = {DEFAULT_DB_ALIAS, *settings.DB_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replica nhận schema qua replication, không chạy migrate.
+        if db in settings.DB_REPLICAS:
+            return False
+        return None
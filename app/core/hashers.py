@@ -0,0 +1,37 @@
+"""
+    Password hasher với chi phí cấu hình bằng settings.
+
+    Khi đổi chi phí (hoặc hasher ưu tiên trong PASSWORD_HASHERS), must_update
+    trả về True cho hash cũ và Django hash lại mật khẩu ở lần đăng nhập tiếp
+    theo (xem User.check_password).
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with PASSWORD_ARGON2_* costs.
+
+    Mặc định theo khuyến nghị OWASP (19 MiB, 2 vòng, 1 luồng), nhanh hơn
+    nhiều so với 100 MiB / 8 luồng mặc định của Django.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    """bcrypt (SHA-256 pre-hashed) with PASSWORD_BCRYPT_ROUNDS rounds."""
+
+    @property
+    def rounds(self):
+        return settings.PASSWORD_BCRYPT_ROUNDS
@@ -0,0 +1,114 @@
+"""
+    Chạy băm mật khẩu trong một thread pool giới hạn.
+
+    Băm mật khẩu tốn CPU (và RAM với Argon2): giới hạn số việc chạy cùng lúc
+    và số việc chờ để burst đăng nhập/đăng ký không làm quá tải server.
+    Khi hàng đợi đầy quá PASSWORD_HASH_QUEUE_TIMEOUT giây thì trả 503.
+    Chỉ đưa phần băm thuần vào pool, không đưa query DB (connection Django
+    gắn với từng thread).
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, identify_hasher
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingPoolBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many password checks in progress, try again later.'
+    default_code = 'hashing_pool_busy'
+
+
+class HashingPool:
+    """Bounded thread pool with queue depth metrics."""
+
+    def __init__(self, max_workers, max_queue, timeout):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix='password-hash'
+        )
+        # Tối đa max_workers việc đang chạy + max_queue việc đang chờ.
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def run(self, func, *args):
+        """Run func(*args) in the pool and return its result."""
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.rejected += 1
+            raise HashingPoolBusy()
+        try:
+            with self._lock:
+                self.queued += 1
+                self.max_queued = max(self.max_queued, self.queued)
+            return self._executor.submit(self._call, func, args).result()
+        finally:
+            self._slots.release()
+
+    def _call(self, func, args):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def stats(self):
+        """Return the current queue depth and counters."""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'queued': self.queued,
+                'running': self.running,
+                'max_queued': self.max_queued,
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """Return the process wide hashing pool, created from settings."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    settings.PASSWORD_HASH_WORKERS,
+                    settings.PASSWORD_HASH_QUEUE_SIZE,
+                    settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+                )
+    return _pool
+
+
+def must_rehash(encoded):
+    """Return True if encoded was not made by the preferred hasher/costs.
+
+    Cùng điều kiện như django.contrib.auth.hashers.check_password.
+    """
+    preferred = get_hasher('default')
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return (
+        hasher.algorithm != preferred.algorithm
+        or preferred.must_update(encoded)
+    )
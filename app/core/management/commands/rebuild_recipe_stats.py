@@ -0,0 +1,69 @@
+"""
+    Tính lại bảng core_recipestats từ core_recipe, theo từng batch user.
+
+    Trigger giữ bảng đúng khi chạy bình thường; lệnh này dùng khi bảng bị
+    lệch (restore dữ liệu, TRUNCATE, sửa tay). Mỗi batch chạy trong một
+    transaction ngắn nên có thể chạy khi server đang nhận request.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+# Khóa FOR UPDATE trên user chặn INSERT recipe mới của các user trong batch
+# (khóa FK), khóa dòng tổng hợp chặn trigger của transaction khác, nên
+# không có thay đổi nào bị đếm thiếu hoặc đếm hai lần.
+LOCK_STATS_SQL = """
+SELECT user_id FROM core_recipestats
+WHERE user_id = ANY(%s) FOR UPDATE
+"""
+
+# Ghi đè bằng ON CONFLICT DO UPDATE (không DELETE rồi INSERT): trigger của
+# transaction đang chờ khóa sẽ cập nhật tiếp trên dòng mới.
+REBUILD_SQL = """
+INSERT INTO core_recipestats
+    (user_id, recipe_count, price_sum, time_minutes_sum)
+SELECT u.id, count(r.id), coalesce(sum(r.price), 0),
+       coalesce(sum(r.time_minutes), 0)
+FROM unnest(%s::bigint[]) AS u(id)
+LEFT JOIN core_recipe AS r ON r.user_id = u.id
+GROUP BY u.id
+ON CONFLICT (user_id) DO UPDATE SET
+    recipe_count = EXCLUDED.recipe_count,
+    price_sum = EXCLUDED.price_sum,
+    time_minutes_sum = EXCLUDED.time_minutes_sum
+"""
+
+
+class Command(BaseCommand):
+    """Rebuild the per-user recipe summaries in batches."""
+    help = 'Recompute core_recipestats from core_recipe.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of users recomputed per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        users = get_user_model().objects.order_by('pk')
+        last_pk, total = 0, 0
+        while True:
+            with transaction.atomic():
+                user_ids = list(
+                    users.filter(pk__gt=last_pk)
+                    .select_for_update()
+                    .values_list('pk', flat=True)[:batch_size]
+                )
+                if not user_ids:
+                    break
+                with connection.cursor() as cursor:
+                    cursor.execute(LOCK_STATS_SQL, [user_ids])
+                    cursor.execute(REBUILD_SQL, [user_ids])
+            last_pk = user_ids[-1]
+            total += len(user_ids)
+            self.stdout.write(f'Rebuilt recipe stats of {total} users...')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Recipe stats rebuilt for {total} users.'
+        ))
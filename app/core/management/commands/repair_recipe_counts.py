@@ -0,0 +1,61 @@
+"""
+    Đếm lại User.recipe_count từ core_recipe, theo từng batch user.
+
+    Recipe.save()/delete() và các endpoint bulk giữ số đếm đúng; lệnh này
+    dùng khi nó bị lệch (queryset.delete() hay update() trực tiếp, restore
+    dữ liệu, sửa tay). Mỗi batch chạy trong một transaction ngắn nên có thể
+    chạy khi server đang nhận request.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+# Khóa FOR UPDATE trên user (trong handle) chặn INSERT recipe mới của các
+# user trong batch (khóa FK) và chặn F() của touch_recipes, nên câu đếm
+# dưới đây thấy mọi recipe đã commit và không lượt cộng/trừ nào bị mất.
+# Chỉ ghi những user bị lệch.
+REPAIR_SQL = """
+UPDATE core_user AS u SET recipe_count = c.recipe_count
+FROM (
+    SELECT ids.id, count(r.id) AS recipe_count
+    FROM unnest(%s::bigint[]) AS ids(id)
+    LEFT JOIN core_recipe AS r ON r.user_id = ids.id
+    GROUP BY ids.id
+) AS c
+WHERE u.id = c.id AND u.recipe_count <> c.recipe_count
+"""
+
+
+class Command(BaseCommand):
+    """Recount the denormalized recipe count of every user in batches."""
+    help = 'Recompute User.recipe_count from core_recipe.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of users recounted per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        users = get_user_model().objects.order_by('pk')
+        last_pk, total, repaired = 0, 0, 0
+        while True:
+            with transaction.atomic():
+                user_ids = list(
+                    users.filter(pk__gt=last_pk)
+                    .select_for_update()
+                    .values_list('pk', flat=True)[:batch_size]
+                )
+                if not user_ids:
+                    break
+                with connection.cursor() as cursor:
+                    cursor.execute(REPAIR_SQL, [user_ids])
+                    repaired += cursor.rowcount
+            last_pk = user_ids[-1]
+            total += len(user_ids)
+            self.stdout.write(f'Checked recipe counts of {total} users...')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Recipe counts checked for {total} users, {repaired} repaired.'
+        ))
@@ -0,0 +1,240 @@
+"""
+    Sinh nhanh user và recipe cho môi trường perf/staging.
+
+    Không dùng create_user và Recipe.save(): mật khẩu được băm một lần cho
+    mọi user, user được insert bằng bulk_create, recipe bằng COPY FROM STDIN
+    (hoặc bulk_create với --method bulk). Các khoảng user chạy song song
+    trên --workers process, mỗi khoảng một transaction.
+
+    Dữ liệu của user thứ i chỉ phụ thuộc --seed và i (không phụ thuộc số
+    worker hay batch), nên cùng tham số luôn sinh ra cùng dữ liệu. Chỉ
+    updated_at là thời điểm chạy lệnh.
+"""
+import csv
+import io
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from decimal import Decimal
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, connections, transaction
+from django.utils import timezone
+
+from core.db_pool import close_pools
+from core.models import Recipe
+
+ADJECTIVES = [
+    'Spicy', 'Creamy', 'Crispy', 'Smoky', 'Tangy', 'Roasted', 'Grilled',
+    'Braised', 'Zesty', 'Sweet', 'Savory', 'Rustic', 'Herbed', 'Garlic',
+]
+DISHES = [
+    'chicken', 'noodles', 'tofu', 'salmon', 'pho', 'curry', 'risotto',
+    'tacos', 'dumplings', 'salad', 'soup', 'pancakes', 'stew', 'fried rice',
+]
+WORDS = [
+    'simmer', 'slowly', 'with', 'fresh', 'herbs', 'and', 'serve', 'hot',
+    'lime', 'chili', 'ginger', 'butter', 'toss', 'season', 'to', 'taste',
+]
+RECIPE_COLUMNS = [
+    'user_id', 'title', 'description', 'time_minutes', 'price', 'link',
+    'updated_at',
+]
+
+
+def user_rows(seed, start, end, domain):
+    """Yield (index, fields) of the users in [start, end)."""
+    for index in range(start, end):
+        rng = random.Random(f'{seed}:user:{index}')
+        yield index, {
+            'email': f'user{index}@{domain}',
+            'name': f'{rng.choice(ADJECTIVES)} Cook {index}',
+        }
+
+
+def recipe_rows(seed, index, count):
+    """Yield the fields of the recipes of user index."""
+    rng = random.Random(f'{seed}:recipes:{index}')
+    for number in range(count):
+        yield {
+            'title': f'{rng.choice(ADJECTIVES)} {rng.choice(DISHES)}',
+            'description': ' '.join(
+                rng.choices(WORDS, k=rng.randint(5, 20))
+            ),
+            'time_minutes': rng.randint(5, 180),
+            'price': Decimal(rng.randint(100, 9999)) / 100,
+            # Khoảng 1/3 recipe có link.
+            'link': (
+                f'https://example.com/recipes/{index}-{number}'
+                if rng.random() < 0.33 else ''
+            ),
+        }
+
+
+def copy_recipes(recipes):
+    """Insert recipes (dicts of RECIPE_COLUMNS) with COPY FROM STDIN."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for recipe in recipes:
+        writer.writerow([recipe[column] for column in RECIPE_COLUMNS])
+    buffer.seek(0)
+    # Chuỗi rỗng không quoted trong CSV là NULL, trừ các cột FORCE_NOT_NULL.
+    sql = (
+        f'COPY {Recipe._meta.db_table} ({", ".join(RECIPE_COLUMNS)}) '
+        'FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (description, link))'
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
+
+
+def seed_range(start, end, params):
+    """Create the users in [start, end) and their recipes; return counts."""
+    User = get_user_model()
+    seed, updated_at = params['seed'], params['updated_at']
+    with transaction.atomic():
+        # bulk_create trả về id trên Postgres, cần cho user_id của recipe.
+        users = User.objects.bulk_create(
+            User(
+                password=params['password_hash'],
+                recipe_count=params['recipes'],
+                recipes_updated_at=updated_at if params['recipes'] else None,
+                **fields,
+            )
+            for _, fields in user_rows(
+                seed, start, end, params['email_domain']
+            )
+        )
+        recipes = [
+            {**fields, 'user_id': user.pk, 'updated_at': updated_at}
+            for index, user in zip(range(start, end), users)
+            for fields in recipe_rows(seed, index, params['recipes'])
+        ]
+        if params['method'] == 'copy':
+            copy_recipes(recipes)
+        else:
+            Recipe.objects.bulk_create(
+                (Recipe(**fields) for fields in recipes), batch_size=5000
+            )
+    return len(users), len(recipes)
+
+
+def init_worker():
+    """Set up Django in a worker process.
+
+    Với fork, process con có bản sao các connection của process cha (đã
+    đóng trước khi fork) và mở connection mới khi cần.
+    """
+    django.setup()
+
+
+class Command(BaseCommand):
+    """Generate users and recipes in bulk for perf and staging databases."""
+    help = 'Seed users and recipes quickly and deterministically.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users', type=int, default=1000,
+            help='Number of users to create.',
+        )
+        parser.add_argument(
+            '--recipes', type=int, default=10,
+            help='Number of recipes per user.',
+        )
+        parser.add_argument(
+            '--start', type=int, default=0,
+            help='Index of the first user, to add users to a seeded DB.',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Random seed, same seed gives the same data.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Number of worker processes.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of users per transaction.',
+        )
+        parser.add_argument(
+            '--method', choices=['copy', 'bulk'], default=None,
+            help='COPY FROM STDIN (PostgreSQL default) or bulk_create.',
+        )
+        parser.add_argument(
+            '--password', default='password123',
+            help='Password of every seeded user.',
+        )
+        parser.add_argument(
+            '--email-domain', default='seed.example.com',
+            help='Users are user<index>@<email domain>.',
+        )
+
+    def handle(self, *args, **options):
+        method = options['method']
+        if method is None:
+            method = 'copy' if connection.vendor == 'postgresql' else 'bulk'
+        elif method == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError('COPY needs PostgreSQL, use --method bulk.')
+        # Tham số gửi sang worker (phải pickle được, không gồm stdout...).
+        params = {
+            'seed': options['seed'],
+            'recipes': options['recipes'],
+            'email_domain': options['email_domain'],
+            'method': method,
+            # Băm một lần cho mọi user: mỗi lần băm Argon2 tốn hàng chục ms.
+            'password_hash': make_password(options['password']),
+            'updated_at': timezone.now(),
+        }
+
+        start, end = options['start'], options['start'] + options['users']
+        batch_size = options['batch_size']
+        ranges = [
+            (first, min(first + batch_size, end))
+            for first in range(start, end, batch_size)
+        ]
+        started = time.perf_counter()
+        users = recipes = 0
+        try:
+            for created_users, created_recipes in self.run(
+                ranges, params, options['workers']
+            ):
+                users += created_users
+                recipes += created_recipes
+                self.stdout.write(
+                    f'Seeded {users}/{options["users"]} users...'
+                )
+        except IntegrityError as exc:
+            raise CommandError(
+                f'{exc}\nUsers of this range already exist, '
+                'use --start or another --email-domain.'
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {users} users and {recipes} recipes in {elapsed:.1f}s '
+            f'({method}, {options["workers"]} worker(s)).'
+        ))
+
+    def run(self, ranges, params, workers):
+        """Yield the counts of each range as it completes."""
+        if workers <= 1 or len(ranges) <= 1:
+            for start, end in ranges:
+                yield seed_range(start, end, params)
+            return
+        # Không để process con dùng chung socket DB với process cha (kể cả
+        # connection đang nằm trong pool của core.db_pool).
+        connections.close_all()
+        close_pools()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker
+        ) as executor:
+            futures = [
+                executor.submit(seed_range, start, end, params)
+                for start, end in ranges
+            ]
+            for future in as_completed(futures):
+                yield future.result()
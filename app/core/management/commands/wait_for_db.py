@@ -1,22 +1,78 @@
-from django.core.management.base import BaseCommand
+"""
+    Chờ các database sẵn sàng trước khi chạy migrate/server.
+
+    Probe nhẹ (SELECT 1) với exponential backoff có jitter trên mọi alias
+    trong DATABASES cùng lúc, xem core.readiness.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.readiness import wait_for_databases
+
 
-import time 
-from psycopg2 import OperationalError as Psycopg2Error
-from django.db import OperationalError
-from django.core.management.base import BaseCommand
 class Command(BaseCommand):
     """Django command to wait for the database to be available"""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', action='append', dest='databases',
+            help='Alias to wait for (repeatable, default: all DATABASES).',
+        )
+        parser.add_argument(
+            '--timeout', type=float, default=60,
+            help='Seconds before giving up, 0 waits forever (default 60).',
+        )
+        parser.add_argument(
+            '--initial-delay', type=float, default=0.05,
+            help='First retry delay in seconds, doubled after each retry.',
+        )
+        parser.add_argument(
+            '--max-delay', type=float, default=2.0,
+            help='Longest delay between two retries in seconds.',
+        )
+        parser.add_argument(
+            '--migrations', action='store_true',
+            help='Also wait until every migration is applied.',
+        )
+
     def handle(self, *args, **options):
         """Entrypoint for command"""
+        aliases = options['databases'] or list(settings.DATABASES)
         self.stdout.write('Waiting for database...')
-        db_up = False
-        while db_up is False:
-            try:
-                self.check(databases=['default'])
-                db_up = True
-            except (Psycopg2Error, OperationalError):
-                self.stdout.write('Database unavailable, waiting 1 second...')
-                time.sleep(1)
-
-        self.stdout.write(self.style.SUCCESS('Database available!'))
+        start = time.monotonic()
+        results = wait_for_databases(
+            aliases,
+            timeout=options['timeout'] or None,
+            initial_delay=options['initial_delay'],
+            max_delay=options['max_delay'],
+            migrations=options['migrations'],
+            on_retry=self.report_retry,
+        )
+        elapsed = time.monotonic() - start
+
+        failed = [result for result in results if not result.ready]
+        for result in results:
+            if result.ready:
+                self.stdout.write(
+                    f"Database '{result.alias}' ready in "
+                    f'{result.elapsed:.2f}s ({result.attempts} attempt(s)).'
+                )
+        if failed:
+            raise CommandError('\n'.join(
+                f"Database '{result.alias}' not ready after "
+                f'{result.elapsed:.2f}s: {result.error}'
+                for result in failed
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f'Database available! (ready in {elapsed:.2f}s)'
+        ))
+
+    def report_retry(self, alias, error, delay):
+        # Gọi từ thread của từng alias.
+        message = str(error).strip().split('\n')[0]
+        self.stdout.write(
+            f"Database '{alias}' unavailable ({message}), "
+            f'retrying in {delay:.2f}s...'
+        )
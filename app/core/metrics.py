@@ -0,0 +1,211 @@
+"""
+    Đo thời gian từng request: tổng, DB (số query và thời gian) và
+    serializer, cho header Server-Timing và endpoint metrics (Prometheus).
+
+    Không dùng prometheus_client: histogram ở đây chỉ là vài list đếm trong
+    bộ nhớ của mỗi process, đủ rẻ để chạy ở mọi request (xem
+    benchmarks/bench_timing.py). Mỗi worker có số liệu riêng, giống các
+    endpoint thống kê khác.
+"""
+import bisect
+import contextlib
+import contextvars
+import threading
+import time
+
+from rest_framework import serializers
+
+# Thời gian (giây) và số query: cận trên của các bucket, +Inf thêm khi render.
+DURATION_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class RequestTiming:
+    """DB and serializer time of one request.
+
+    Dùng làm execute wrapper của connection (connection.execute_wrapper).
+    """
+    __slots__ = ('db_time', 'db_queries', 'serializer_time')
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.serializer_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.db_queries += 1
+
+    def server_timing(self, total):
+        """Return the Server-Timing header value (durations in ms)."""
+        return (
+            f'db;dur={self.db_time * 1000:.2f};'
+            f'desc="{self.db_queries} queries", '
+            f'serializer;dur={self.serializer_time * 1000:.2f}, '
+            f'total;dur={total * 1000:.2f}'
+        )
+
+
+_current = contextvars.ContextVar('request_timing', default=None)
+
+
+@contextlib.contextmanager
+def timing_request():
+    """Collect the timings of the code run inside the block."""
+    timing = RequestTiming()
+    token = _current.set(timing)
+    try:
+        yield timing
+    finally:
+        _current.reset(token)
+
+
+# Cài một lần trên mọi connection (signal connection_created, xem
+# core.apps), không cài theo từng request: connection Django là riêng của
+# từng thread, mà dưới ASGI query chạy trong thread của sync_to_async chứ
+# không phải thread của event loop. ContextVar được copy sang thread đó nên
+# query vẫn được tính vào request đang chạy.
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper adding the query to the current request timing."""
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    return timing(execute, sql, params, many, context)
+
+
+def install_query_timing(sender, connection, **kwargs):
+    """Time the queries of a new connection (connection_created handler)."""
+    # connection_created được gửi lại mỗi lần kết nối lại.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextlib.contextmanager
+def measure_serializer():
+    """Add the time spent in the block to the request serializer time."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.serializer_time += time.perf_counter() - start
+
+
+class TimedSerializerMixin:
+    """Count the time spent building serializer.data per request."""
+
+    @property
+    def data(self):
+        with measure_serializer():
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """ListSerializer counting its time, set as Meta.list_serializer_class.
+
+    Chỉ đo ở cấp list: to_representation của từng item không bị đo lặp.
+    """
+
+
+class Histogram:
+    """Prometheus style histogram with one series per label value."""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        # label -> [số lần rơi vào từng bucket (+Inf ở cuối), tổng]
+        self.series = {}
+
+    def observe(self, label, value):
+        """Record value; the caller holds the registry lock."""
+        series = self.series.get(label)
+        if series is None:
+            series = self.series[label] = [[0] * (len(self.buckets) + 1), 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self, label_name):
+        lines = [
+            f'# HELP {self.name} {self.help_text}',
+            f'# TYPE {self.name} histogram',
+        ]
+        for label, (counts, total) in sorted(self.series.items()):
+            selector = f'{label_name}="{_escape(label)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{selector},le="{bound}"}} '
+                    f'{cumulative}'
+                )
+            lines.append(f'{self.name}_sum{{{selector}}} {total}')
+            lines.append(f'{self.name}_count{{{selector}}} {cumulative}')
+        return lines
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+class RequestMetrics:
+    """Per-view histograms of request, DB and serializer time."""
+    label_name = 'view'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.duration = Histogram(
+            'http_request_duration_seconds',
+            'Wall time of requests.', DURATION_BUCKETS,
+        )
+        self.db_duration = Histogram(
+            'http_request_db_duration_seconds',
+            'Time spent in DB queries per request.', DURATION_BUCKETS,
+        )
+        self.db_queries = Histogram(
+            'http_request_db_queries',
+            'Number of DB queries per request.', QUERY_BUCKETS,
+        )
+        self.serializer_duration = Histogram(
+            'http_request_serializer_duration_seconds',
+            'Time spent building serializer data per request.',
+            DURATION_BUCKETS,
+        )
+
+    def observe(self, view, total, timing):
+        with self._lock:
+            self.duration.observe(view, total)
+            self.db_duration.observe(view, timing.db_time)
+            self.db_queries.observe(view, timing.db_queries)
+            self.serializer_duration.observe(view, timing.serializer_time)
+
+    def render(self):
+        """Return the metrics in the Prometheus text format."""
+        with self._lock:
+            lines = []
+            for histogram in (
+                self.duration, self.db_duration, self.db_queries,
+                self.serializer_duration,
+            ):
+                lines.extend(histogram.render(self.label_name))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            for histogram in (
+                self.duration, self.db_duration, self.db_queries,
+                self.serializer_duration,
+            ):
+                histogram.series.clear()
+
+
+request_metrics = RequestMetrics()
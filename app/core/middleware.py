@@ -0,0 +1,184 @@
+"""Middleware of the core app."""
+import asyncio
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+
+from core.compression import choose_codec
+from core.db_router import read_from_replica, use_primary
+from core.metrics import request_metrics, timing_request
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def sticky_cache_key(request):
+    """Return the read-your-writes cache key of the request's client.
+
+    Client được nhận diện bằng header Authorization (token) hoặc cookie
+    session, vì middleware chạy trước khi DRF xác thực user.
+    """
+    credentials = request.headers.get('Authorization') or request.COOKIES.get(
+        settings.SESSION_COOKIE_NAME
+    )
+    if not credentials:
+        return None
+    digest = hashlib.sha256(credentials.encode()).hexdigest()
+    return f'db-sticky:{digest}'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Read safe requests from the replicas, with read-your-writes stickiness.
+
+    Request ghi (POST/PUT/PATCH/DELETE) thành công đánh dấu client trong
+    DB_REPLICA_STICKY_SECONDS giây; trong thời gian đó mọi request của
+    client đọc từ primary để thấy ngay dữ liệu vừa ghi.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Đánh dấu middleware là async để Django không bọc sync_to_async.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.DB_REPLICAS:
+            return self.get_response(request)
+        key = sticky_cache_key(request)
+        cache = caches[settings.DB_REPLICA_STICKY_CACHE]
+        if request.method in SAFE_METHODS:
+            sticky = key is not None and cache.get(key) is not None
+            with use_primary() if sticky else read_from_replica():
+                return self.get_response(request)
+        response = self.get_response(request)
+        if key is not None and response.status_code < 400:
+            cache.set(key, True, settings.DB_REPLICA_STICKY_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DB_REPLICAS:
+            return await self.get_response(request)
+        key = sticky_cache_key(request)
+        cache = caches[settings.DB_REPLICA_STICKY_CACHE]
+        if request.method in SAFE_METHODS:
+            sticky = key is not None and await cache.aget(key) is not None
+            with use_primary() if sticky else read_from_replica():
+                return await self.get_response(request)
+        response = await self.get_response(request)
+        if key is not None and response.status_code < 400:
+            await cache.aset(key, True, settings.DB_REPLICA_STICKY_SECONDS)
+        return response
+
+
+def view_name(request):
+    """Return the URL name (namespace:name) of the resolved view."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or 'unnamed'
+
+
+class RequestTimingMiddleware:
+    """
+    Measure wall, DB and serializer time of every request.
+
+    Thêm header Server-Timing vào response và ghi vào các histogram theo
+    URL name của core.metrics (xem /metrics/). Query được đo bởi
+    core.metrics.record_query, cài trên mọi connection DB (cả replica).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with timing_request() as timing:
+            response = self.get_response(request)
+        return self.finish(request, response, timing, start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with timing_request() as timing:
+            response = await self.get_response(request)
+        return self.finish(request, response, timing, start)
+
+    def finish(self, request, response, timing, start):
+        total = time.perf_counter() - start
+        response['Server-Timing'] = timing.server_timing(total)
+        request_metrics.observe(view_name(request), total, timing)
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with zstd, brotli or gzip per Accept-Encoding.
+
+    Chỉ nén content type trong COMPRESSION_CONTENT_TYPES; body thường nhỏ
+    hơn COMPRESSION_MIN_SIZE byte thì gửi nguyên (nén không đáng CPU).
+    StreamingHttpResponse (export) được nén từng chunk, không đọc hết body.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        if not response.streaming and \
+                len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        content_type = response.get('Content-Type', '').partition(';')[0]
+        if content_type.strip().lower() not in \
+                settings.COMPRESSION_CONTENT_TYPES:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        codec = choose_codec(request.headers.get('Accept-Encoding', ''))
+        if codec is None:
+            return response
+        if response.streaming:
+            response.streaming_content = codec.stream(
+                response.streaming_content
+            )
+            del response['Content-Length']
+        else:
+            compressed = codec.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # Body đã khác byte so với bản gốc: ETag mạnh thành ETag yếu.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        response['Content-Encoding'] = codec.name
+        return response
@@ -0,0 +1,83 @@
+# Generated by Django 4.0.10 on 2026-10-18 18:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Trigger theo câu lệnh (FOR EACH STATEMENT) với transition table: một câu
+# bulk_create/update/delete nhiều dòng chỉ cập nhật mỗi user một lần.
+# Bên DELETE/UPDATE chỉ UPDATE (không tạo dòng) để cascade khi xóa user
+# không tạo lại dòng tổng hợp của user đang bị xóa.
+CREATE_TRIGGERS = """
+CREATE FUNCTION core_recipe_stats_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE core_recipestats AS s SET
+            recipe_count = s.recipe_count - d.recipe_count,
+            price_sum = s.price_sum - d.price_sum,
+            time_minutes_sum = s.time_minutes_sum - d.time_minutes_sum
+        FROM (
+            SELECT user_id, count(*) AS recipe_count,
+                   sum(price) AS price_sum,
+                   sum(time_minutes) AS time_minutes_sum
+            FROM old_rows GROUP BY user_id
+        ) AS d
+        WHERE s.user_id = d.user_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO core_recipestats AS s
+            (user_id, recipe_count, price_sum, time_minutes_sum)
+        SELECT user_id, count(*), sum(price), sum(time_minutes)
+        FROM new_rows GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE SET
+            recipe_count = s.recipe_count + EXCLUDED.recipe_count,
+            price_sum = s.price_sum + EXCLUDED.price_sum,
+            time_minutes_sum = s.time_minutes_sum + EXCLUDED.time_minutes_sum;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_recipe_stats_insert
+    AFTER INSERT ON core_recipe REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION core_recipe_stats_update();
+CREATE TRIGGER core_recipe_stats_update
+    AFTER UPDATE ON core_recipe
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION core_recipe_stats_update();
+CREATE TRIGGER core_recipe_stats_delete
+    AFTER DELETE ON core_recipe REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION core_recipe_stats_update();
+
+INSERT INTO core_recipestats
+    (user_id, recipe_count, price_sum, time_minutes_sum)
+SELECT user_id, count(*), sum(price), sum(time_minutes)
+FROM core_recipe GROUP BY user_id;
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER core_recipe_stats_insert ON core_recipe;
+DROP TRIGGER core_recipe_stats_update ON core_recipe;
+DROP TRIGGER core_recipe_stats_delete ON core_recipe;
+DROP FUNCTION core_recipe_stats_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_recipe_updated_at_user_recipes_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recipe_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('recipe_count', models.BigIntegerField(default=0)),
+                ('price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('time_minutes_sum', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
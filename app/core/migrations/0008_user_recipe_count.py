@@ -0,0 +1,30 @@
+# Generated by Django 4.0.10 on 2026-10-18 19:25
+
+from django.db import migrations, models
+
+# Đếm recipe của các user có sẵn; từ đây Recipe.save()/delete() và các
+# thao tác bulk giữ recipe_count bằng touch_recipes.
+BACKFILL = """
+UPDATE core_user AS u SET recipe_count = c.recipe_count
+FROM (
+    SELECT user_id, count(*) AS recipe_count
+    FROM core_recipe GROUP BY user_id
+) AS c
+WHERE u.id = c.user_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_recipe_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='recipe_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
@@ -1,8 +1,14 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.contrib.auth.hashers import check_password, make_password
 
 # import đối tượng settings, cho phép truy cập các cấu hình của dự án được định nghĩa trong file settings.py
 from django.conf import settings
+from core.hashing import get_hashing_pool, must_rehash
 
 # AbstractBaseUser cung cấp chức năng xác thực nhưng không có trường mặc định
 # PermissionsMixin thêm chức năng quản lý quyền và các trường liên quan.
@@ -32,6 +38,20 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
         return user
 
+    # Gọi sau mỗi lần ghi recipe (kể cả bulk), trong cùng transaction: F()
+    # tăng/giảm trong DB nên không mất lượt khi nhiều request ghi cùng lúc.
+    # added: số recipe thêm (âm khi xóa). Sửa lại khi bị lệch:
+    # manage.py repair_recipe_counts.
+    def touch_recipes(self, user_id, added=0):
+        """Bump the recipe version marker and count of a user."""
+        fields = {
+            'recipes_version': F('recipes_version') + 1,
+            'recipes_updated_at': timezone.now(),
+        }
+        if added:
+            fields['recipe_count'] = F('recipe_count') + added
+        self.filter(pk=user_id).update(**fields)
+
 #Tạo Custom User Model
 class User(AbstractBaseUser, 
            PermissionsMixin):
@@ -40,10 +60,51 @@ class User(AbstractBaseUser,
     name = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    # Version marker cho danh sách recipe của user (ETag/Last-Modified):
+    # đổi sau mỗi lần tạo/sửa/xóa recipe, xem UserManager.touch_recipes.
+    recipes_version = models.PositiveBigIntegerField(default=0)
+    recipes_updated_at = models.DateTimeField(null=True, blank=True)
+    # Số recipe của user, để /me trả về mà không đếm bảng recipe. Không
+    # ràng buộc >= 0: số đếm bị lệch không được làm hỏng thao tác xóa.
+    recipe_count = models.IntegerField(default=0)
     
     objects = UserManager()
     
     USERNAME_FIELD = 'email' #dùng email thay vì username mặc định cho xác thực.
+
+    # Các trường chỉ touch_recipes ghi (bằng F()). User lấy từ cache token
+    # hoặc đọc trước một lần ghi recipe mang giá trị cũ: save() không được
+    # ghi đè chúng.
+    RECIPE_COUNTER_FIELDS = (
+        'recipes_version', 'recipes_updated_at', 'recipe_count',
+    )
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.RECIPE_COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    # Băm/kiểm tra mật khẩu chạy trong thread pool giới hạn (core.hashing).
+    # Được gọi bởi create_user, serializer và authenticate() của Django.
+    def set_password(self, raw_password):
+        self.password = get_hashing_pool().run(make_password, raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """Check raw_password, rehashing it if the hasher settings changed."""
+        is_correct = get_hashing_pool().run(
+            check_password, raw_password, self.password
+        )
+        # Hash lại và lưu ngay trong request thread (cần DB connection).
+        if is_correct and must_rehash(self.password):
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=['password'])
+        return is_correct
     
 class Recipe(models.Model):
     user = models.ForeignKey(
@@ -55,6 +116,91 @@ class Recipe(models.Model):
     time_minutes = models.IntegerField()
     price = models.DecimalField(max_digits=5, decimal_places=2)
     link = models.CharField(max_length=255, blank=True)
+    # tsvector của title + description, do trigger trong DB tính
+    # (xem migration 0004), Django không tự ghi giá trị.
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # API luôn lọc theo user và sắp xếp theo -id: index
+            # (user_id, id DESC) trả về đúng thứ tự, Postgres không phải sort.
+            models.Index(
+                fields=['user', '-id'], name='recipe_user_id_desc_idx'
+            ),
+            # Lọc khoảng và sắp xếp theo price/time_minutes/title (xem
+            # recipe.filters); id ở cuối để thứ tự ổn định khi trùng giá trị.
+            models.Index(
+                fields=['user', 'price', 'id'], name='recipe_user_price_idx'
+            ),
+            models.Index(
+                fields=['user', 'time_minutes', 'id'],
+                name='recipe_user_time_idx',
+            ),
+            models.Index(
+                fields=['user', 'title', 'id'], name='recipe_user_title_idx'
+            ),
+            # GIN (user_id, search_vector) cần extension btree_gin: chỉ đọc
+            # kết quả của user hiện tại thay vì của mọi user.
+            GinIndex(
+                fields=['user', 'search_vector'],
+                name='recipe_search_vector_idx',
+            ),
+        ]
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+    # save()/delete() từng recipe (API, admin) tự cập nhật version marker và
+    # số recipe; các thao tác bulk gọi User.objects.touch_recipes một lần
+    # cho cả batch.
+    def save(self, *args, **kwargs):
+        added = 1 if self._state.adding else 0
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            User.objects.touch_recipes(self.user_id, added)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            result = super().delete(*args, **kwargs)
+            # Trừ theo số dòng thật sự bị xóa: xóa một bản sao cũ của recipe
+            # đã bị xóa ở nơi khác (0 dòng) thì không trừ lần nữa.
+            deleted = result[1].get(self._meta.label, 0)
+            if deleted:
+                User.objects.touch_recipes(self.user_id, -deleted)
+        return result
+
+
+# Bảng tổng hợp recipe theo user cho /api/recipe/stats/: đọc một dòng thay
+# vì aggregate cả bảng recipe. Trigger trong DB (migration 0007) cộng/trừ
+# các tổng sau mỗi câu INSERT/UPDATE/DELETE trên core_recipe, nên đúng cả
+# với bulk_create, queryset.update()/delete() và cascade khi xóa user.
+# Tính lại toàn bộ: manage.py rebuild_recipe_stats.
+class RecipeStats(models.Model):
+    """Per-user recipe count and sums, maintained by DB triggers."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='recipe_stats',
+    )
+    recipe_count = models.BigIntegerField(default=0)
+    price_sum = models.DecimalField(
+        max_digits=20, decimal_places=2, default=0
+    )
+    time_minutes_sum = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.user_id}: {self.recipe_count} recipes'
+
+    @property
+    def average_price(self):
+        if not self.recipe_count:
+            return None
+        return self.price_sum / self.recipe_count
+
+    @property
+    def average_time_minutes(self):
+        if not self.recipe_count:
+            return None
+        return self.time_minutes_sum / self.recipe_count
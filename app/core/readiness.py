@@ -0,0 +1,100 @@
+"""
+    Kiểm tra DB đã sẵn sàng nhận request, dùng bởi lệnh wait_for_db.
+
+    Mỗi lần thử chỉ mở connection và chạy SELECT 1 (không chạy system
+    checks), thử lại với exponential backoff có jitter: container khởi động
+    cùng lúc không dội vào DB cùng một nhịp, và DB lên nhanh thì không phải
+    chờ hết một khoảng sleep cố định. Mỗi alias được chờ trong thread riêng.
+"""
+import collections
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import OperationalError, connections
+from django.db.migrations.executor import MigrationExecutor
+from psycopg2 import OperationalError as Psycopg2Error
+
+Readiness = collections.namedtuple(
+    'Readiness', ['alias', 'ready', 'elapsed', 'attempts', 'error']
+)
+
+
+class MigrationsPending(Exception):
+    """The database is up but has unapplied migrations."""
+
+
+def backoff_delays(initial, maximum):
+    """Yield exponentially growing delays with jitter, capped at maximum.
+
+    Equal jitter: mỗi lần chờ trong khoảng [delay/2, delay], vừa phân tán
+    các client vừa không chờ quá ngắn.
+    """
+    delay = initial
+    while True:
+        yield random.uniform(delay / 2, delay)
+        delay = min(delay * 2, maximum)
+
+
+def probe(alias):
+    """Open a connection to alias and run SELECT 1."""
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    finally:
+        connection.close()
+
+
+def pending_migrations(alias):
+    """Return the migrations not yet applied on alias."""
+    connection = connections[alias]
+    try:
+        executor = MigrationExecutor(connection)
+        return executor.migration_plan(executor.loader.graph.leaf_nodes())
+    finally:
+        connection.close()
+
+
+def wait_for_database(alias, timeout=None, initial_delay=0.05,
+                      max_delay=2.0, migrations=False, on_retry=None):
+    """Probe alias until it answers or timeout seconds pass.
+
+    on_retry(alias, error, delay) được gọi trước mỗi lần chờ.
+    """
+    start = time.monotonic()
+    deadline = math.inf if timeout is None else start + timeout
+    attempts, error = 0, None
+    for delay in backoff_delays(initial_delay, max_delay):
+        attempts += 1
+        try:
+            probe(alias)
+            if migrations:
+                pending = pending_migrations(alias)
+                if pending:
+                    raise MigrationsPending(
+                        f'{len(pending)} unapplied migration(s)'
+                    )
+            return Readiness(
+                alias, True, time.monotonic() - start, attempts, None
+            )
+        except (Psycopg2Error, OperationalError, MigrationsPending) as exc:
+            error = exc
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        delay = min(delay, remaining)
+        if on_retry is not None:
+            on_retry(alias, error, delay)
+        time.sleep(delay)
+    return Readiness(alias, False, time.monotonic() - start, attempts, error)
+
+
+def wait_for_databases(aliases, **options):
+    """Wait for every alias at the same time; return their Readiness."""
+    with ThreadPoolExecutor(max_workers=len(aliases)) as executor:
+        return list(executor.map(
+            lambda alias: wait_for_database(alias, **options), aliases
+        ))
@@ -0,0 +1,62 @@
+"""
+    Renderer nhanh cho API: JSON bằng orjson và MessagePack.
+
+    Chọn theo header Accept (hoặc ?format=json / ?format=msgpack). Kiểu
+    orjson/msgpack không tự encode (Decimal, lazy string, timedelta...) đi
+    qua encode_default, nên output giống JSONRenderer của DRF, trừ Decimal
+    được giữ nguyên dạng chuỗi thay vì đổi sang float.
+"""
+from decimal import Decimal
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_drf_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """Encode types unknown to orjson/msgpack the way DRF does."""
+    # float(Decimal) làm mất độ chính xác (price), giữ dạng chuỗi như
+    # DecimalField của serializer.
+    if isinstance(obj, Decimal):
+        return str(obj)
+    return _drf_encoder.default(obj)
+
+
+# Datetime đi qua encode_default để có cùng định dạng với DRF ('Z', ms).
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def dumps_json(data, indent=False):
+    """Return data as compact UTF-8 JSON bytes."""
+    options = ORJSON_OPTIONS
+    if indent:
+        options |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=encode_default, option=options)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer backed by orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # orjson chỉ hỗ trợ thụt lề 2 space, dùng cho mọi indent được yêu cầu
+        # (Accept: application/json; indent=4).
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return dumps_json(data, indent=bool(indent))
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack renderer: smaller payloads than JSON."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
@@ -0,0 +1,192 @@
+"""
+    Phát hiện N+1 query: gọi từng route với dữ liệu cỡ N rồi 10N, số query
+    phải không đổi.
+
+    Số query tăng theo N nghĩa là có query chạy cho từng dòng (thiếu
+    select_related/prefetch_related, property gọi DB trong serializer...).
+    Khi fail, các câu SQL lặp lại (đã bỏ giá trị literal) được liệt kê kèm
+    số lần chạy để thấy ngay query nào bị lặp.
+"""
+import fnmatch
+import re
+from collections import Counter
+
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+
+# Literal trong SQL: chuỗi, số, danh sách IN (...) và placeholder %s.
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN \((?:\?, )*\?\)', re.I)
+_PLACEHOLDER = re.compile(r'%s')
+# Tên server-side cursor của iterator() có chứa id ngẫu nhiên.
+_CURSOR_NAME = re.compile(r'"_django_curs_[^"]*"')
+
+
+def normalize_sql(sql):
+    """Return sql with literal values replaced by '?'."""
+    sql = _CURSOR_NAME.sub('"_django_curs"', sql)
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def duplicated_queries(queries):
+    """Return [(count, pattern)] of normalized SQL run more than once."""
+    counts = Counter(normalize_sql(query['sql']) for query in queries)
+    return sorted(
+        ((count, sql) for sql, count in counts.items() if count > 1),
+        reverse=True,
+    )
+
+
+def iter_routes(urlconf=None):
+    """Yield (name, route) of every named URL pattern of urlconf.
+
+    name có namespace (recipe:recipe-list). Các pattern trùng name (ví dụ
+    bản có format suffix của DefaultRouter) chỉ được trả về một lần.
+    """
+    seen = set()
+
+    def walk(patterns, namespace, prefix):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                inner = namespace
+                if pattern.namespace:
+                    inner = f'{namespace}{pattern.namespace}:'
+                yield from walk(pattern.url_patterns, inner, route)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                name = namespace + pattern.name
+                if name not in seen:
+                    seen.add(name)
+                    yield name, route
+
+    yield from walk(get_resolver(urlconf).url_patterns, '', '')
+
+
+class QueryCountMixin:
+    """TestCase mixin failing when a route's query count grows with data.
+
+    Lớp con định nghĩa:
+      - create_fixtures(start, count): tạo thêm count dòng dữ liệu cho mọi
+        route, đánh số từ start để không trùng giá trị unique.
+      - route_requests: {pattern tên route: tên method}; method nhận size
+        (tổng số dòng đã tạo) và trả về list request mới ở mỗi lần gọi, mỗi
+        request là dict gồm 'method', 'path' và tham số khác của
+        self.client.<method> (data, format...).
+      - skip_routes: {pattern tên route: lý do} cho route không cần kiểm tra.
+    Pattern theo cú pháp fnmatch, ví dụ 'admin:*_changelist'.
+    """
+    fixture_size = 5
+    growth_factor = 10
+    urlconf = None
+    route_requests = {}
+    skip_routes = {}
+
+    def create_fixtures(self, start, count):
+        raise NotImplementedError
+
+    def _match(self, patterns, name):
+        for pattern in patterns:
+            if fnmatch.fnmatchcase(name, pattern):
+                return pattern
+        return None
+
+    def routes_to_check(self):
+        """Return the names of routes having a request builder."""
+        return [
+            name for name, _ in iter_routes(self.urlconf)
+            if self._match(self.route_requests, name)
+        ]
+
+    def assertRoutesCovered(self):
+        """Fail if a route is neither checked nor explicitly skipped.
+
+        Route mới thêm vào urls phải được khai báo request hoặc lý do bỏ
+        qua, nên không có endpoint nào lọt khỏi kiểm tra N+1.
+        """
+        missing = [
+            f'{name} ({route})' for name, route in iter_routes(self.urlconf)
+            if not self._match(self.route_requests, name)
+            and not self._match(self.skip_routes, name)
+        ]
+        self.assertFalse(
+            missing,
+            'Routes without N+1 check, add them to route_requests or '
+            'skip_routes:\n  ' + '\n  '.join(missing),
+        )
+
+    def build_requests(self, name, size):
+        method = getattr(self, self.route_requests[
+            self._match(self.route_requests, name)
+        ])
+        return method(name, size)
+
+    def capture_request(self, request):
+        """Run one request with empty caches, return the captured queries."""
+        # Cache hit ở lần đo này mà miss ở lần kia sẽ làm sai số query.
+        for cache in caches.all():
+            cache.clear()
+        kwargs = dict(request)
+        send = getattr(self.client, kwargs.pop('method'))
+        with CaptureQueriesContext(connection) as ctx:
+            response = send(kwargs.pop('path'), **kwargs)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        if response.status_code >= 400:
+            self.fail(
+                f'{request["method"].upper()} {request["path"]} returned '
+                f'{response.status_code}: {response.content[:500]!r}'
+            )
+        return ctx.captured_queries
+
+    def measure_route(self, name):
+        """Return [(label, queries at N, queries at growth * N)]."""
+        small = self.fixture_size
+        large = small * self.growth_factor
+        self.create_fixtures(0, small)
+        # Chạy thử một lần: có query chỉ chạy một lần cho cả process
+        # (ContentType, permission...). Request được build lại cho mỗi lần
+        # chạy vì request ghi (tạo, xóa) không lặp lại được.
+        for request in self.build_requests(name, small):
+            self.capture_request(request)
+        before = [
+            self.capture_request(request)
+            for request in self.build_requests(name, small)
+        ]
+        self.create_fixtures(small, large - small)
+        results = []
+        for request, queries in zip(
+            self.build_requests(name, large), before
+        ):
+            label = f'{request["method"].upper()} {request["path"]}'
+            results.append((label, queries, self.capture_request(request)))
+        return results
+
+    def assertNoNPlusOne(self, name):
+        """Fail if a request of route name runs more queries with more data.
+
+        Dữ liệu tạo trong savepoint và bị rollback, nên các route được đo
+        độc lập với nhau trong cùng một test.
+        """
+        with transaction.atomic():
+            results = self.measure_route(name)
+            transaction.set_rollback(True)
+        small = self.fixture_size
+        large = small * self.growth_factor
+        for label, before, after in results:
+            if len(after) <= len(before):
+                continue
+            duplicated = '\n'.join(
+                f'  {count}x {sql}'
+                for count, sql in duplicated_queries(after)
+            )
+            self.fail(
+                f'{name}: {label} ran {len(before)} queries with {small} '
+                f'rows and {len(after)} with {large} rows. '
+                f'Duplicated SQL:\n{duplicated or "  (none)"}'
+            )
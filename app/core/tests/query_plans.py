@@ -0,0 +1,99 @@
+"""
+    Kiểm tra query plan (EXPLAIN) của các câu SQL mà API sinh ra.
+
+    Dùng trong test với dữ liệu lớn: nếu Postgres phải Seq Scan hoặc Sort
+    trên bảng đã có index thì test fail, bắt lỗi mất index trước khi deploy.
+"""
+import json
+import re
+import unittest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Sort bị cấm ở mọi nơi, Seq Scan chỉ bị cấm trên plan_tables.
+SORT_NODE_TYPES = ('Sort', 'Incremental Sort')
+
+# iterator() trên Postgres dùng server-side cursor: DECLARE ... FOR SELECT.
+DECLARE_CURSOR = re.compile(r'^\s*DECLARE\s.*?\sCURSOR\s.*?FOR\s', re.I | re.S)
+
+
+def plan_nodes(plan):
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan tree."""
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+def explain(sql):
+    """Return the root plan node of sql.
+
+    SELECT được chạy thật (EXPLAIN ANALYZE) để biết số dòng bị Filter bỏ đi;
+    UPDATE/DELETE chỉ lấy plan, không thực thi.
+    """
+    options = 'FORMAT JSON'
+    if sql.lstrip().upper().startswith('SELECT'):
+        options = 'ANALYZE, FORMAT JSON'
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN ({options}) {sql}')
+        result = cursor.fetchone()[0]
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]['Plan']
+
+
+class QueryPlanMixin:
+    """TestCase mixin asserting captured queries use indexes."""
+
+    # Chỉ kiểm tra câu SQL đụng tới các bảng này.
+    plan_tables = ()
+
+    @classmethod
+    def setUpClass(cls):
+        if connection.vendor != 'postgresql':
+            raise unittest.SkipTest('Query plans need PostgreSQL.')
+        super().setUpClass()
+
+    def analyze_tables(self):
+        """Refresh planner statistics after loading fixture data."""
+        with connection.cursor() as cursor:
+            for table in self.plan_tables:
+                cursor.execute(f'ANALYZE {table}')
+
+    def captured_statements(self, func):
+        """Run func and return the SELECT/UPDATE/DELETE on plan_tables."""
+        with CaptureQueriesContext(connection) as ctx:
+            func()
+        statements = []
+        for query in ctx.captured_queries:
+            sql = DECLARE_CURSOR.sub('', query['sql'])
+            if not sql.lstrip().upper().startswith(
+                ('SELECT', 'UPDATE', 'DELETE')
+            ):
+                continue
+            if any(f'"{table}"' in sql for table in self.plan_tables):
+                statements.append(sql)
+        return statements
+
+    def assertIndexedPlans(self, func):
+        """Fail if a statement issued by func seq scans, sorts, or filters
+        out more rows than it returns."""
+        statements = self.captured_statements(func)
+        self.assertTrue(statements, 'No statement was captured.')
+        for sql in statements:
+            for node in plan_nodes(explain(sql)):
+                node_type = node['Node Type']
+                relation = node.get('Relation Name')
+                seq_scan = (
+                    node_type == 'Seq Scan' and relation in self.plan_tables
+                )
+                if seq_scan or node_type in SORT_NODE_TYPES:
+                    self.fail(f'{node_type} on {relation} in plan of:\n{sql}')
+                # Index không khớp điều kiện WHERE: quét nhiều dòng rồi bỏ đi.
+                removed = node.get('Rows Removed by Filter', 0)
+                if relation in self.plan_tables and \
+                        removed > node.get('Actual Rows', 0):
+                    self.fail(
+                        f'{node_type} on {relation} removed {removed} rows '
+                        f'by filter in plan of:\n{sql}'
+                    )
@@ -1,47 +1,113 @@
 """Test custom Django management commands"""
+from io import StringIO
 from unittest.mock import patch
 # allows us to actually call the command we want to test
 from django.core.management import call_command
+from django.core.management.base import CommandError
 # another error that we expect to happen when the db is not available
 from django.db import OperationalError
 # create unit tests for the command
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
 
+from core import readiness
 
-# patch to check method check in wait_for_db.py
-@patch('core.management.commands.wait_for_db.Command.check')
+
+# patch probe (SELECT 1) trong core.readiness, không kết nối DB thật
+@patch('core.readiness.probe')
 class CommandTests(SimpleTestCase):
     """Test commands"""
 
-    def test_wait_for_db_ready(self, patched_check):
+    def test_wait_for_db_ready(self, patched_probe):
         """Test waiting for database if database ready"""
-        # check method return True if the database is ready
-        patched_check.return_value = True
+        # probe không raise nghĩa là database đã sẵn sàng
+        patched_probe.return_value = None
+        out = StringIO()
         # call the command
-        call_command('wait_for_db')
+        call_command('wait_for_db', stdout=out)
 
-        # assert that the check method was called once with the default db
-        patched_check.assert_called_once_with(databases=['default'])
+        # assert that the probe was called once with the default db
+        patched_probe.assert_called_once_with('default')
+        self.assertIn('Database available! (ready in', out.getvalue())
 
-    @patch('time.sleep')
-    def test_wait_for_db_delay(self, patched_sleep, patched_check):
+    @patch('core.readiness.time.sleep')
+    def test_wait_for_db_delay(self, patched_sleep, patched_probe):
         """
         side_effect dùng để mô phỏng các giá trị hoặc lỗi
         mà hàm gốc sẽ trả về mỗi lần được gọi.
         Args:
-            patched_check : là một mock object (do unittest.mock.patch tạo ra)
+            patched_probe : là một mock object (do unittest.mock.patch tạo ra)
             thay thế cho function kiểm tra trạng thái database
         """
 
-        # 2 times the error, 3 times the true, 3 times the error
-        patched_check.side_effect = [OperationalError] * 2 + \
-                                    [True] * 3 + \
+        # 2 times the error, 1 time ready, 3 times the error
+        patched_probe.side_effect = [OperationalError] * 2 + \
+                                    [None] + \
                                     [OperationalError] * 3
 
-        call_command('wait_for_db')
+        call_command('wait_for_db', stdout=StringIO())
 
         # 3 do 2 lần lỗi và 1 lần thành công, những lần sau không được gọi
-        # call_command chỉ tiếp tục cho đến khi database sẵn sàng, và ko chạy
-        # thêm những lần True tiếp theo hay OperationalError sau đó nữa.
-        self.assertEqual(patched_check.call_count, 3)
-        patched_check.assert_called_with(databases=['default'])
+        self.assertEqual(patched_probe.call_count, 3)
+        patched_probe.assert_called_with('default')
+        # backoff: lần chờ thứ hai dài hơn lần đầu (có jitter trong khoảng)
+        first, second = [call.args[0] for call in patched_sleep.call_args_list]
+        self.assertTrue(0.025 <= first <= 0.05)
+        self.assertTrue(0.05 <= second <= 0.1)
+
+    def test_wait_for_db_timeout(self, patched_probe):
+        """Test the command fails once the timeout is reached"""
+        patched_probe.side_effect = OperationalError('connection refused')
+
+        with self.assertRaisesMessage(CommandError, 'connection refused'):
+            call_command(
+                'wait_for_db', timeout=0.1, initial_delay=0.01,
+                stdout=StringIO(),
+            )
+        self.assertGreater(patched_probe.call_count, 1)
+
+    def test_wait_for_many_aliases(self, patched_probe):
+        """Test every alias is probed, each in its own thread"""
+        call_command(
+            'wait_for_db', databases=['default', 'replica'],
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(
+            sorted(call.args[0] for call in patched_probe.call_args_list),
+            ['default', 'replica'],
+        )
+
+    @patch('core.readiness.time.sleep')
+    @patch('core.readiness.pending_migrations')
+    def test_wait_for_migrations(self, patched_pending, patched_sleep,
+                                 patched_probe):
+        """Test waiting until no migration is left to apply"""
+        patched_pending.side_effect = [['0007_recipe_stats'], []]
+        out = StringIO()
+
+        call_command('wait_for_db', migrations=True, stdout=out)
+
+        self.assertEqual(patched_pending.call_count, 2)
+        self.assertIn('1 unapplied migration(s)', out.getvalue())
+
+
+class BackoffTests(SimpleTestCase):
+    """Test retry delays"""
+
+    def test_delays_double_up_to_maximum(self):
+        delays = readiness.backoff_delays(0.1, 0.5)
+        bounds = [0.1, 0.2, 0.4, 0.5, 0.5]
+        for bound, delay in zip(bounds, delays):
+            self.assertTrue(bound / 2 <= delay <= bound)
+
+
+class ReadinessTests(TestCase):
+    """Test probes against the test database"""
+
+    def test_database_ready_and_migrated(self):
+        result, = readiness.wait_for_databases(
+            ['default'], timeout=5, migrations=True
+        )
+
+        self.assertTrue(result.ready)
+        self.assertEqual(result.attempts, 1)
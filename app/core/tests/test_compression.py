@@ -0,0 +1,231 @@
+"""Tests for response compression."""
+import gzip
+import unittest
+import zlib
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import compression
+from core.middleware import CompressionMiddleware
+from core.models import Recipe
+
+recipes_url = reverse('recipe:recipe-list')
+export_url = reverse('recipe:recipe-export')
+me_url = reverse('user:me')
+BODY = b'{"title": "Recipe"}' * 200
+# Số chunk BODY gom vào một khối stream.
+BODIES_PER_BLOCK = -(-compression.STREAM_BUFFER_SIZE // len(BODY))
+
+
+class ChooseCodecTests(SimpleTestCase):
+    """Test Accept-Encoding negotiation."""
+
+    def test_gzip(self):
+        self.assertEqual(compression.choose_codec('gzip').name, 'gzip')
+
+    def test_none_accepted(self):
+        self.assertIsNone(compression.choose_codec(''))
+        self.assertIsNone(compression.choose_codec('identity'))
+        self.assertIsNone(compression.choose_codec('gzip;q=0'))
+        self.assertIsNone(compression.choose_codec('*;q=0, identity'))
+
+    def test_highest_q_wins(self):
+        codec = compression.choose_codec('br;q=0.5, gzip;q=0.8')
+
+        self.assertEqual(codec.name, 'gzip')
+
+    def test_wildcard_uses_server_preference(self):
+        codec = compression.choose_codec('*')
+
+        self.assertEqual(codec.name, next(iter(compression.CODECS)))
+
+    @unittest.skipUnless(compression.brotli, 'brotli is not installed')
+    def test_brotli_preferred_to_gzip(self):
+        self.assertEqual(compression.choose_codec('gzip, br').name, 'br')
+
+    @unittest.skipUnless(compression.zstandard, 'zstandard is not installed')
+    def test_zstd_preferred(self):
+        self.assertEqual(
+            compression.choose_codec('gzip, br, zstd').name, 'zstd'
+        )
+
+
+class CodecTests(SimpleTestCase):
+    """Test every available codec round-trips one-shot and streamed data."""
+
+    def decompress(self, name, data):
+        if name == 'gzip':
+            return gzip.decompress(data)
+        if name == 'br':
+            return compression.brotli.decompress(data)
+        reader = compression.zstandard.ZstdDecompressor().stream_reader(data)
+        return reader.read()
+
+    def test_round_trip(self):
+        for name, codec in compression.CODECS.items():
+            with self.subTest(codec=name):
+                for body in (b'', b'x', BODY, BODY * 100):
+                    self.assertEqual(
+                        self.decompress(name, codec.compress(body)), body
+                    )
+                streamed = b''.join(codec.stream(iter([BODY, b'', BODY])))
+                self.assertEqual(self.decompress(name, streamed), BODY * 2)
+
+    def test_stream_flushes_each_block(self):
+        """Test each block can be decoded before the stream ends."""
+        chunks = compression.CODECS['gzip'].stream(
+            iter([BODY] * BODIES_PER_BLOCK * 2)
+        )
+        decoder = zlib.decompressobj(16 + 15)
+
+        self.assertEqual(
+            decoder.decompress(next(chunks)), BODY * BODIES_PER_BLOCK
+        )
+
+    def test_stream_coalesces_small_chunks(self):
+        """Test per-row chunks are compressed as one block, not per row."""
+        rows = [b'{"id": %d, "title": "Recipe"}\n' % i for i in range(1000)]
+        body = b''.join(rows)
+        for name, codec in compression.CODECS.items():
+            with self.subTest(codec=name):
+                streamed = list(codec.stream(iter(rows)))
+
+                self.assertLessEqual(len(streamed), 2)
+                self.assertLess(len(b''.join(streamed)), len(body) / 3)
+
+
+@override_settings(COMPRESSION_MIN_SIZE=1000)
+class CompressionMiddlewareTests(SimpleTestCase):
+    """Test which responses are compressed."""
+
+    def setUp(self):
+        self.request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+
+    def process(self, response, request=None):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(request or self.request)
+
+    def test_compresses_json(self):
+        res = self.process(HttpResponse(BODY, content_type='application/json'))
+
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertEqual(res['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(res['Content-Length']), len(res.content))
+        self.assertEqual(gzip.decompress(res.content), BODY)
+
+    def test_small_body_not_compressed(self):
+        res = self.process(
+            HttpResponse(b'{}' * 100, content_type='application/json')
+        )
+
+        self.assertFalse(res.has_header('Content-Encoding'))
+
+    def test_content_type_not_allowed(self):
+        res = self.process(HttpResponse(BODY, content_type='image/png'))
+
+        self.assertFalse(res.has_header('Content-Encoding'))
+        self.assertFalse(res.has_header('Vary'))
+
+    def test_client_without_accept_encoding(self):
+        res = self.process(
+            HttpResponse(BODY, content_type='application/json'),
+            RequestFactory().get('/'),
+        )
+
+        self.assertFalse(res.has_header('Content-Encoding'))
+        self.assertEqual(res['Vary'], 'Accept-Encoding')
+
+    def test_already_encoded(self):
+        response = HttpResponse(BODY, content_type='application/json')
+        response['Content-Encoding'] = 'identity'
+
+        self.assertEqual(self.process(response).content, BODY)
+
+    def test_etag_weakened(self):
+        response = HttpResponse(BODY, content_type='application/json')
+        response['ETag'] = '"abc"'
+
+        self.assertEqual(self.process(response)['ETag'], 'W/"abc"')
+
+    def test_streaming_compressed_lazily(self):
+        consumed = []
+
+        def body():
+            for i in range(BODIES_PER_BLOCK * 2):
+                consumed.append(i)
+                yield BODY
+
+        res = self.process(
+            StreamingHttpResponse(body(), content_type='text/csv')
+        )
+
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertFalse(res.has_header('Content-Length'))
+        self.assertEqual(consumed, [])
+        content = iter(res.streaming_content)
+        first = next(content)
+        self.assertEqual(consumed, list(range(BODIES_PER_BLOCK)))
+        self.assertEqual(
+            gzip.decompress(first + b''.join(content)),
+            BODY * BODIES_PER_BLOCK * 2,
+        )
+
+
+class CompressedApiTests(TestCase):
+    """Test compression of real API responses."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Recipe.objects.bulk_create(
+            Recipe(user=self.user, title=f'Recipe {i}', time_minutes=i,
+                   price=Decimal('9.99'), description='Simmer slowly.')
+            for i in range(100)
+        )
+
+    def test_list_compressed(self):
+        plain = self.client.get(recipes_url)
+        res = self.client.get(recipes_url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(res.content), plain.content)
+        self.assertLess(len(res.content), len(plain.content) / 3)
+
+    def test_weak_etag_revalidates(self):
+        res = self.client.get(recipes_url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(res['ETag'].startswith('W/"'))
+
+        res = self.client.get(
+            recipes_url, HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=res['ETag'],
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_small_response_not_compressed(self):
+        res = self.client.get(me_url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertFalse(res.has_header('Content-Encoding'))
+
+    def test_export_stream_compressed(self):
+        plain = b''.join(self.client.get(export_url).streaming_content)
+
+        res = self.client.get(export_url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        chunks = list(res.streaming_content)
+        self.assertEqual(gzip.decompress(b''.join(chunks)), plain)
+        # Các dòng được gom lại, không flush sau mỗi recipe.
+        self.assertLessEqual(len(chunks), 2)
+        self.assertLess(len(b''.join(chunks)), len(plain) / 3)
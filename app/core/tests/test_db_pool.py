@@ -0,0 +1,166 @@
+"""Tests for the DB connection pool and pooled backend."""
+import threading
+import time
+from unittest import mock
+
+import psycopg2
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
+from psycopg2 import extensions
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.db_pool import ConnectionPool
+
+stats_url = reverse('db-pool-stats')
+
+
+def fake_connection():
+    conn = mock.Mock(closed=0, autocommit=True)
+    conn.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Test the pool with fake connections."""
+
+    def make_pool(self, **options):
+        options.setdefault('max_size', 2)
+        options.setdefault('timeout', 0.05)
+        return ConnectionPool(fake_connection, **options)
+
+    def test_connection_reused(self):
+        pool = self.make_pool()
+        conn = pool.getconn()
+        pool.putconn(conn)
+
+        self.assertIs(pool.getconn(), conn)
+        stats = pool.stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['in_use'], 1)
+        self.assertEqual(stats['idle'], 0)
+
+    def test_max_size_timeout(self):
+        """Test checkout fails after timeout when the pool is full."""
+        pool = self.make_pool()
+        pool.getconn()
+        pool.getconn()
+
+        with self.assertRaises(psycopg2.OperationalError):
+            pool.getconn()
+        stats = pool.stats()
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertEqual(stats['created'], 2)
+
+    def test_waiter_gets_returned_connection(self):
+        pool = self.make_pool(max_size=1, timeout=5)
+        conn = pool.getconn()
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(pool.getconn()))
+        waiter.start()
+        deadline = time.monotonic() + 5
+        while pool.stats()['waiting'] != 1:
+            if time.monotonic() > deadline:
+                self.fail('The waiter never queued for a connection.')
+            time.sleep(0.001)
+        pool.putconn(conn)
+        waiter.join(5)
+
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(result, [conn])
+        stats = pool.stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertGreater(stats['wait_time_max_ms'], 0)
+
+    def test_broken_connection_replaced_on_checkout(self):
+        """Test a connection failing the health check is replaced."""
+        pool = self.make_pool(check_interval=0)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.cursor.side_effect = psycopg2.OperationalError
+
+        new_conn = pool.getconn()
+
+        self.assertIsNot(new_conn, conn)
+        conn.close.assert_called_once()
+        stats = pool.stats()
+        self.assertEqual(stats['health_check_failures'], 1)
+        self.assertEqual(stats['discarded'], 1)
+
+    def test_closed_connection_not_returned_to_pool(self):
+        pool = self.make_pool()
+        conn = pool.getconn()
+        conn.closed = 1
+        pool.putconn(conn)
+
+        self.assertEqual(pool.stats()['idle'], 0)
+        self.assertIsNot(pool.getconn(), conn)
+
+    def test_open_transaction_rolled_back(self):
+        pool = self.make_pool()
+        conn = pool.getconn()
+        conn.info.transaction_status = extensions.TRANSACTION_STATUS_INERROR
+        pool.putconn(conn)
+
+        conn.rollback.assert_called_once()
+        self.assertEqual(pool.stats()['idle'], 1)
+
+    def test_expired_connection_closed(self):
+        pool = self.make_pool(max_lifetime=0.01)
+        conn = pool.getconn()
+        with mock.patch('core.db_pool.time.monotonic') as monotonic:
+            monotonic.return_value = 10 ** 9
+            pool.putconn(conn)
+
+        conn.close.assert_called_once()
+        self.assertEqual(pool.stats()['idle'], 0)
+
+
+class PooledBackendTests(TransactionTestCase):
+    """Test Django connections are returned to and reused from the pool."""
+
+    def test_connection_reused_after_close(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_backend_pid()')
+            pid = cursor.fetchone()[0]
+        pool = connection.pool
+        idle = pool.stats()['idle']
+        connection.close()
+        self.assertEqual(pool.stats()['idle'], idle + 1)
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_backend_pid()')
+            self.assertEqual(cursor.fetchone()[0], pid)
+
+
+class PoolStatsApiTests(TestCase):
+    """Test the pool stats endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_stats_require_staff(self):
+        user = get_user_model().objects.create_user(
+            email='user@example.com', password='pass12345'
+        )
+        self.client.force_authenticate(user)
+
+        res = self.client.get(stats_url)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_stats_for_staff(self):
+        user = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='pass12345'
+        )
+        self.client.force_authenticate(user)
+
+        res = self.client.get(stats_url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        default = next(p for p in res.data if p['alias'] == 'default')
+        self.assertGreaterEqual(default['in_use'], 1)
+        self.assertIn('wait_time_mean_ms', default)
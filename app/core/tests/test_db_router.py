@@ -0,0 +1,227 @@
+"""Tests for read replica routing and read-your-writes stickiness."""
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import db_router
+from core.checks import check_replica_sticky_cache
+from core.models import Recipe
+from recipe.caching import get_response_cache
+
+REPLICA = 'replica'
+recipes_url = reverse('recipe:recipe-list')
+async_recipes_url = reverse('recipe:async-recipe-list')
+me_url = reverse('user:me')
+
+
+@override_settings(DB_REPLICAS=['replica_a', 'replica_b'])
+class RouterTests(SimpleTestCase):
+    """Test the router decisions."""
+
+    def setUp(self):
+        self.router = db_router.PrimaryReplicaRouter()
+
+    def test_reads_use_primary_by_default(self):
+        self.assertEqual(self.router.db_for_read(Recipe), DEFAULT_DB_ALIAS)
+
+    def test_reads_in_replica_block(self):
+        with db_router.read_from_replica():
+            self.assertIn(
+                self.router.db_for_read(Recipe), ['replica_a', 'replica_b']
+            )
+            self.assertEqual(
+                self.router.db_for_write(Recipe), DEFAULT_DB_ALIAS
+            )
+            with db_router.use_primary():
+                self.assertEqual(
+                    self.router.db_for_read(Recipe), DEFAULT_DB_ALIAS
+                )
+        self.assertEqual(self.router.db_for_read(Recipe), DEFAULT_DB_ALIAS)
+
+    def test_pin_to_primary_until_block_ends(self):
+        with db_router.read_from_replica():
+            db_router.pin_to_primary()
+            self.assertFalse(db_router.reading_from_replica())
+        with db_router.read_from_replica():
+            self.assertTrue(db_router.reading_from_replica())
+
+    @override_settings(DB_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        with db_router.read_from_replica():
+            self.assertEqual(
+                self.router.db_for_read(Recipe), DEFAULT_DB_ALIAS
+            )
+
+    def test_replicas_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica_a', 'core'))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'core'))
+
+
+@override_settings(DB_REPLICAS=[REPLICA])
+class ReplicaRoutingApiTests(TestCase):
+    """Test API reads go to the replica unless the client just wrote.
+
+    Alias 'replica' trỏ tới chính test DB nhưng là connection riêng, ngoài
+    transaction của test: dữ liệu tạo trong test chưa commit nên replica
+    không thấy, giống như chưa được replicate.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # User và token được commit trước, nên replica cũng thấy.
+        cls.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        cls.token = Token.objects.create(user=cls.user)
+        # Token mới tạo ghim request vào primary (pin_if_new): lùi ngày tạo
+        # để các test đọc từ replica.
+        Token.objects.filter(pk=cls.token.pk).update(
+            created=timezone.now() - timedelta(minutes=1)
+        )
+        super().setUpClass()
+        # Thêm alias sau setUpClass để TestCase không bọc nó trong atomic.
+        connections.settings[REPLICA] = {
+            **connections[DEFAULT_DB_ALIAS].settings_dict
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        super().tearDownClass()
+        cls.user.delete()
+
+    def setUp(self):
+        get_response_cache().clear()
+        caches[settings.DB_REPLICA_STICKY_CACHE].clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.payload = {
+            'title': 'Fresh recipe',
+            'time_minutes': 5,
+            'price': Decimal('2.50'),
+        }
+
+    def create_recipe(self):
+        return Recipe.objects.create(user=self.user, **self.payload)
+
+    def test_safe_request_reads_replica(self):
+        self.create_recipe()
+
+        with CaptureQueriesContext(connections[REPLICA]) as queries:
+            res = self.client.get(recipes_url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+        self.assertTrue(queries.captured_queries)
+
+    def test_reads_after_write_use_primary(self):
+        res = self.client.post(recipes_url, self.payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        with CaptureQueriesContext(connections[REPLICA]) as queries:
+            res = self.client.get(recipes_url)
+
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(queries.captured_queries, [])
+
+    @override_settings(DB_REPLICA_STICKY_SECONDS=0)
+    def test_stickiness_expires(self):
+        self.client.post(recipes_url, self.payload)
+
+        res = self.client.get(recipes_url)
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_failed_write_not_sticky(self):
+        res = self.client.post(recipes_url, {'title': ''})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.create_recipe()
+
+        res = self.client.get(recipes_url)
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_new_token_falls_back_to_primary(self):
+        """Test a token not yet on the replica still authenticates."""
+        user = get_user_model().objects.create_user(
+            email='new@example.com', password='testpass123'
+        )
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        res = self.client.get(me_url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], user.email)
+
+    def test_deactivated_user_rejected_while_replica_stale(self):
+        """Test a lagging replica cannot revive a deactivated user."""
+        self.assertEqual(
+            self.client.get(recipes_url).status_code, status.HTTP_200_OK
+        )
+        # Chưa commit: replica vẫn thấy user đang active.
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(recipes_url)
+        async_res = async_to_sync(self.async_client.get)(
+            async_recipes_url, AUTHORIZATION=f'Token {self.token.key}'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(async_res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_async_view_routing(self):
+        auth = {'AUTHORIZATION': f'Token {self.token.key}'}
+        res = await self.async_client.post(
+            async_recipes_url, {'title': 'Async', 'time_minutes': 5,
+                                'price': '2.50'},
+            content_type='application/json', **auth,
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = await self.async_client.get(async_recipes_url, **auth)
+        self.assertEqual(len(res.json()['results']), 1)
+
+        with self.settings(DB_REPLICA_STICKY_SECONDS=0):
+            await self.async_client.post(
+                async_recipes_url, {'title': 'Async 2', 'time_minutes': 5,
+                                    'price': '2.50'},
+                content_type='application/json', **auth,
+            )
+        res = await self.async_client.get(async_recipes_url, **auth)
+        self.assertEqual(res.json()['results'], [])
+
+
+class StickyCacheCheckTests(SimpleTestCase):
+    """Test the warning about a per-process stickiness cache."""
+
+    @override_settings(DB_REPLICAS=[REPLICA])
+    def test_single_worker(self):
+        self.assertEqual(check_replica_sticky_cache(None), [])
+
+    @override_settings(DB_REPLICAS=[], WEB_CONCURRENCY=4)
+    def test_no_replicas(self):
+        self.assertEqual(check_replica_sticky_cache(None), [])
+
+    @override_settings(DB_REPLICAS=[REPLICA], WEB_CONCURRENCY=4)
+    def test_several_workers_with_local_cache(self):
+        self.assertEqual(
+            [error.id for error in check_replica_sticky_cache(None)],
+            ['core.W002'],
+        )
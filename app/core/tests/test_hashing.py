@@ -0,0 +1,74 @@
+"""Tests for the password hashing pool and hashers."""
+import threading
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.test import SimpleTestCase, override_settings
+
+from core.hashing import HashingPool, HashingPoolBusy, must_rehash
+
+PBKDF2 = 'django.contrib.auth.hashers.PBKDF2PasswordHasher'
+ARGON2 = 'core.hashers.Argon2PasswordHasher'
+
+
+class HashingPoolTests(SimpleTestCase):
+    """Test the bounded hashing pool."""
+
+    def test_run_returns_result(self):
+        pool = HashingPool(max_workers=2, max_queue=2, timeout=1)
+        self.assertEqual(pool.run(pow, 2, 10), 1024)
+        self.assertEqual(pool.stats()['completed'], 1)
+
+    def test_queue_depth_and_rejection(self):
+        """Test waiting jobs are counted and extra jobs get 503."""
+        pool = HashingPool(max_workers=1, max_queue=1, timeout=0.05)
+        started, release = threading.Event(), threading.Event()
+        # Test fail giữa chừng thì vẫn thả job đang chạy.
+        self.addCleanup(release.set)
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        running = threading.Thread(target=pool.run, args=(block,))
+        running.start()
+        started.wait(5)
+        waiting = threading.Thread(target=pool.run, args=(pow, 2, 2))
+        waiting.start()
+        deadline = time.monotonic() + 5
+        while pool.stats()['queued'] != 1:
+            if time.monotonic() > deadline:
+                self.fail('The second job was never queued.')
+            time.sleep(0.001)
+        self.assertEqual(pool.stats()['running'], 1)
+
+        with self.assertRaises(HashingPoolBusy):
+            pool.run(pow, 2, 3)
+        release.set()
+        running.join()
+        waiting.join()
+
+        stats = pool.stats()
+        self.assertEqual(stats['queued'], 0)
+        self.assertEqual(stats['max_queued'], 1)
+        self.assertEqual(stats['completed'], 2)
+        self.assertEqual(stats['rejected'], 1)
+
+
+class MustRehashTests(SimpleTestCase):
+    """Test detection of hashes made with old hashers or costs."""
+
+    @override_settings(PASSWORD_HASHERS=[ARGON2, PBKDF2])
+    def test_other_hasher_needs_rehash(self):
+        encoded = make_password('pw', hasher='pbkdf2_sha256')
+        self.assertTrue(must_rehash(encoded))
+        self.assertFalse(must_rehash(make_password('pw')))
+
+    @override_settings(PASSWORD_HASHERS=[ARGON2])
+    def test_changed_cost_needs_rehash(self):
+        encoded = make_password('pw')
+        with self.settings(PASSWORD_ARGON2_MEMORY_COST=8192):
+            self.assertTrue(must_rehash(encoded))
+
+    def test_unusable_password_not_rehashed(self):
+        self.assertFalse(must_rehash(make_password(None)))
@@ -0,0 +1,124 @@
+"""Tests for request timing and the metrics endpoint."""
+import re
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.metrics import Histogram, RequestTiming, request_metrics
+from core.models import Recipe
+
+metrics_url = reverse('metrics')
+recipes_url = reverse('recipe:recipe-list')
+SERVER_TIMING = re.compile(
+    r'db;dur=(?P<db>[\d.]+);desc="(?P<queries>\d+) queries", '
+    r'serializer;dur=(?P<serializer>[\d.]+), total;dur=(?P<total>[\d.]+)'
+)
+
+
+class HistogramTests(SimpleTestCase):
+    """Test the Prometheus text rendering."""
+
+    def test_cumulative_buckets(self):
+        histogram = Histogram('h', 'Help.', (1, 5))
+        for value in (0.5, 1, 3, 7):
+            histogram.observe('a:b', value)
+
+        self.assertEqual(histogram.render('view'), [
+            '# HELP h Help.',
+            '# TYPE h histogram',
+            'h_bucket{view="a:b",le="1"} 2',
+            'h_bucket{view="a:b",le="5"} 3',
+            'h_bucket{view="a:b",le="+Inf"} 4',
+            'h_sum{view="a:b"} 11.5',
+            'h_count{view="a:b"} 4',
+        ])
+
+    def test_timing_wraps_queries(self):
+        timing = RequestTiming()
+
+        result = timing(lambda *args: 'rows', 'SELECT 1', None, False, {})
+
+        self.assertEqual(result, 'rows')
+        self.assertEqual(timing.db_queries, 1)
+        self.assertGreater(timing.db_time, 0)
+
+
+class RequestTimingApiTests(TestCase):
+    """Test Server-Timing headers and per-view histograms."""
+
+    def setUp(self):
+        request_metrics.reset()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.recipe = Recipe.objects.create(
+            user=self.user, title='Recipe', time_minutes=5,
+            price=Decimal('1.00'),
+        )
+
+    def server_timing(self, res):
+        match = SERVER_TIMING.fullmatch(res['Server-Timing'])
+        self.assertIsNotNone(match, res['Server-Timing'])
+        return match
+
+    def test_server_timing_header(self):
+        res = self.client.get(
+            reverse('recipe:recipe-detail', args=[self.recipe.pk])
+        )
+
+        timing = self.server_timing(res)
+        self.assertGreaterEqual(int(timing['queries']), 1)
+        self.assertGreater(float(timing['serializer']), 0)
+        self.assertGreaterEqual(float(timing['total']), float(timing['db']))
+
+    async def test_asgi_queries_timed(self):
+        """Test queries run in sync_to_async threads are counted (ASGI)."""
+        token = await sync_to_async(Token.objects.create)(user=self.user)
+        for url in (recipes_url, reverse('recipe:async-recipe-list')):
+            with self.subTest(url=url):
+                res = await self.async_client.get(
+                    url, AUTHORIZATION=f'Token {token.key}'
+                )
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                timing = self.server_timing(res)
+                self.assertGreaterEqual(int(timing['queries']), 1)
+                self.assertGreater(float(timing['db']), 0)
+
+    def test_metrics_by_url_name(self):
+        self.client.get(recipes_url)
+        self.client.get(recipes_url)
+        self.client.get(reverse('user:me'))
+        admin = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='testpass123'
+        )
+        self.client.force_authenticate(admin)
+
+        res = self.client.get(metrics_url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/plain'))
+        body = res.content.decode()
+        self.assertIn(
+            'http_request_duration_seconds_count{view="recipe:recipe-list"} 2',
+            body,
+        )
+        self.assertIn(
+            'http_request_db_queries_count{view="user:me"} 1', body
+        )
+        self.assertIn(
+            '# TYPE http_request_serializer_duration_seconds histogram', body
+        )
+
+    def test_metrics_require_staff(self):
+        res = self.client.get(metrics_url)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,286 @@
+"""N+1 query tests for every registered route."""
+import itertools
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path, reverse
+from drf_spectacular.drainage import GENERATOR_STATS
+from rest_framework import generics, serializers
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+from core.tests.query_counts import (
+    QueryCountMixin, duplicated_queries, normalize_sql,
+)
+
+PASSWORD = 'testpass123'
+
+
+class NormalizeSqlTests(SimpleTestCase):
+    """Test grouping of SQL differing only by literal values."""
+
+    def test_literals_replaced(self):
+        self.assertEqual(
+            normalize_sql(
+                'SELECT "t1"."id" FROM "t1" WHERE "t1"."name" = \'a\'\'b\' '
+                'AND "t1"."id" IN (1, 2, 3) LIMIT 21'
+            ),
+            'SELECT "t1"."id" FROM "t1" WHERE "t1"."name" = ? '
+            'AND "t1"."id" IN (...) LIMIT ?',
+        )
+
+    def test_duplicated_queries(self):
+        queries = [
+            {'sql': f'SELECT * FROM "core_user" WHERE "id" = {i}'}
+            for i in range(3)
+        ] + [{'sql': 'SELECT 1'}]
+
+        self.assertEqual(duplicated_queries(queries), [
+            (3, 'SELECT * FROM "core_user" WHERE "id" = ?'),
+        ])
+
+
+class RecipeOwnerSerializer(serializers.ModelSerializer):
+    """Serializer reading recipe.user, one query per recipe."""
+    owner = serializers.EmailField(source='user.email')
+
+    class Meta:
+        model = Recipe
+        fields = ['id', 'owner']
+
+
+class RecipeOwnerList(generics.ListAPIView):
+    """View with an N+1 query, for testing the detector."""
+    queryset = Recipe.objects.order_by('id')
+    serializer_class = RecipeOwnerSerializer
+    authentication_classes = []
+    permission_classes = []
+    pagination_class = None
+
+
+# Dùng làm ROOT_URLCONF trong DetectorTests.
+urlpatterns = [
+    path('owners/', RecipeOwnerList.as_view(), name='recipe-owners'),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class DetectorTests(QueryCountMixin, TestCase):
+    """Test the detector catches an N+1 and reports the repeated SQL."""
+    route_requests = {'recipe-owners': 'list_request'}
+
+    def create_fixtures(self, start, count):
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f'owner{i}@example.com')
+            for i in range(start, start + count)
+        )
+        Recipe.objects.bulk_create(
+            Recipe(user=user, title='Recipe', time_minutes=5,
+                   price=Decimal('1.00'))
+            for user in users
+        )
+
+    def list_request(self, name, size):
+        return [{'method': 'get', 'path': reverse(name)}]
+
+    def test_n_plus_one_detected(self):
+        with self.assertRaises(AssertionError) as cm:
+            self.assertNoNPlusOne('recipe-owners')
+
+        message = str(cm.exception)
+        self.assertIn('ran 6 queries with 5 rows and 51 with 50 rows', message)
+        self.assertIn(
+            '50x SELECT "core_user"."id", "core_user"."password"', message
+        )
+        self.assertIn('WHERE "core_user"."id" = ?', message)
+
+    def test_uncovered_route_reported(self):
+        self.route_requests = {}
+
+        with self.assertRaisesMessage(AssertionError, 'recipe-owners'):
+            self.assertRoutesCovered()
+
+
+class ApiQueryCountTests(QueryCountMixin, TestCase):
+    """Test no route runs more queries when there is more data.
+
+    Route mới phải được thêm vào route_requests (hoặc skip_routes kèm lý
+    do), nếu không test_all_routes_covered sẽ fail.
+    """
+    route_requests = {
+        'admin:index': 'get_request',
+        'admin:app_list': 'admin_app_list_requests',
+        'admin:*_changelist': 'get_request',
+        'api-schema': 'get_request',
+        'api-docs': 'get_request',
+        'user:create': 'user_create_requests',
+        'user:token': 'token_requests',
+        'user:me': 'me_requests',
+        'user:hashing-stats': 'get_request',
+        'recipe:recipe-stats': 'get_request',
+        'recipe:cache-stats': 'get_request',
+        'recipe:async-recipe-list': 'recipe_list_requests',
+        'recipe:async-recipe-detail': 'recipe_detail_requests',
+        'recipe:api-root': 'get_request',
+        'recipe:recipe-list': 'recipe_list_requests',
+        'recipe:recipe-detail': 'recipe_detail_requests',
+        'recipe:recipe-bulk': 'recipe_bulk_requests',
+        'recipe:recipe-export': 'recipe_export_requests',
+        'db-pool-stats': 'get_request',
+        'metrics': 'get_request',
+    }
+    skip_routes = {
+        'admin:view_on_site': 'Redirect, Recipe and User have no URL.',
+        'admin:login': 'Static form.',
+        'admin:logout': 'Static page.',
+        'admin:password_change*': 'Static form.',
+        'admin:jsi18n': 'Static JavaScript.',
+        'admin:autocomplete': 'No autocomplete_fields registered.',
+        'admin:auth_user_password_change': 'Form of one object.',
+        'admin:*_add': 'Form of one object.',
+        'admin:*_change': 'Form of one object.',
+        'admin:*_delete': 'Form of one object.',
+        'admin:*_history': 'History of one object.',
+    }
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            email='admin@example.com', password=PASSWORD
+        )
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        # Token cho API, session cho admin.
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.client.force_login(self.user)
+        self.counter = itertools.count()
+
+    def create_fixtures(self, start, count):
+        """Create count users with a token, and count recipes of self.user
+        and of other users each."""
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(
+                email=f'user{i}@example.com', name=f'User {i}',
+                recipe_count=1,
+            )
+            for i in range(start, start + count)
+        )
+        Token.objects.bulk_create(
+            Token(user=user, key=Token.generate_key()) for user in users
+        )
+        Recipe.objects.bulk_create(
+            Recipe(
+                user=user, title=f'Recipe {i}', time_minutes=i % 60 + 1,
+                price=Decimal(i % 100) + Decimal('0.50'),
+            )
+            for i, user in enumerate(
+                [self.user] * count + users, start=start * 2
+            )
+        )
+        get_user_model().objects.touch_recipes(self.user.pk, count)
+
+    def get_request(self, name, size):
+        return [{'method': 'get', 'path': reverse(name)}]
+
+    def admin_app_list_requests(self, name, size):
+        return [
+            {'method': 'get', 'path': reverse(name, args=[app_label])}
+            for app_label in ('auth', 'core', 'authtoken')
+        ]
+
+    def user_create_requests(self, name, size):
+        return [{
+            'method': 'post',
+            'path': reverse(name),
+            'data': {
+                'email': f'new{next(self.counter)}@example.com',
+                'password': PASSWORD,
+                'name': 'New',
+            },
+        }]
+
+    def token_requests(self, name, size):
+        return [{
+            'method': 'post',
+            'path': reverse(name),
+            'data': {'email': self.user.email, 'password': PASSWORD},
+        }]
+
+    def me_requests(self, name, size):
+        url = reverse(name)
+        return [
+            {'method': 'get', 'path': url},
+            {'method': 'patch', 'path': url, 'data': {'name': 'Admin'}},
+        ]
+
+    def recipe_list_requests(self, name, size):
+        url = reverse(name)
+        payload = {'title': 'New', 'time_minutes': 5, 'price': '2.50'}
+        requests = [
+            {'method': 'get', 'path': url},
+            {'method': 'post', 'path': url, 'data': payload,
+             'format': 'json'},
+        ]
+        if name == 'recipe:recipe-list':
+            requests += [
+                {'method': 'get', 'path': url, 'data': {'search': 'recipe'}},
+                {'method': 'get', 'path': url,
+                 'data': {'price__gte': '10', 'ordering': 'price'}},
+            ]
+        return requests
+
+    def recipe_detail_requests(self, name, size):
+        recipe = Recipe.objects.filter(user=self.user).latest('id')
+        url = reverse(name, args=[recipe.pk])
+        requests = [{'method': 'get', 'path': url}]
+        if name == 'recipe:recipe-detail':
+            requests += [
+                {'method': 'patch', 'path': url, 'data': {'title': 'New'},
+                 'format': 'json'},
+                {'method': 'delete', 'path': reverse(
+                    name, args=[Recipe.objects.create(
+                        user=self.user, title='Deleted', time_minutes=1,
+                        price=Decimal('1.00'),
+                    ).pk]
+                )},
+            ]
+        return requests
+
+    def recipe_bulk_requests(self, name, size):
+        """Bulk requests with size items: batching keeps queries constant."""
+        url = reverse(name)
+        ids = list(
+            Recipe.objects.filter(user=self.user)
+            .order_by('-id').values_list('id', flat=True)[:size]
+        )
+        return [
+            {'method': 'post', 'path': url, 'format': 'json', 'data': [
+                {'title': f'Bulk {i}', 'time_minutes': 5, 'price': '1.00'}
+                for i in range(size)
+            ]},
+            {'method': 'patch', 'path': url, 'format': 'json', 'data': [
+                {'id': pk, 'price': '3.00'} for pk in ids
+            ]},
+            {'method': 'delete', 'path': url, 'format': 'json',
+             'data': ids[:size // 2]},
+        ]
+
+    def recipe_export_requests(self, name, size):
+        url = reverse(name)
+        return [
+            {'method': 'get', 'path': url, 'data': {'type': export_type}}
+            for export_type in ('ndjson', 'csv')
+        ]
+
+    def test_all_routes_covered(self):
+        self.assertRoutesCovered()
+
+    def test_no_n_plus_one(self):
+        routes = self.routes_to_check()
+        self.assertIn('recipe:recipe-list', routes)
+        # Cảnh báo của drf_spectacular khi sinh schema không liên quan.
+        with GENERATOR_STATS.silence():
+            for name in routes:
+                with self.subTest(route=name):
+                    self.assertNoNPlusOne(name)
@@ -0,0 +1,110 @@
+"""Tests for the denormalized User.recipe_count."""
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+
+recipes_url = reverse('recipe:recipe-list')
+bulk_url = reverse('recipe:recipe-bulk')
+
+
+def create_recipe(user, **params):
+    defaults = {'title': 'Recipe', 'time_minutes': 5, 'price': Decimal('1')}
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class RecipeCountTests(TestCase):
+    """Test recipe writes keep the count and last-modified time."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+
+    def counters(self):
+        return get_user_model().objects.values_list(
+            'recipe_count', 'recipes_updated_at'
+        ).get(pk=self.user.pk)
+
+    def test_create_update_delete(self):
+        recipe = create_recipe(self.user)
+        create_recipe(self.user)
+        count, created_at = self.counters()
+        self.assertEqual(count, 2)
+
+        recipe.title = 'Renamed'
+        recipe.save()
+        count, updated_at = self.counters()
+        self.assertEqual(count, 2)
+        self.assertGreater(updated_at, created_at)
+
+        recipe.delete()
+        self.assertEqual(self.counters()[0], 1)
+
+    def test_delete_twice_decrements_once(self):
+        """Test deleting two loaded copies of a recipe counts one delete."""
+        recipe = create_recipe(self.user)
+        create_recipe(self.user)
+        copy = Recipe.objects.get(pk=recipe.pk)
+
+        recipe.delete()
+        copy.delete()
+
+        self.assertEqual(self.counters()[0], 1)
+
+    def test_bulk_endpoints(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        payload = [
+            {'title': f'R{i}', 'time_minutes': i, 'price': '1.00'}
+            for i in range(1, 4)
+        ]
+
+        res = client.post(bulk_url, payload, format='json')
+        self.assertEqual(self.counters()[0], 3)
+
+        ids = [recipe['id'] for recipe in res.json()['created']]
+        client.delete(bulk_url, ids[:2] + [0], format='json')
+        self.assertEqual(self.counters()[0], 1)
+
+    def test_stale_user_save_keeps_count(self):
+        """Test saving a user read before a recipe write keeps the count."""
+        stale = get_user_model().objects.get(pk=self.user.pk)
+        create_recipe(self.user)
+
+        stale.name = 'New name'
+        stale.save()
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.name, 'New name')
+        self.assertEqual(stale.recipe_count, 1)
+        self.assertEqual(stale.recipes_version, 1)
+
+    def test_repair_command(self):
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='testpass123'
+        )
+        for _ in range(2):
+            create_recipe(self.user)
+        create_recipe(other)
+        # queryset.delete()/update() không đi qua Recipe.delete().
+        Recipe.objects.filter(user=other).delete()
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            recipe_count=99
+        )
+        out = StringIO()
+
+        call_command('repair_recipe_counts', batch_size=1, stdout=out)
+
+        self.assertEqual(
+            dict(get_user_model().objects.values_list('pk', 'recipe_count')),
+            {self.user.pk: 2, other.pk: 0},
+        )
+        self.assertIn('checked for 2 users, 2 repaired', out.getvalue())
@@ -0,0 +1,61 @@
+"""Tests for the rebuild_recipe_stats command."""
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import Recipe, RecipeStats
+
+
+class RebuildRecipeStatsTests(TestCase):
+    """Test summaries are recomputed from the recipe table."""
+
+    def setUp(self):
+        self.users = [
+            get_user_model().objects.create_user(
+                email=f'user{i}@example.com', password='testpass123'
+            )
+            for i in range(3)
+        ]
+        for i, user in enumerate(self.users[:2]):
+            for minutes in (10, 20):
+                Recipe.objects.create(
+                    user=user, title='Recipe', time_minutes=minutes + i,
+                    price=Decimal('2.50'),
+                )
+
+    def test_rebuild_fixes_drifted_stats(self):
+        # Giả lập bảng tổng hợp bị lệch (ví dụ sau khi restore dữ liệu).
+        RecipeStats.objects.filter(user=self.users[0]).update(
+            recipe_count=99, price_sum=0, time_minutes_sum=0
+        )
+        RecipeStats.objects.filter(user=self.users[1]).delete()
+        out = StringIO()
+
+        call_command('rebuild_recipe_stats', batch_size=2, stdout=out)
+
+        stats = {s.user_id: s for s in RecipeStats.objects.all()}
+        self.assertEqual(stats[self.users[0].pk].recipe_count, 2)
+        self.assertEqual(stats[self.users[0].pk].price_sum, Decimal('5.00'))
+        self.assertEqual(stats[self.users[0].pk].time_minutes_sum, 30)
+        self.assertEqual(stats[self.users[1].pk].time_minutes_sum, 32)
+        self.assertEqual(stats[self.users[2].pk].recipe_count, 0)
+        self.assertIn('rebuilt for 3 users', out.getvalue())
+
+    def test_triggers_keep_working_after_rebuild(self):
+        call_command('rebuild_recipe_stats', stdout=StringIO())
+        Recipe.objects.filter(user=self.users[0]).delete()
+
+        stats = RecipeStats.objects.get(user=self.users[0])
+        self.assertEqual(stats.recipe_count, 0)
+        self.assertIsNone(stats.average_price)
+
+    def test_delete_user_with_recipes(self):
+        """Test cascade deletes do not recreate the user's summary."""
+        self.users[0].delete()
+
+        self.assertFalse(
+            RecipeStats.objects.filter(user_id=self.users[0].pk).exists()
+        )
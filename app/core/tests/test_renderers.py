@@ -0,0 +1,129 @@
+"""Tests for the orjson and MessagePack renderers and parser."""
+import datetime
+import uuid
+from decimal import Decimal
+
+import msgpack
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+from core.throttling import get_throttle_cache
+
+MSGPACK = 'application/msgpack'
+recipes_url = reverse('recipe:recipe-list')
+bulk_url = reverse('recipe:recipe-bulk')
+token_url = reverse('user:token')
+
+
+class RendererTests(SimpleTestCase):
+    """Test output matches DRF's JSONRenderer."""
+
+    def test_same_output_as_drf(self):
+        data = {
+            'id': 1,
+            'title': 'Phở bò',
+            'when': datetime.datetime(
+                2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+            ),
+            'day': datetime.date(2024, 1, 2),
+            'key': uuid.UUID(int=1),
+            'label': gettext_lazy('Recipe'),
+            'nested': [{'ok': True, 'none': None}],
+        }
+
+        self.assertEqual(
+            ORJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+    def test_decimal_kept_as_string(self):
+        data = {'price': Decimal('5.10')}
+
+        self.assertEqual(ORJSONRenderer().render(data), b'{"price":"5.10"}')
+        self.assertEqual(
+            msgpack.unpackb(MessagePackRenderer().render(data)),
+            {'price': '5.10'},
+        )
+
+    def test_indent(self):
+        rendered = ORJSONRenderer().render(
+            {'a': 1}, 'application/json; indent=4'
+        )
+
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+        self.assertEqual(MessagePackRenderer().render(None), b'')
+
+
+class MessagePackApiTests(TestCase):
+    """Test MessagePack is chosen by Accept and Content-Type."""
+
+    def setUp(self):
+        get_throttle_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Recipe.objects.create(
+            user=self.user, title='Recipe', time_minutes=5,
+            price=Decimal('4.25'),
+        )
+
+    def test_list_as_msgpack(self):
+        json_res = self.client.get(recipes_url)
+        res = self.client.get(recipes_url, HTTP_ACCEPT=MSGPACK)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], MSGPACK)
+        self.assertEqual(msgpack.unpackb(res.content), json_res.json())
+        self.assertLess(len(res.content), len(json_res.content))
+
+    def test_create_from_msgpack(self):
+        body = msgpack.packb(
+            {'title': 'Packed', 'time_minutes': 10, 'price': '2.50'}
+        )
+
+        res = self.client.post(recipes_url, body, content_type=MSGPACK)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Recipe.objects.filter(title='Packed').exists())
+
+    def test_bulk_from_msgpack(self):
+        body = msgpack.packb([
+            {'title': f'R{i}', 'time_minutes': i, 'price': '1.00'}
+            for i in range(1, 4)
+        ])
+
+        res = self.client.post(
+            bulk_url, body, content_type=MSGPACK, HTTP_ACCEPT=MSGPACK
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(msgpack.unpackb(res.content)['created']), 3)
+
+    def test_invalid_msgpack(self):
+        res = self.client.post(recipes_url, b'\xc1', content_type=MSGPACK)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('MessagePack parse error', res.json()['detail'])
+
+    def test_token_view_uses_project_formats(self):
+        body = msgpack.packb(
+            {'email': 'user@example.com', 'password': 'testpass123'}
+        )
+
+        res = APIClient().post(
+            token_url, body, content_type=MSGPACK, HTTP_ACCEPT=MSGPACK
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('token', msgpack.unpackb(res.content))
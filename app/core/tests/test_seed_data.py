@@ -0,0 +1,87 @@
+"""Tests for the seed_data command."""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+
+from core.models import Recipe, RecipeStats
+
+RECIPE_FIELDS = ['title', 'description', 'time_minutes', 'price', 'link']
+
+
+def seed(**options):
+    options.setdefault('workers', 1)
+    call_command('seed_data', stdout=StringIO(), **options)
+
+
+def snapshot(domain):
+    """Return the seeded data of domain, without ids and domain."""
+    recipes = Recipe.objects.filter(user__email__endswith=f'@{domain}')
+    return [
+        (email.split('@')[0], *fields)
+        for email, *fields in recipes.order_by('user__email', 'id')
+        .values_list('user__email', *RECIPE_FIELDS)
+    ]
+
+
+class SeedDataTests(TestCase):
+    """Test users and recipes are generated in bulk."""
+
+    def test_seed_users_and_recipes(self):
+        seed(users=5, recipes=3, batch_size=2)
+
+        users = get_user_model().objects.order_by('id')
+        self.assertEqual(
+            [user.email for user in users],
+            [f'user{i}@seed.example.com' for i in range(5)],
+        )
+        self.assertTrue(users[0].check_password('password123'))
+        # Chỉ băm một lần: mọi user có cùng hash.
+        self.assertEqual(len({user.password for user in users}), 1)
+        self.assertEqual(Recipe.objects.count(), 15)
+        self.assertEqual({user.recipe_count for user in users}, {3})
+        # Trigger (search_vector, bảng tổng hợp) chạy cả với COPY.
+        self.assertFalse(
+            Recipe.objects.filter(search_vector__isnull=True).exists()
+        )
+        self.assertEqual(
+            RecipeStats.objects.get(user=users[0]).recipe_count, 3
+        )
+
+    def test_same_seed_same_data(self):
+        seed(users=4, recipes=5, email_domain='copy.example.com')
+        seed(users=4, recipes=5, email_domain='bulk.example.com',
+             method='bulk', batch_size=3)
+        seed(users=4, recipes=5, email_domain='other.example.com', seed=1)
+
+        data = snapshot('copy.example.com')
+        self.assertEqual(len(data), 20)
+        self.assertEqual(data, snapshot('bulk.example.com'))
+        self.assertNotEqual(data, snapshot('other.example.com'))
+
+    def test_start_adds_users(self):
+        seed(users=2, recipes=1)
+        seed(users=2, recipes=1, start=2)
+
+        self.assertEqual(get_user_model().objects.count(), 4)
+
+    def test_existing_users_rejected(self):
+        seed(users=2, recipes=1)
+
+        with self.assertRaisesMessage(CommandError, '--start'):
+            seed(users=2, recipes=1)
+
+
+class SeedDataWorkersTests(TransactionTestCase):
+    """Test user ranges are seeded by worker processes."""
+
+    def test_workers(self):
+        seed(users=6, recipes=2, batch_size=2, workers=3,
+             email_domain='workers.example.com')
+        seed(users=6, recipes=2, email_domain='serial.example.com')
+
+        self.assertEqual(
+            snapshot('workers.example.com'), snapshot('serial.example.com')
+        )
@@ -0,0 +1,177 @@
+"""Tests for the token bucket throttle."""
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+from core.throttling import consume, get_throttle_cache, parse_rate
+
+token_url = reverse('user:token')
+recipes_url = reverse('recipe:recipe-list')
+async_recipes_url = reverse('recipe:async-recipe-list')
+
+
+class ConsumeTests(SimpleTestCase):
+    """Test the GCRA bucket."""
+
+    def setUp(self):
+        self.cache = LocMemCache('throttle-tests', {})
+        self.cache.clear()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('100/min'), (100, 60))
+        self.assertEqual(parse_rate('5/s'), (5, 1))
+        self.assertEqual(parse_rate('1000/day'), (1000, 86400))
+
+    def test_burst_then_wait(self):
+        for _ in range(3):
+            self.assertEqual(consume(self.cache, 'k', 3, 60, now=100), 0)
+
+        self.assertAlmostEqual(consume(self.cache, 'k', 3, 60, now=100), 20)
+        self.assertAlmostEqual(consume(self.cache, 'k', 3, 60, now=115), 5)
+
+    def test_refills_over_time(self):
+        for _ in range(3):
+            consume(self.cache, 'k', 3, 60, now=100)
+
+        self.assertEqual(consume(self.cache, 'k', 3, 60, now=120), 0)
+        self.assertGreater(consume(self.cache, 'k', 3, 60, now=120), 0)
+        # Sau cả period, bucket đầy lại.
+        for _ in range(3):
+            self.assertEqual(consume(self.cache, 'k', 3, 60, now=200), 0)
+
+    def test_keys_independent(self):
+        consume(self.cache, 'a', 1, 60, now=100)
+
+        self.assertGreater(consume(self.cache, 'a', 1, 60, now=100), 0)
+        self.assertEqual(consume(self.cache, 'b', 1, 60, now=100), 0)
+
+    def test_stores_time_bucket_is_full(self):
+        consume(self.cache, 'k', 3, 60, now=100)
+        consume(self.cache, 'k', 3, 60, now=100)
+
+        self.assertEqual(self.cache.get('k'), 140)
+
+
+class ThrottleApiTests(TestCase):
+    """Test the scopes configured on the API views."""
+
+    def setUp(self):
+        get_throttle_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @override_settings(THROTTLE_RATES={'token': '2/min'})
+    def test_token_strict_per_ip(self):
+        payload = {'email': 'user@example.com', 'password': 'testpass123'}
+        client = APIClient()
+
+        for _ in range(2):
+            res = client.post(token_url, payload)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = client.post(token_url, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res['Retry-After'], '30')
+        # IP khác có bucket riêng.
+        res = client.post(token_url, payload, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(THROTTLE_RATES={'token': '2/min'})
+    def test_spoofed_forwarded_for_still_throttled(self):
+        payload = {'email': 'user@example.com', 'password': 'testpass123'}
+        client = APIClient()
+
+        statuses = [
+            client.post(
+                token_url, payload, HTTP_X_FORWARDED_FOR=f'10.0.0.{i}'
+            ).status_code
+            for i in range(3)
+        ]
+
+        self.assertEqual(statuses[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(THROTTLE_RATES={
+        'recipe-read': '2/min', 'recipe-write': '1/min',
+    })
+    def test_recipe_scopes_per_user(self):
+        other = APIClient()
+        other.force_authenticate(get_user_model().objects.create_user(
+            email='other@example.com', password='testpass123'
+        ))
+        payload = {'title': 'R', 'time_minutes': 1, 'price': Decimal('1')}
+
+        self.assertEqual(
+            self.client.post(recipes_url, payload).status_code,
+            status.HTTP_201_CREATED,
+        )
+        self.assertEqual(
+            self.client.post(recipes_url, payload).status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+        # Đọc và ghi có bucket riêng.
+        for _ in range(2):
+            res = self.client.get(recipes_url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(recipes_url)
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(
+            other.get(recipes_url).status_code, status.HTTP_200_OK
+        )
+        self.assertEqual(Recipe.objects.count(), 1)
+
+    @override_settings(THROTTLE_RATES={
+        'recipe-read': '2/min', 'recipe-write': '1/min',
+    })
+    async def test_async_recipe_scopes(self):
+        """Test the native async views share the recipe buckets."""
+        token = await sync_to_async(Token.objects.create)(user=self.user)
+        auth = {'AUTHORIZATION': f'Token {token.key}'}
+        payload = {'title': 'R', 'time_minutes': 1, 'price': '1.00'}
+
+        res = await self.async_client.post(
+            async_recipes_url, payload,
+            content_type='application/json', **auth,
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        res = await self.async_client.post(
+            async_recipes_url, payload,
+            content_type='application/json', **auth,
+        )
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res['Retry-After'], '60')
+
+        # Bucket đọc dùng chung với RecipeViewSet.
+        self.assertEqual(
+            (await sync_to_async(self.client.get)(recipes_url)).status_code,
+            status.HTTP_200_OK,
+        )
+        res = await self.async_client.get(async_recipes_url, **auth)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = await self.async_client.get(async_recipes_url, **auth)
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res['Retry-After'], '30')
+
+    @override_settings(THROTTLE_RATES={'recipe-read': '1/min'},
+                       THROTTLE_ENABLED=False)
+    def test_disabled(self):
+        for _ in range(3):
+            res = self.client.get(recipes_url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(THROTTLE_RATES={'recipe-read': None})
+    def test_scope_without_rate_not_limited(self):
+        for _ in range(3):
+            res = self.client.get(recipes_url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
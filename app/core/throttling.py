@@ -0,0 +1,117 @@
+"""
+    Throttle cho DRF: token bucket theo từng scope và từng user (IP nếu chưa
+    đăng nhập), giới hạn trong settings.THROTTLE_RATES.
+
+    Bucket được lưu theo GCRA (generic cell rate algorithm): mỗi key chỉ giữ
+    một số float (thời điểm bucket đầy lại), nên mỗi lần kiểm tra là một
+    get và một set trên cache THROTTLE_CACHE, bộ nhớ mỗi key cố định. Key hết
+    hạn khi bucket đầy lại; LocMemCache loại bỏ key ít dùng nhất khi vượt
+    MAX_ENTRIES. Cache dùng chung (Redis, memcached) giới hạn chung cho mọi
+    process, nhưng get/set không atomic: request đồng thời của cùng một key
+    có thể lọt quá giới hạn một vài request.
+"""
+import functools
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+@functools.lru_cache(maxsize=None)
+def parse_rate(rate):
+    """Return (requests, seconds) of a DRF style rate like '100/min'."""
+    num, _, period = rate.partition('/')
+    return int(num), PERIODS[period.strip()[0]]
+
+
+def get_throttle_cache():
+    """Return the cache holding the throttle buckets."""
+    return caches[settings.THROTTLE_CACHE]
+
+
+def consume(cache, key, limit, period, now=None):
+    """Take one token from the bucket of key.
+
+    Bucket chứa tối đa limit token, đầy lại sau period giây. Trả về 0 nếu
+    được phép, ngược lại số giây phải chờ tới token tiếp theo.
+    """
+    if now is None:
+        now = time.time()
+    interval = period / limit
+    full_at = max(cache.get(key, now), now)
+    # Bucket còn token khi thời điểm đầy lại chưa vượt quá now + period.
+    wait = full_at + interval - period - now
+    if wait > 0:
+        return wait
+    full_at += interval
+    cache.set(key, full_at, math.ceil(full_at - now))
+    return 0
+
+
+async def aconsume(cache, key, limit, period, now=None):
+    """Async consume()."""
+    if now is None:
+        now = time.time()
+    interval = period / limit
+    full_at = max(await cache.aget(key, now), now)
+    wait = full_at + interval - period - now
+    if wait > 0:
+        return wait
+    full_at += interval
+    await cache.aset(key, full_at, math.ceil(full_at - now))
+    return 0
+
+
+class ScopedTokenBucketThrottle(BaseThrottle):
+    """
+    Throttle requests per view.throttle_scope and user (or client IP).
+
+    Scope không có trong THROTTLE_RATES (hoặc rate None) thì không giới hạn.
+    """
+
+    def __init__(self):
+        self.wait_time = None
+
+    def get_cache_key(self, request, scope):
+        user = request.user
+        if user is not None and user.is_authenticated:
+            return f'throttle:{scope}:user:{user.pk}'
+        return f'throttle:{scope}:ip:{self.get_ident(request)}'
+
+    def get_rate(self, scope):
+        """Return (requests, seconds) of scope, or None if not limited."""
+        if not settings.THROTTLE_ENABLED:
+            return None
+        rate = settings.THROTTLE_RATES.get(scope)
+        if rate is None:
+            return None
+        return parse_rate(rate)
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        rate = self.get_rate(scope)
+        if rate is None:
+            return True
+        self.wait_time = consume(
+            get_throttle_cache(), self.get_cache_key(request, scope), *rate
+        )
+        return self.wait_time == 0
+
+    # View async (recipe.async_views) không qua DRF: truyền scope trực tiếp,
+    # request.user là user đã xác thực.
+    async def aallow_request(self, request, scope):
+        """Async allow_request() for native async Django views."""
+        rate = self.get_rate(scope)
+        if rate is None:
+            return True
+        self.wait_time = await aconsume(
+            get_throttle_cache(), self.get_cache_key(request, scope), *rate
+        )
+        return self.wait_time == 0
+
+    def wait(self):
+        return self.wait_time
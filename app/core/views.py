@@ -0,0 +1,34 @@
+"""Operational views of the core app."""
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.db_pool import pool_stats
+from core.metrics import request_metrics
+from user.authentication import CachedTokenAuthentication
+
+
+class DatabasePoolStatsView(APIView):
+    """In-use, idle and wait time metrics of the DB connection pools."""
+    authentication_classes = [CachedTokenAuthentication]
+    # Chỉ staff xem được thống kê.
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        # Số liệu của process đang xử lý request (mỗi worker một pool).
+        return Response(pool_stats())
+
+
+class MetricsView(APIView):
+    """Request timing histograms in the Prometheus text format."""
+    # Prometheus gửi token qua cấu hình scrape:
+    #   authorization: {type: Token, credentials: <token của user staff>}
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(
+            request_metrics.render(),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
@@ -0,0 +1,160 @@
+"""
+    Native async (ASGI) variants of the recipe list/retrieve/create APIs.
+
+    DRF 3.13 chưa hỗ trợ view async, nên đây là view async thuần của Django:
+    dưới ASGI không tốn một lần chuyển sang thread cho cả request, chỉ các
+    câu query chạy qua core.async_orm. Output giống RecipeViewSet; danh
+    sách chỉ hỗ trợ thứ tự mặc định (-id) với cùng cursor và page_size.
+"""
+import asyncio
+import functools
+import json
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException, MethodNotAllowed, NotAuthenticated, NotFound, ParseError,
+    Throttled,
+)
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+
+from core.async_orm import acreate, aget
+from core.renderers import dumps_json
+from core.models import Recipe
+from core.throttling import ScopedTokenBucketThrottle
+from recipe.pagination import RecipeCursorPagination
+from recipe.serializers import RecipeDetailSerializer, RecipeListSerializer
+from user.authentication import CachedTokenAuthentication
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    # Cùng encoder với ORJSONRenderer của RecipeViewSet.
+    return HttpResponse(
+        dumps_json(data), status=status_code, content_type='application/json'
+    )
+
+
+def error_response(exc):
+    """Render an APIException the way DRF's exception handler does."""
+    response = json_response({'detail': exc.detail}, exc.status_code)
+    if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+        response['WWW-Authenticate'] = CachedTokenAuthentication.keyword
+    if getattr(exc, 'wait', None):
+        response['Retry-After'] = '%d' % exc.wait
+    return response
+
+
+# Dưới ASGI mỗi request có thread (và connection DB) riêng: 1000 request
+# đồng thời sẽ mở 1000 connection. Giới hạn số request async được dùng DB
+# cùng lúc, các request khác chờ trên event loop (rất rẻ).
+_db_slots = weakref.WeakKeyDictionary()
+
+
+def db_slots():
+    """Return the semaphore bounding DB work on the running event loop."""
+    loop = asyncio.get_running_loop()
+    slots = _db_slots.get(loop)
+    if slots is None:
+        slots = asyncio.Semaphore(settings.ASYNC_DB_CONCURRENCY)
+        _db_slots[loop] = slots
+    return slots
+
+
+async def authenticate(request):
+    """Return the user of the request token, or raise an APIException."""
+    result = await CachedTokenAuthentication().aauthenticate(request)
+    if result is None:
+        raise NotAuthenticated()
+    return result[0]
+
+
+async def check_throttle(request):
+    """Raise Throttled if the user is over the rate of the recipe scope."""
+    # Cùng scope với RecipeViewSet: đọc và ghi có bucket riêng.
+    if request.method in SAFE_METHODS:
+        scope = 'recipe-read'
+    else:
+        scope = 'recipe-write'
+    throttle = ScopedTokenBucketThrottle()
+    if not await throttle.aallow_request(request, scope):
+        raise Throttled(throttle.wait())
+
+
+def api_view(methods):
+    """Turn APIExceptions of an async view into DRF-style responses.
+
+    Không dùng decorator có sẵn của Django (ví dụ csrf_exempt): ở Django
+    4.0 chúng bọc view bằng hàm sync, làm view mất tính async.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapped(request, *args, **kwargs):
+            try:
+                if request.method not in methods:
+                    raise MethodNotAllowed(request.method)
+                async with db_slots():
+                    user = await authenticate(request)
+                    request.user = user
+                    await check_throttle(request)
+                    return await view(request, user, *args, **kwargs)
+            except MethodNotAllowed as exc:
+                response = error_response(exc)
+                response['Allow'] = ', '.join(methods)
+                return response
+            except APIException as exc:
+                return error_response(exc)
+        # Client API dùng token, không dùng cookie session nên không cần CSRF.
+        wrapped.csrf_exempt = True
+        return wrapped
+    return decorator
+
+
+@api_view(['GET', 'POST'])
+async def recipe_list(request, user):
+    """List recipes of the user (cursor paginated) or create one."""
+    if request.method == 'POST':
+        return await create_recipe(request, user)
+
+    paginator = RecipeCursorPagination()
+    queryset = RecipeListSerializer.values(
+        Recipe.objects.filter(user_id=user.pk).order_by('-id'), ('-id',)
+    )
+    # Request của DRF chỉ để paginator đọc ?cursor= và ?page_size=.
+    page = await sync_to_async(paginator.paginate_queryset)(
+        queryset, Request(request)
+    )
+    return json_response({
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+        'results': RecipeListSerializer(page).data,
+    })
+
+
+async def create_recipe(request, user):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError as exc:
+        raise ParseError(f'JSON parse error - {exc}')
+    serializer = RecipeDetailSerializer(data=data)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+    recipe = await acreate(
+        Recipe.objects, user=user, **serializer.validated_data
+    )
+    return json_response(
+        RecipeDetailSerializer(recipe).data, status.HTTP_201_CREATED
+    )
+
+
+@api_view(['GET'])
+async def recipe_detail(request, user, pk):
+    """Retrieve one recipe of the user."""
+    try:
+        recipe = await aget(Recipe.objects.filter(user_id=user.pk), pk=pk)
+    except Recipe.DoesNotExist:
+        raise NotFound()
+    return json_response(RecipeDetailSerializer(recipe).data)
@@ -0,0 +1,26 @@
+"""Per-user response cache for the recipe APIs."""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from user.authentication import CacheStats
+
+response_cache_stats = CacheStats()
+
+
+def get_response_cache():
+    """Return the cache configured for recipe responses."""
+    return caches[settings.RECIPE_RESPONSE_CACHE]
+
+
+# Generation là User.recipes_version: mọi lần ghi recipe đều tăng nó, nên
+# entry cũ không bao giờ được đọc lại và tự bị loại khi hết TTL/đầy cache.
+def response_cache_key(request, action, generation):
+    """Return the cache key of a response for user, action and query."""
+    # URL tuyệt đối vì link next/previous của phân trang chứa scheme + host.
+    url = request.build_absolute_uri(request.path)
+    query = sorted(request.query_params.lists())
+    digest = hashlib.sha256(repr((url, query)).encode()).hexdigest()
+    user_id = request.user.pk
+    return f'recipe-response:{user_id}:{generation}:{action}:{digest}'
@@ -0,0 +1,41 @@
+"""Streaming exports of recipes."""
+import csv
+import json
+
+EXPORT_FIELDS = ['id', 'title', 'description', 'time_minutes', 'price', 'link']
+
+
+class Echo:
+    """File-like object returning what is written, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _rows(queryset, chunk_size):
+    # iterator(chunk_size) dùng server-side cursor trên Postgres, chỉ giữ
+    # một chunk trong bộ nhớ thay vì toàn bộ queryset.
+    return queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+def iter_ndjson(queryset, chunk_size):
+    """Yield one JSON line per recipe."""
+    for row in _rows(queryset, chunk_size):
+        item = dict(zip(EXPORT_FIELDS, row))
+        # Giữ price dạng string giống RecipeSerializer.
+        item['price'] = str(item['price'])
+        yield json.dumps(item) + '\n'
+
+
+def iter_csv(queryset, chunk_size):
+    """Yield a header line, then one CSV line per recipe."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in _rows(queryset, chunk_size):
+        yield writer.writerow(row)
+
+
+EXPORT_FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson'),
+    'csv': (iter_csv, 'text/csv'),
+}
@@ -0,0 +1,74 @@
+"""Filter and ordering parameters for the recipe list API."""
+from rest_framework import serializers
+
+# Mỗi trường sắp xếp có index (user_id, <field>, id) trong core.models,
+# nên ORDER BY <field>, id đọc thẳng theo index, Postgres không phải sort.
+ORDERING_FIELDS = ('id', 'price', 'time_minutes', 'title')
+ORDERING_CHOICES = [
+    prefix + field for field in ORDERING_FIELDS for prefix in ('', '-')
+]
+DEFAULT_ORDERING = '-id'
+
+# Tên query param -> trường được lọc.
+RANGE_FILTERS = {
+    'price__gte': 'price',
+    'price__lte': 'price',
+    'time_minutes__gte': 'time_minutes',
+    'time_minutes__lte': 'time_minutes',
+}
+
+
+class RecipeFilterSerializer(serializers.Serializer):
+    """Validate ?price__gte=, ?time_minutes__lte=, ?ordering= and friends.
+
+    Index (user_id, field, id) chỉ phục vụ được khoảng trên đúng trường
+    đang sắp xếp, nên chỉ cho lọc một trường và phải sắp xếp theo trường
+    đó. Không chỉ định ordering thì sắp xếp tăng dần theo trường được lọc.
+    """
+    price__gte = serializers.DecimalField(
+        max_digits=5, decimal_places=2, required=False
+    )
+    price__lte = serializers.DecimalField(
+        max_digits=5, decimal_places=2, required=False
+    )
+    time_minutes__gte = serializers.IntegerField(required=False)
+    time_minutes__lte = serializers.IntegerField(required=False)
+    ordering = serializers.ChoiceField(
+        choices=ORDERING_CHOICES, required=False
+    )
+
+    def validate(self, attrs):
+        fields = {
+            RANGE_FILTERS[name] for name in attrs if name in RANGE_FILTERS
+        }
+        if len(fields) > 1:
+            raise serializers.ValidationError(
+                'Filter on one of price or time_minutes, not both.'
+            )
+        if fields:
+            field = fields.pop()
+            ordering = attrs.setdefault('ordering', field)
+            if ordering.lstrip('-') != field:
+                raise serializers.ValidationError(
+                    {'ordering': [f'Must be {field} or -{field} when '
+                                  f'filtering on {field}.']}
+                )
+        return attrs
+
+    def get_filters(self):
+        """Return queryset filter kwargs for the validated ranges."""
+        return {
+            name: value for name, value in self.validated_data.items()
+            if name in RANGE_FILTERS
+        }
+
+    def get_ordering(self):
+        """Return the ordering, with id as tie-breaker in the same direction.
+
+        Cùng chiều với trường chính để Postgres quét index xuôi hoặc ngược.
+        """
+        ordering = self.validated_data.get('ordering', DEFAULT_ORDERING)
+        if ordering.lstrip('-') == 'id':
+            return (ordering,)
+        prefix = '-' if ordering.startswith('-') else ''
+        return (ordering, f'{prefix}id')
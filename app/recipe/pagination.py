@@ -0,0 +1,19 @@
+"""Pagination classes for the recipe APIs."""
+from rest_framework.pagination import CursorPagination
+
+
+# Keyset pagination: cursor mã hóa id của phần tử cuối trang, trang sau dùng
+# WHERE id < <cursor> thay vì OFFSET, nên trang sâu tốn như trang đầu.
+class RecipeCursorPagination(CursorPagination):
+    """Opaque cursor pagination over recipes ordered by -id."""
+    ordering = '-id'
+    page_size = 50
+    # Client có thể xin trang nhỏ hơn, nhưng không vượt quá max_page_size.
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def get_ordering(self, request, queryset, view):
+        """Use the ordering chosen by the view, e.g. by rank when searching."""
+        if hasattr(view, 'get_ordering'):
+            return tuple(view.get_ordering())
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,30 @@
+"""Parsers for the recipe APIs."""
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """Parse newline-delimited JSON into a list, one item per line."""
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        items = []
+        # Đọc từng dòng thay vì cả body để không giữ thêm bản copy của chuỗi.
+        decoded_stream = codecs.getreader(encoding)(stream)
+        for lineno, line in enumerate(decoded_stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as exc:
+                raise ParseError(
+                    f'NDJSON parse error on line {lineno} - {exc}'
+                )
+        return items
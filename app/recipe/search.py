@@ -0,0 +1,27 @@
+"""Full-text search helpers for recipes."""
+import re
+
+from django.contrib.postgres.search import SearchQuery
+
+# Phải trùng với config dùng trong trigger (core migration 0004).
+SEARCH_CONFIG = 'english'
+
+# Từ kết thúc bằng * là prefix: "curr*" khớp "curry".
+TERM_RE = re.compile(r'(\w+)(\*?)')
+
+
+def build_search_query(text):
+    """Return a SearchQuery matching all words of text, or None if empty.
+
+    Các từ được AND với nhau; từ có dấu * ở cuối được match theo prefix
+    (``curr:*``), nên "chicken curr*" khớp "Chicken curry". Prefix là
+    opt-in vì prefix ngắn phải đọc posting list của nhiều lexeme.
+    """
+    terms = [
+        f'{word}:*' if star else word
+        for word, star in TERM_RE.findall(text)
+    ]
+    if not terms:
+        return None
+    raw = ' & '.join(terms)
+    return SearchQuery(raw, search_type='raw', config=SEARCH_CONFIG)
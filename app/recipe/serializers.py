@@ -1,14 +1,36 @@
 """Serializer for recipe APIs."""
 from rest_framework import serializers
-from core.models import Recipe
+from core.metrics import (
+    TimedListSerializer, TimedSerializerMixin, measure_serializer,
+)
+from core.models import Recipe, RecipeStats
+
+def parse_fields(value, allowed):
+    """Return the fields named in a ?fields= value, in allowed's order."""
+    requested = {name.strip() for name in value.split(',')} - {''}
+    if not requested or not requested <= set(allowed):
+        raise serializers.ValidationError(
+            {'fields': [f'Choose from: {", ".join(allowed)}.']}
+        )
+    return [name for name in allowed if name in requested]
+
 
 # Dùng để serialize/deserialize dữ liệu recipe cho API.
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for recipes."""
     class Meta:
         model = Recipe
         fields = ['id', 'title', 'time_minutes', 'price', 'link']
         read_only_fields = ['id']
+        # many=True cũng được tính vào thời gian serializer của request.
+        list_serializer_class = TimedListSerializer
+
+    # fields: chỉ trả về các trường này (?fields= của RecipeViewSet).
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
 # Kế thừa RecipeSerializer để tái sử dụng cấu hình (model, fields, read_only_fields).
 class RecipeDetailSerializer(RecipeSerializer):
@@ -16,4 +38,99 @@ class RecipeDetailSerializer(RecipeSerializer):
     
     # Dùng Meta kế thừa từ RecipeSerializer.Meta và thêm description vào fields.
     class Meta(RecipeSerializer.Meta):
-        fields = RecipeSerializer.Meta.fields + ['description']
\ No newline at end of file
+        fields = RecipeSerializer.Meta.fields + ['description']
+
+
+def _format_decimal(value):
+    # Giống DecimalField.to_representation (COERCE_DECIMAL_TO_STRING): giá
+    # trị từ cột numeric(5, 2) đã đúng số chữ số thập phân.
+    return None if value is None else f'{value:f}'
+
+
+class RecipeListSerializer:
+    """
+    Read-only fast path of RecipeSerializer for list responses.
+
+    Đọc tuple từ values_list() và dựng dict trực tiếp, bỏ qua việc tạo
+    model instance và gọi to_representation của từng field. Output phải
+    giống hệt RecipeSerializer (xem test parity).
+    """
+    fields = RecipeSerializer.Meta.fields
+
+    # Chỉ những field có cách chuyển đổi nhanh tương đương mới được hỗ trợ,
+    # thêm field khác vào RecipeSerializer phải cập nhật ở đây.
+    FAST_FIELDS = {
+        serializers.IntegerField: None,
+        serializers.CharField: None,
+        serializers.DecimalField: _format_decimal,
+    }
+
+    # fields: tập con của RecipeSerializer.Meta.fields, cùng thứ tự.
+    def __init__(self, rows, fields=None):
+        self.rows = rows
+        if fields is not None:
+            self.fields = fields
+
+    @classmethod
+    def get_converters(cls, names=None):
+        """Return one converter (or None for as-is) per field."""
+        fields = RecipeSerializer().fields
+        converters = []
+        for name in names or cls.fields:
+            field_class = type(fields[name])
+            if field_class not in cls.FAST_FIELDS:
+                raise TypeError(f'No fast representation for {name!r}.')
+            converters.append(cls.FAST_FIELDS[field_class])
+        return converters
+
+    @classmethod
+    def values(cls, queryset, ordering=(), fields=None):
+        """Return queryset as named rows with the fields and ordering keys.
+
+        Cursor pagination đọc vị trí bằng getattr(row, <trường ordering>),
+        nên thêm các trường ordering (ví dụ rank) vào cuối mỗi row. Chỉ
+        SELECT các cột của fields (mặc định mọi trường) và ordering.
+        """
+        fields = fields or cls.fields
+        extra = [
+            name for name in (field.lstrip('-') for field in ordering)
+            if name not in fields
+        ]
+        return queryset.values_list(*fields, *extra, named=True)
+
+    @property
+    def data(self):
+        with measure_serializer():
+            return self._build()
+
+    def _build(self):
+        names = self.fields
+        converters = [
+            (name, convert)
+            for name, convert in zip(names, self.get_converters(names))
+            if convert is not None
+        ]
+        result = []
+        # zip dừng ở field cuối, bỏ các cột ordering thêm vào trong values().
+        for row in self.rows:
+            item = dict(zip(names, row))
+            for name, convert in converters:
+                item[name] = convert(item[name])
+            result.append(item)
+        return result
+
+
+class RecipeStatsSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
+    """Serializer for the recipe statistics of a user."""
+    # Trung bình tính từ các tổng trong RecipeStats, null khi chưa có recipe.
+    average_price = serializers.DecimalField(
+        max_digits=5, decimal_places=2, read_only=True
+    )
+    average_time_minutes = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = RecipeStats
+        fields = ['recipe_count', 'average_price', 'average_time_minutes']
+        read_only_fields = fields
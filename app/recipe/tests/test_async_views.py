@@ -0,0 +1,127 @@
+"""Tests for the async (ASGI) recipe APIs."""
+import json
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+
+async_list_url = reverse('recipe:async-recipe-list')
+recipes_url = reverse('recipe:recipe-list')
+
+
+def async_detail_url(recipe_id):
+    return reverse('recipe:async-recipe-detail', args=[recipe_id])
+
+
+def detail_url(recipe_id):
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+class AsyncRecipeApiTests(TestCase):
+    """Test the async endpoints behave like RecipeViewSet."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = {'AUTHORIZATION': f'Token {self.token.key}'}
+        self.sync_client = APIClient()
+        self.sync_client.force_authenticate(self.user)
+        self.recipes = [
+            Recipe.objects.create(
+                user=self.user, title=f'Recipe {i}', time_minutes=i,
+                price=Decimal('5.50'), description='Tasty',
+            )
+            for i in range(3)
+        ]
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='testpass123'
+        )
+        self.other_recipe = Recipe.objects.create(
+            user=other, title='Other', time_minutes=1, price=Decimal('1.00')
+        )
+
+    async def test_auth_required(self):
+        res = await self.async_client.get(async_list_url)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res['WWW-Authenticate'], 'Token')
+
+        res = await self.async_client.get(
+            async_list_url, AUTHORIZATION='Token invalid'
+        )
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res.json(), {'detail': 'Invalid token.'})
+
+    async def sync_get(self, url, params=None):
+        """GET url from RecipeViewSet and return the decoded JSON."""
+        res = await sync_to_async(self.sync_client.get)(url, params)
+        return res.json()
+
+    async def test_list_matches_sync_api(self):
+        res = await self.async_client.get(
+            async_list_url, {'page_size': 2}, **self.auth
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        body = res.json()
+        expected = await self.sync_get(recipes_url, {'page_size': 2})
+        self.assertEqual(body['results'], expected['results'])
+        self.assertEqual(len(body['results']), 2)
+
+        # Cursor của hai API dùng chung định dạng.
+        res = await self.async_client.get(body['next'], **self.auth)
+        expected = await self.sync_get(expected['next'])
+        self.assertEqual(res.json()['results'], expected['results'])
+
+    async def test_retrieve(self):
+        recipe = self.recipes[0]
+        res = await self.async_client.get(
+            async_detail_url(recipe.id), **self.auth
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        expected = await self.sync_get(detail_url(recipe.id))
+        self.assertEqual(res.json(), expected)
+
+    async def test_retrieve_other_users_recipe_not_found(self):
+        res = await self.async_client.get(
+            async_detail_url(self.other_recipe.id), **self.auth
+        )
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res.json(), {'detail': 'Not found.'})
+
+    async def test_create(self):
+        payload = {
+            'title': 'Phở', 'time_minutes': 30, 'price': '4.50',
+            'description': 'Soup',
+        }
+        res = await self.async_client.post(
+            async_list_url, json.dumps(payload),
+            content_type='application/json', **self.auth
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        body = res.json()
+        self.assertEqual(body['title'], 'Phở')
+        self.assertEqual(body['price'], '4.50')
+        self.assertEqual(body, await self.sync_get(detail_url(body['id'])))
+
+    async def test_create_invalid(self):
+        res = await self.async_client.post(
+            async_list_url, json.dumps({'title': 'No price'}),
+            content_type='application/json', **self.auth
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('price', res.json())
+
+    async def test_method_not_allowed(self):
+        res = await self.async_client.delete(
+            async_detail_url(self.other_recipe.id), **self.auth
+        )
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertEqual(res['Allow'], 'GET')
@@ -0,0 +1,144 @@
+"""Tests for the recipe response cache."""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+from recipe.caching import get_response_cache, response_cache_stats
+
+recipes_url = reverse('recipe:recipe-list')
+bulk_url = reverse('recipe:recipe-bulk')
+stats_url = reverse('recipe:cache-stats')
+
+
+def detail_url(recipe_id):
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+def recipe_queries(ctx):
+    return [q for q in ctx.captured_queries if 'core_recipe' in q['sql']]
+
+
+class RecipeResponseCacheTests(TestCase):
+    """Test list/retrieve responses are cached and invalidated."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        response_cache_stats.reset()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        self.recipe = Recipe.objects.create(
+            user=self.user, title='Soup', time_minutes=10,
+            price=Decimal('2.50'),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_served_from_cache(self):
+        """Test a repeated list does not query recipes."""
+        first = self.client.get(recipes_url)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(recipes_url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(recipe_queries(ctx), [])
+        self.assertEqual(response_cache_stats.as_dict(),
+                         {'hits': 1, 'misses': 1})
+
+    def test_retrieve_served_from_cache(self):
+        """Test a repeated retrieve does not query recipes."""
+        url = detail_url(self.recipe.id)
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        self.assertEqual(res.data['title'], 'Soup')
+        self.assertEqual(recipe_queries(ctx), [])
+
+    def test_query_params_cached_separately(self):
+        """Test different query params are different cache entries."""
+        Recipe.objects.create(
+            user=self.user, title='Salad', time_minutes=5,
+            price=Decimal('9.00'),
+        )
+        self.client.get(recipes_url)
+        res = self.client.get(recipes_url, {'price__lte': '3'})
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(response_cache_stats.hits, 0)
+
+    def test_writes_invalidate_cache(self):
+        """Test create, update, bulk and delete are visible immediately."""
+        url = detail_url(self.recipe.id)
+        self.client.get(recipes_url)
+        self.client.get(url)
+
+        self.client.patch(url, {'title': 'Stew'})
+        self.assertEqual(self.client.get(url).data['title'], 'Stew')
+
+        self.client.post(recipes_url, {
+            'title': 'Rice', 'time_minutes': 5, 'price': '1.00',
+        })
+        self.assertEqual(len(self.client.get(recipes_url).data['results']), 2)
+
+        self.client.patch(
+            bulk_url, [{'id': self.recipe.id, 'title': 'Bulk'}], format='json'
+        )
+        self.assertEqual(self.client.get(url).data['title'], 'Bulk')
+
+        self.client.delete(url)
+        self.assertEqual(
+            self.client.get(url).status_code, status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(len(self.client.get(recipes_url).data['results']), 1)
+
+    def test_cache_is_per_user(self):
+        """Test another user never gets a cached response of this user."""
+        self.client.get(recipes_url)
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='testpass123'
+        )
+        self.client.force_authenticate(other)
+        res = self.client.get(recipes_url)
+        self.assertEqual(res.data['results'], [])
+
+    def test_not_found_not_cached(self):
+        """Test error responses are not stored."""
+        url = detail_url(self.recipe.id + 1000)
+        self.client.get(url)
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response_cache_stats.hits, 0)
+
+
+class CacheStatsApiTests(TestCase):
+    """Test the cache stats endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_stats_require_staff(self):
+        """Test regular users cannot read cache stats."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        self.client.force_authenticate(user)
+        res = self.client.get(stats_url)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_stats_for_staff(self):
+        """Test staff get response and token cache counters."""
+        response_cache_stats.reset()
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'testpass123'
+        )
+        self.client.force_authenticate(admin)
+        res = self.client.get(stats_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['responses'], {'hits': 0, 'misses': 0})
+        self.assertIn('hits', res.data['auth_tokens'])
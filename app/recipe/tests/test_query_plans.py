@@ -0,0 +1,103 @@
+"""Query plan regression tests for recipe APIs."""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+from core.tests.query_plans import QueryPlanMixin
+from recipe.caching import get_response_cache
+
+recipes_url = reverse('recipe:recipe-list')
+bulk_url = reverse('recipe:recipe-bulk')
+export_url = reverse('recipe:recipe-export')
+
+# Nhiều user lớn và một user nhỏ: không có index (user_id, id DESC) thì
+# Postgres phải sort recipes của user nhỏ hoặc quét gần hết bảng.
+USERS = 40
+RECIPES_PER_USER = 1000
+SMALL_USER_RECIPES = 300
+
+
+def detail_url(recipe_id):
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+class RecipeQueryPlanTests(QueryPlanMixin, TestCase):
+    """Every query the recipe API issues is served by an index."""
+    plan_tables = ('core_recipe',)
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            get_user_model().objects.create_user(
+                email=f'user{i}@example.com', password='testpass123'
+            )
+            for i in range(USERS + 1)
+        ]
+        cls.user = users[-1]
+        # Xen kẽ recipes của các user như dữ liệu thật.
+        total = USERS * RECIPES_PER_USER
+        step = total // SMALL_USER_RECIPES
+        Recipe.objects.bulk_create(
+            (
+                Recipe(
+                    user=cls.user if i % step == 0 else users[i % USERS],
+                    title=f'Recipe {i}',
+                    time_minutes=i % 120,
+                    price=Decimal(i % 1000) / 100,
+                )
+                for i in range(total)
+            ),
+            batch_size=5000,
+        )
+
+    def setUp(self):
+        # Cache hit thì không có query nào để EXPLAIN.
+        get_response_cache().clear()
+        self.analyze_tables()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.recipe = Recipe.objects.filter(user=self.user).first()
+
+    def test_list_first_page(self):
+        self.assertIndexedPlans(lambda: self.client.get(recipes_url))
+
+    def test_list_next_page(self):
+        next_url = self.client.get(recipes_url).data['next']
+        self.assertIndexedPlans(lambda: self.client.get(next_url))
+
+    def test_list_filtered_and_ordered(self):
+        for params in [
+            {'price__gte': '2.50', 'price__lte': '7.50'},
+            {'time_minutes__lte': 100, 'ordering': '-time_minutes'},
+            {'ordering': '-price'},
+            {'ordering': 'title'},
+        ]:
+            with self.subTest(**params):
+                next_url = self.client.get(recipes_url, params).data['next']
+                self.assertIndexedPlans(lambda: self.client.get(next_url))
+
+    def test_retrieve(self):
+        url = detail_url(self.recipe.id)
+        self.assertIndexedPlans(lambda: self.client.get(url))
+
+    def test_export(self):
+        def export():
+            res = self.client.get(export_url)
+            b''.join(res.streaming_content)
+        self.assertIndexedPlans(export)
+
+    def test_bulk_update(self):
+        payload = [{'id': self.recipe.id, 'title': 'New title'}]
+        self.assertIndexedPlans(
+            lambda: self.client.patch(bulk_url, payload, format='json')
+        )
+
+    def test_bulk_delete(self):
+        payload = [self.recipe.id]
+        self.assertIndexedPlans(
+            lambda: self.client.delete(bulk_url, payload, format='json')
+        )
@@ -1,15 +1,24 @@
 """Tests for recipe APIs."""
 
+import csv
+import io
+import json
 from decimal import Decimal
 from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from core.models import Recipe
 from recipe.serializers import RecipeSerializer, RecipeDetailSerializer
+from recipe.pagination import RecipeCursorPagination
+from recipe.caching import get_response_cache
 
 recipes_url = reverse('recipe:recipe-list')
+bulk_url = reverse('recipe:recipe-bulk')
+export_url = reverse('recipe:recipe-export')
 
 '''
     Recipe
@@ -65,6 +74,7 @@ class PrivateRecipeApiTests(TestCase):
         #     'testpass123'
         # )
         self.user = create_user(email='user@example.com', password='test123')
+        get_response_cache().clear()
         
         # Giả lập xác thực để test các request đã xác thực.
         self.client.force_authenticate(self.user)
@@ -79,7 +89,7 @@ class PrivateRecipeApiTests(TestCase):
         recipes = Recipe.objects.all().order_by('-id')
         serializer = RecipeSerializer(recipes, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
         
     # Chỉ trả về Recipes của User đã xác thực
     def test_recipe_list_limited_to_user(self):
@@ -93,7 +103,37 @@ class PrivateRecipeApiTests(TestCase):
         # Lấy recipes chỉ từ user đã xác thực
         serializer = RecipeSerializer(recipes, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    # Phân trang bằng cursor
+    def test_list_paginated_with_cursor(self):
+        """Test next cursors walk every recipe once, newest first."""
+        recipes = [create_recipe(user=self.user) for _ in range(5)]
+        ids = []
+        url = recipes_url + '?page_size=2'
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(res.data['results']), 2)
+            ids += [item['id'] for item in res.data['results']]
+            url = res.data['next']
+        self.assertEqual(ids, sorted((r.id for r in recipes), reverse=True))
+
+    def test_list_page_size_capped(self):
+        """Test the requested page size cannot exceed the server maximum."""
+        Recipe.objects.bulk_create([
+            Recipe(
+                user=self.user, title='r', time_minutes=1,
+                price=Decimal('1.00'),
+            )
+            for _ in range(RecipeCursorPagination.max_page_size + 1)
+        ])
+        res = self.client.get(recipes_url, {'page_size': 10000})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            len(res.data['results']), RecipeCursorPagination.max_page_size
+        )
+        self.assertIsNotNone(res.data['next'])
         
     
     def test_get_recipe_detail(self):
@@ -193,7 +233,309 @@ class PrivateRecipeApiTests(TestCase):
         res = self.client.delete(url)
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
         self.assertTrue(Recipe.objects.filter(id=recipe.id).exists())
-        
-    
-    
-        
+
+    # Bulk create/update/delete
+    def test_bulk_create_json(self):
+        """Test bulk creating recipes from a JSON array."""
+        payload = [
+            {'title': 'Recipe 1', 'time_minutes': 10, 'price': '1.50'},
+            {'title': 'Recipe 2', 'time_minutes': 20, 'price': '2.50'},
+        ]
+        res = self.client.post(bulk_url, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['created']), 2)
+        self.assertEqual(res.data['errors'], [])
+        recipes = Recipe.objects.filter(user=self.user).order_by('id')
+        self.assertEqual([r.title for r in recipes], ['Recipe 1', 'Recipe 2'])
+
+    def test_bulk_create_ndjson(self):
+        """Test bulk creating recipes from an NDJSON stream."""
+        lines = [
+            {'title': f'Recipe {i}', 'time_minutes': i, 'price': '1.00'}
+            for i in range(3)
+        ]
+        body = '\n'.join(json.dumps(line) for line in lines) + '\n'
+        res = self.client.post(
+            bulk_url, body, content_type='application/x-ndjson'
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Recipe.objects.filter(user=self.user).count(), 3)
+
+    def test_bulk_create_reports_item_errors(self):
+        """Test invalid items are reported without aborting the batch."""
+        payload = [
+            {'title': 'Good', 'time_minutes': 10, 'price': '1.50'},
+            {'title': 'Bad', 'price': '1.50'},
+            'not an object',
+        ]
+        res = self.client.post(bulk_url, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['created']), 1)
+        self.assertEqual([e['index'] for e in res.data['errors']], [1, 2])
+        self.assertIn('time_minutes', res.data['errors'][0]['errors'])
+        self.assertEqual(Recipe.objects.filter(user=self.user).count(), 1)
+
+    def test_bulk_create_requires_list(self):
+        """Test a non-list payload is rejected."""
+        payload = {'title': 'Recipe', 'time_minutes': 10, 'price': '1.50'}
+        res = self.client.post(bulk_url, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self):
+        """Test bulk partial update, ignoring other users' recipes."""
+        recipe = create_recipe(user=self.user, title='Old title')
+        other = create_recipe(
+            user=create_user(email='other@example.com', password='test123')
+        )
+        payload = [
+            {'id': recipe.id, 'title': 'New title'},
+            {'id': other.id, 'title': 'Hacked'},
+        ]
+        res = self.client.patch(bulk_url, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['updated']), 1)
+        self.assertEqual(res.data['errors'][0]['index'], 1)
+        recipe.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(recipe.title, 'New title')
+        self.assertNotEqual(other.title, 'Hacked')
+
+    def test_bulk_delete(self):
+        """Test bulk delete only removes the user's own recipes."""
+        recipes = [create_recipe(user=self.user) for _ in range(3)]
+        other = create_recipe(
+            user=create_user(email='other@example.com', password='test123')
+        )
+        payload = [recipes[0].id, {'id': recipes[1].id}, other.id, 'x']
+        res = self.client.delete(bulk_url, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['deleted'], 2)
+        self.assertEqual(res.data['errors'][0]['index'], 3)
+        self.assertTrue(Recipe.objects.filter(id=other.id).exists())
+        self.assertEqual(Recipe.objects.filter(user=self.user).count(), 1)
+
+    # Export NDJSON/CSV
+    def test_export_ndjson(self):
+        """Test exporting recipes as NDJSON, limited to the user."""
+        recipe = create_recipe(user=self.user)
+        create_recipe(
+            user=create_user(email='other@example.com', password='test123')
+        )
+        res = self.client.get(export_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        serializer = RecipeDetailSerializer(recipe)
+        self.assertEqual(json.loads(lines[0]), serializer.data)
+
+    def test_export_csv(self):
+        """Test exporting recipes as CSV."""
+        create_recipe(user=self.user, title='First')
+        create_recipe(user=self.user, title='Second')
+        res = self.client.get(export_url, {'type': 'csv'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        content = b''.join(res.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        titles = sorted(row['title'] for row in rows)
+        self.assertEqual(titles, ['First', 'Second'])
+        self.assertEqual(rows[0]['price'], '5.25')
+
+    def test_export_invalid_type(self):
+        """Test an unknown export type is rejected."""
+        res = self.client.get(export_url, {'type': 'xml'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # Full-text search
+    def test_search_prefix_match(self):
+        """Test searching matches words and starred word prefixes."""
+        curry = create_recipe(user=self.user, title='Chicken curry')
+        create_recipe(user=self.user, title='Beef stew', description='Slow')
+        res = self.client.get(recipes_url, {'search': 'chicken curr*'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['id'] for item in res.data['results']], [curry.id]
+        )
+
+    def test_search_ranked_and_limited_to_user(self):
+        """Test title matches rank above description matches."""
+        in_description = create_recipe(
+            user=self.user, title='Stew', description='Made with tomato'
+        )
+        in_title = create_recipe(
+            user=self.user, title='Tomato soup', description='Easy'
+        )
+        create_recipe(
+            user=create_user(email='other@example.com', password='test123'),
+            title='Tomato salad',
+        )
+        res = self.client.get(recipes_url, {'search': 'tomato'})
+        self.assertEqual(
+            [item['id'] for item in res.data['results']],
+            [in_title.id, in_description.id],
+        )
+
+    def test_search_paginates_ties(self):
+        """Test paging through equally ranked results returns each once."""
+        recipes = [
+            create_recipe(user=self.user, title='Pasta', description='')
+            for _ in range(5)
+        ]
+        create_recipe(user=self.user, title='Rice')
+        ids = []
+        url = recipes_url + '?search=pasta&page_size=2'
+        while url:
+            res = self.client.get(url)
+            ids += [item['id'] for item in res.data['results']]
+            url = res.data['next']
+        self.assertEqual(ids, sorted((r.id for r in recipes), reverse=True))
+
+    def test_search_blank_returns_all(self):
+        """Test a search without words does not filter."""
+        create_recipe(user=self.user)
+        res = self.client.get(recipes_url, {'search': ' :* & '})
+        self.assertEqual(len(res.data['results']), 1)
+
+    # Filter và ordering
+    def test_filter_price_range_sorted_by_price(self):
+        """Test a price range is returned in ascending price order."""
+        cheap = create_recipe(user=self.user, price=Decimal('2.00'))
+        mid = create_recipe(user=self.user, price=Decimal('4.00'))
+        create_recipe(user=self.user, price=Decimal('9.00'))
+        low = create_recipe(user=self.user, price=Decimal('1.00'))
+        res = self.client.get(
+            recipes_url, {'price__gte': '1.50', 'price__lte': '5'}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['id'] for item in res.data['results']], [cheap.id, mid.id]
+        )
+        self.assertNotIn(low.id, [item['id'] for item in res.data['results']])
+
+    def test_filter_time_minutes_descending(self):
+        """Test filtering on time_minutes with descending ordering."""
+        quick = create_recipe(user=self.user, time_minutes=10)
+        slow = create_recipe(user=self.user, time_minutes=30)
+        create_recipe(user=self.user, time_minutes=90)
+        res = self.client.get(recipes_url, {
+            'time_minutes__lte': 60, 'ordering': '-time_minutes',
+        })
+        self.assertEqual(
+            [item['id'] for item in res.data['results']], [slow.id, quick.id]
+        )
+
+    def test_ordering_by_title_paginates_ties(self):
+        """Test ordering by title pages through duplicates once each."""
+        recipes = [
+            create_recipe(user=self.user, title=title)
+            for title in ['B', 'A', 'B', 'C', 'B', 'A']
+        ]
+        ids = []
+        url = recipes_url + '?ordering=title&page_size=2'
+        while url:
+            res = self.client.get(url)
+            ids += [item['id'] for item in res.data['results']]
+            url = res.data['next']
+        expected = sorted(recipes, key=lambda r: (r.title, r.id))
+        self.assertEqual(ids, [r.id for r in expected])
+
+    def test_filter_by_id_ordering_allowed(self):
+        """Test ordering=id returns recipes oldest first."""
+        first = create_recipe(user=self.user)
+        second = create_recipe(user=self.user)
+        res = self.client.get(recipes_url, {'ordering': 'id'})
+        self.assertEqual(
+            [item['id'] for item in res.data['results']],
+            [first.id, second.id],
+        )
+
+    def test_filter_invalid_values_rejected(self):
+        """Test malformed filter and ordering values return 400."""
+        for params in [
+            {'price__lte': 'cheap'},
+            {'time_minutes__gte': '1.5'},
+            {'ordering': 'description'},
+        ]:
+            res = self.client.get(recipes_url, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_unindexed_combinations_rejected(self):
+        """Test combinations no index can serve without sorting are 400."""
+        for params in [
+            {'price__lte': '5', 'time_minutes__lte': 30},
+            {'price__lte': '5', 'ordering': '-id'},
+            {'time_minutes__gte': 10, 'ordering': 'title'},
+            {'search': 'soup', 'ordering': 'price'},
+        ]:
+            res = self.client.get(recipes_url, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # Conditional GET (ETag / Last-Modified)
+    def test_list_not_modified_without_reading_recipes(self):
+        """Test a repeat poll gets 304 without querying recipes."""
+        create_recipe(user=self.user)
+        etag = self.client.get(recipes_url)['ETag']
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(recipes_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+        self.assertFalse(
+            any('core_recipe' in q['sql'] for q in ctx.captured_queries)
+        )
+
+    def test_list_etag_changes_on_every_write(self):
+        """Test create, update, delete and bulk writes change the ETag."""
+        recipe = create_recipe(user=self.user)
+        writes = [
+            lambda: self.client.post(recipes_url, {
+                'title': 'New', 'time_minutes': 5, 'price': '1.00',
+            }),
+            lambda: self.client.patch(detail_url(recipe.id), {'title': 'X'}),
+            lambda: self.client.patch(
+                bulk_url, [{'id': recipe.id, 'title': 'Y'}], format='json'
+            ),
+            lambda: self.client.post(bulk_url, [{
+                'title': 'Bulk', 'time_minutes': 5, 'price': '1.00',
+            }], format='json'),
+            lambda: self.client.delete(detail_url(recipe.id)),
+            lambda: self.client.delete(
+                bulk_url, [r.id for r in Recipe.objects.all()], format='json'
+            ),
+        ]
+        etags = {self.client.get(recipes_url)['ETag']}
+        for write in writes:
+            write()
+            res = self.client.get(recipes_url)
+            self.assertNotIn(res['ETag'], etags)
+            etags.add(res['ETag'])
+
+    def test_list_etag_varies_with_query(self):
+        """Test different pages or filters do not share an ETag."""
+        etag = self.client.get(recipes_url)['ETag']
+        res = self.client.get(
+            recipes_url, {'ordering': 'price'}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_if_modified_since(self):
+        """Test If-Modified-Since uses the last recipe write time."""
+        create_recipe(user=self.user)
+        last_modified = self.client.get(recipes_url)['Last-Modified']
+        res = self.client.get(
+            recipes_url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_not_modified(self):
+        """Test recipe detail answers If-None-Match until it changes."""
+        recipe = create_recipe(user=self.user)
+        url = detail_url(recipe.id)
+        etag = self.client.get(url)['ETag']
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {'title': 'Changed'})
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['title'], 'Changed')
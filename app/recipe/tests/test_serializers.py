@@ -0,0 +1,48 @@
+"""Tests for the recipe serializers."""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Recipe
+from recipe.serializers import RecipeListSerializer, RecipeSerializer
+
+
+class RecipeListSerializerTests(TestCase):
+    """Test the fast list serializer matches RecipeSerializer."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        for price, title, link in [
+            (Decimal('5.00'), 'Phở bò', ''),
+            (Decimal('0.50'), 'Toast', 'http://example.com/toast'),
+            (Decimal('999.99'), '"Quoted" & <b>', 'x'),
+            (Decimal('10'), '', ''),
+        ]:
+            Recipe.objects.create(
+                user=user, title=title, time_minutes=7, price=price,
+                link=link,
+            )
+        self.queryset = Recipe.objects.order_by('-id')
+
+    def test_parity_with_recipe_serializer(self):
+        """Test the fast path renders byte-identical JSON."""
+        expected = RecipeSerializer(self.queryset, many=True).data
+        rows = RecipeListSerializer.values(self.queryset)
+        data = RecipeListSerializer(rows).data
+        self.assertEqual(data, expected)
+        self.assertEqual(
+            JSONRenderer().render(data), JSONRenderer().render(expected)
+        )
+
+    def test_ordering_columns_not_rendered(self):
+        """Test extra ordering columns are readable but not in the output."""
+        rows = list(RecipeListSerializer.values(
+            self.queryset.order_by('title', 'id'), ('title', 'id')
+        ))
+        self.assertEqual(rows[0].title, '')
+        data = RecipeListSerializer(rows).data
+        self.assertEqual(list(data[0]), RecipeSerializer.Meta.fields)
@@ -0,0 +1,114 @@
+"""Tests for ?fields= sparse fieldsets on the recipe API."""
+import re
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+from recipe.caching import get_response_cache
+
+recipes_url = reverse('recipe:recipe-list')
+
+SELECT_RECIPE = re.compile(r'^SELECT (.*?) FROM "core_recipe"')
+
+
+def detail_url(recipe_id):
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+class SparseFieldsTests(TestCase):
+    """Test ?fields= trims the response and the selected columns."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.recipe = Recipe.objects.create(
+            user=self.user, title='Phở', time_minutes=30,
+            price=Decimal('5.50'), description='Long broth. ' * 100,
+        )
+
+    def get_with_columns(self, url, params=None):
+        """GET url; return the response and the core_recipe columns read."""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+        selects = [
+            match.group(1) for match in (
+                SELECT_RECIPE.match(query['sql']) for query in queries
+            ) if match
+        ]
+        self.assertEqual(len(selects), 1, selects)
+        columns = [
+            column.split('.')[-1].strip('"')
+            for column in selects[0].split(', ')
+        ]
+        return res, columns
+
+    def test_list_fields(self):
+        res, columns = self.get_with_columns(
+            recipes_url, {'fields': 'title,price'}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json()['results'], [{'title': 'Phở', 'price': '5.50'}]
+        )
+        # id vẫn được đọc: cursor phân trang theo -id.
+        self.assertEqual(columns, ['title', 'price', 'id'])
+
+    def test_list_default_columns(self):
+        _, columns = self.get_with_columns(recipes_url)
+
+        self.assertEqual(
+            columns, ['id', 'title', 'time_minutes', 'price', 'link']
+        )
+
+    def test_retrieve_fields(self):
+        res, columns = self.get_with_columns(
+            detail_url(self.recipe.id), {'fields': 'id,title'}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {'id': self.recipe.id, 'title': 'Phở'})
+        self.assertEqual(columns, ['id', 'title'])
+
+    def test_retrieve_skips_unserialized_columns(self):
+        res, columns = self.get_with_columns(detail_url(self.recipe.id))
+
+        self.assertEqual(res.json()['description'], self.recipe.description)
+        self.assertCountEqual(columns, [
+            'id', 'title', 'description', 'time_minutes', 'price', 'link',
+        ])
+
+    def test_invalid_fields(self):
+        for value in ('', 'title,user', 'search_vector'):
+            with self.subTest(fields=value):
+                res = self.client.get(recipes_url, {'fields': value})
+                self.assertEqual(
+                    res.status_code, status.HTTP_400_BAD_REQUEST
+                )
+                self.assertIn('fields', res.json())
+
+        # description chỉ có ở chi tiết.
+        res = self.client.get(recipes_url, {'fields': 'description'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.client.get(
+            detail_url(self.recipe.id), {'fields': 'description'}
+        )
+        self.assertEqual(res.json(), {'description': self.recipe.description})
+
+    def test_fields_cached_separately(self):
+        self.client.get(recipes_url, {'fields': 'title'})
+
+        res = self.client.get(recipes_url)
+
+        self.assertIn('price', res.json()['results'][0])
@@ -0,0 +1,138 @@
+"""Tests for the recipe statistics API."""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db.models import Avg, Count
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+
+stats_url = reverse('recipe:recipe-stats')
+bulk_url = reverse('recipe:recipe-bulk')
+
+
+def create_recipe(user, **params):
+    defaults = {'title': 'Recipe', 'time_minutes': 10, 'price': Decimal('5')}
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class PublicRecipeStatsApiTests(TestCase):
+    """Test unauthenticated requests."""
+
+    def test_auth_required(self):
+        res = APIClient().get(stats_url)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateRecipeStatsApiTests(TestCase):
+    """Test the stats stay in sync with every way of writing recipes."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='testpass123'
+        )
+        create_recipe(other, price=Decimal('999.99'), time_minutes=999)
+
+    def assert_stats_match_recipes(self):
+        """Test the API matches an aggregate over the user's recipes."""
+        expected = Recipe.objects.filter(user=self.user).aggregate(
+            count=Count('id'), price=Avg('price'), time=Avg('time_minutes')
+        )
+        res = self.client.get(stats_url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['recipe_count'], expected['count'])
+        if expected['count']:
+            self.assertEqual(
+                res.data['average_price'],
+                str(expected['price'].quantize(Decimal('0.01'))),
+            )
+            self.assertAlmostEqual(
+                res.data['average_time_minutes'], expected['time']
+            )
+        return res
+
+    def test_no_recipes(self):
+        res = self.client.get(stats_url)
+
+        self.assertEqual(res.data, {
+            'recipe_count': 0,
+            'average_price': None,
+            'average_time_minutes': None,
+        })
+
+    def test_stats_of_user(self):
+        create_recipe(self.user, price=Decimal('2.50'), time_minutes=10)
+        create_recipe(self.user, price=Decimal('3.25'), time_minutes=25)
+
+        res = self.assert_stats_match_recipes()
+
+        self.assertEqual(res.data, {
+            'recipe_count': 2,
+            'average_price': '2.88',
+            'average_time_minutes': 17.5,
+        })
+
+    def test_single_query(self):
+        """Test reading stats costs one primary key lookup."""
+        for i in range(20):
+            create_recipe(self.user, time_minutes=i)
+
+        with self.assertNumQueries(1):
+            self.client.get(stats_url)
+
+    def test_update_and_delete(self):
+        recipe = create_recipe(self.user, price=Decimal('4.00'))
+        create_recipe(self.user, price=Decimal('8.00'), time_minutes=30)
+        recipe.price = Decimal('10.00')
+        recipe.save()
+        self.assert_stats_match_recipes()
+
+        recipe.delete()
+        self.assert_stats_match_recipes()
+
+    def test_bulk_writes(self):
+        """Test bulk create, queryset update and delete are counted."""
+        Recipe.objects.bulk_create([
+            Recipe(user=self.user, title=f'R{i}', time_minutes=i,
+                   price=Decimal(i))
+            for i in range(1, 11)
+        ])
+        self.assert_stats_match_recipes()
+
+        Recipe.objects.filter(user=self.user, time_minutes__lte=5).update(
+            price=Decimal('1.50')
+        )
+        self.assert_stats_match_recipes()
+
+        Recipe.objects.filter(user=self.user, time_minutes__gt=7).delete()
+        self.assert_stats_match_recipes()
+
+    def test_bulk_api(self):
+        payload = [
+            {'title': f'R{i}', 'time_minutes': i, 'price': f'{i}.25'}
+            for i in range(1, 6)
+        ]
+        res = self.client.post(bulk_url, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.assert_stats_match_recipes()
+        self.assertEqual(res.data['recipe_count'], 5)
+
+    def test_recipe_moved_to_other_user(self):
+        recipe = create_recipe(self.user)
+        other = get_user_model().objects.get(email='other@example.com')
+        Recipe.objects.filter(pk=recipe.pk).update(user=other)
+
+        res = self.assert_stats_match_recipes()
+        self.assertEqual(res.data['recipe_count'], 0)
+        self.assertEqual(other.recipe_stats.recipe_count, 2)
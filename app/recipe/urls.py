@@ -1,7 +1,7 @@
 """URL mappings for the recipe app."""
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from recipe import views
+from recipe import async_views, views
 
 # Sử dụng DefaultRouter để tự động tạo URL cho RecipeViewSet.
 router = DefaultRouter()
@@ -10,5 +10,19 @@ router.register('recipes', views.RecipeViewSet)
 # Đặt namespace cho URL (recipe:recipe-list)
 app_name = 'recipe'
 urlpatterns = [
+    # Số recipe và giá/thời gian trung bình của user: /api/recipe/stats/
+    path('stats/', views.RecipeStatsView.as_view(), name='recipe-stats'),
+    # Thống kê cache cho staff: /api/recipe/cache-stats/
+    path(
+        'cache-stats/', views.CacheStatsView.as_view(), name='cache-stats'
+    ),
+    # Bản async (ASGI) của list/create/retrieve, xem recipe.async_views.
+    path(
+        'async/recipes/', async_views.recipe_list, name='async-recipe-list'
+    ),
+    path(
+        'async/recipes/<int:pk>/', async_views.recipe_detail,
+        name='async-recipe-detail',
+    ),
     path('', include(router.urls)),
 ]
\ No newline at end of file
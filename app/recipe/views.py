@@ -1,9 +1,34 @@
 """Views for the recipe APIs."""
-from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
-from core.models import Recipe
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchRank
+from django.db.models import BigIntegerField, F, FloatField, Value
+from django.db.models.functions import Cast
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from user.authentication import CachedTokenAuthentication
+from rest_framework.permissions import (
+    SAFE_METHODS, IsAdminUser, IsAuthenticated,
+)
+from rest_framework.views import APIView
+from core.conditional import make_etag, not_modified, set_validators
+from core.models import Recipe, RecipeStats
+from core.parsers import MessagePackParser
 from recipe import serializers
+from recipe.caching import (
+    get_response_cache, response_cache_key, response_cache_stats,
+)
+from recipe.pagination import RecipeCursorPagination
+from recipe.exports import EXPORT_FORMATS
+from recipe.filters import RecipeFilterSerializer
+from recipe.parsers import NDJSONParser
+from recipe.search import build_search_query
 
 # Kế thừa ModelViewSet để hỗ trợ CRUD (list, create, retrieve, update, destroy).
 class RecipeViewSet(viewsets.ModelViewSet):
@@ -12,13 +37,152 @@ class RecipeViewSet(viewsets.ModelViewSet):
     queryset = Recipe.objects.all()
     
     #Yêu cầu xác thực token và user phải đăng nhập.
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    # Phân trang bằng cursor (keyset) trên -id để giới hạn kích thước response.
+    pagination_class = RecipeCursorPagination
+
+    # Scope của ScopedTokenBucketThrottle: đọc (list, retrieve, export) giới
+    # hạn rộng hơn ghi.
+    @property
+    def throttle_scope(self):
+        if self.request.method in SAFE_METHODS:
+            return 'recipe-read'
+        return 'recipe-write'
+
     # Ghi đè get_queryset: Lọc recipes theo user đã xác thực và sắp xếp theo id giảm dần
     def get_queryset(self):
         """Retrieve recipes for authenticated user."""
-        return self.queryset.filter(user=self.request.user).order_by('-id')
+        search_query = self.get_search_query()
+        if search_query is None:
+            queryset = self.queryset.filter(user=self.request.user)
+            filters = self.get_filters()
+            if filters is not None:
+                queryset = queryset.filter(**filters.get_filters())
+        else:
+            # GIN (user_id, search_vector) của btree_gin chỉ hỗ trợ so sánh
+            # bigint = bigint nên ép kiểu user id. Rank ép về float8 để cursor
+            # (vị trí theo rank) so sánh chính xác giữa các trang.
+            user_id = Cast(Value(self.request.user.pk), BigIntegerField())
+            queryset = self.queryset.filter(
+                user_id=user_id, search_vector=search_query
+            ).annotate(
+                rank=Cast(
+                    SearchRank(F('search_vector'), search_query),
+                    FloatField(),
+                )
+            )
+        if self.action == 'retrieve':
+            # Chỉ SELECT các cột được serialize: không đọc search_vector,
+            # và không đọc description khi ?fields= không có nó.
+            queryset = queryset.only(
+                *self.get_fields() or self.get_serializer_class().Meta.fields
+            )
+        return queryset.order_by(*self.get_ordering())
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(self.fast_list, request, *args, **kwargs)
+
+    # Danh sách chỉ đọc: dùng RecipeListSerializer trên values_list() thay
+    # cho RecipeSerializer, cùng output nhưng nhanh hơn nhiều lần.
+    def fast_list(self, request, *args, **kwargs):
+        """List recipes through the read-only fast serializer."""
+        fields = self.get_fields()
+        queryset = serializers.RecipeListSerializer.values(
+            self.get_queryset(), self.get_ordering(), fields
+        )
+        page = self.paginate_queryset(queryset)
+        data = serializers.RecipeListSerializer(page, fields).data
+        return self.get_paginated_response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    # Conditional GET và response cache dùng chung version marker của user
+    # (một query theo primary key): 304 hoặc cache hit không cần đọc hay
+    # serialize recipe nào.
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Serve a list/retrieve handler with ETag and the response cache."""
+        version, updated_at = get_user_model().objects.filter(
+            pk=request.user.pk
+        ).values_list('recipes_version', 'recipes_updated_at').get()
+        # Query string (cursor, filter, search) và định dạng đổi nội dung.
+        etag = make_etag(
+            'recipes', request.user.pk, version,
+            request.get_full_path(), request.accepted_media_type,
+        )
+        response = not_modified(request, etag, updated_at)
+        if response is not None:
+            return response
+
+        cache = get_response_cache()
+        key = response_cache_key(request, self.action, version)
+        data = cache.get(key)
+        if data is not None:
+            response_cache_stats.hit()
+            response = Response(data)
+        else:
+            response_cache_stats.miss()
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cache.set(key, response.data)
+        return set_validators(response, etag, updated_at)
+
+    def get_search_query(self):
+        """Return the SearchQuery for ?search= on list, or None."""
+        if self.action != 'list':
+            return None
+        return build_search_query(self.request.query_params.get('search', ''))
+
+    def get_filters(self):
+        """Return the validated ?price__gte=/?ordering=... on list, or None."""
+        if self.action != 'list':
+            return None
+        # View được tạo mới cho mỗi request: validate một lần rồi giữ lại.
+        if not hasattr(self, '_filters'):
+            filters = RecipeFilterSerializer(data=self.request.query_params)
+            filters.is_valid(raise_exception=True)
+            if filters.validated_data and \
+                    self.get_search_query() is not None:
+                raise ValidationError(
+                    'Search results are ordered by rank and cannot be '
+                    'filtered or sorted.'
+                )
+            self._filters = filters
+        return self._filters
+
+    # ?fields=id,title trên list/retrieve: chỉ trả về (và chỉ SELECT) các
+    # trường này, theo thứ tự của serializer.
+    def get_fields(self):
+        """Return the validated ?fields= on list/retrieve, or None."""
+        if self.action not in ('list', 'retrieve') or \
+                'fields' not in self.request.query_params:
+            return None
+        if not hasattr(self, '_fields'):
+            self._fields = serializers.parse_fields(
+                self.request.query_params['fields'],
+                self.get_serializer_class().Meta.fields,
+            )
+        return self._fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+    def get_ordering(self):
+        """Return the ordering used by the queryset and the paginator."""
+        filters = self.get_filters()
+        if self.get_search_query() is not None:
+            return ('-rank', '-id')
+        if filters is not None:
+            return filters.get_ordering()
+        return ('-id',)
     
     def get_serializer_class(self):
         """Return the serializer class for request."""
@@ -32,4 +196,172 @@ class RecipeViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Create a new recipe."""
         # Lưu recipe với user là user đã xác thực (self.request.user), đảm bảo trường user được gán đúng.
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        serializer.save(user=self.request.user)
+
+    # Export toàn bộ recipes của user, stream từng dòng để bộ nhớ không tăng
+    # theo số lượng recipe. ?type=ndjson (mặc định) hoặc ?type=csv.
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """Stream all recipes of the user as NDJSON or CSV."""
+        export_type = request.query_params.get('type', 'ndjson')
+        if export_type not in EXPORT_FORMATS:
+            raise ValidationError(
+                {'type': [f'Choose one of: {", ".join(EXPORT_FORMATS)}.']}
+            )
+        iter_rows, content_type = EXPORT_FORMATS[export_type]
+        # Bỏ ORDER BY: dump không cần thứ tự, tránh Postgres sort cả tập.
+        queryset = self.get_queryset().order_by()
+        response = StreamingHttpResponse(
+            iter_rows(queryset, settings.RECIPE_EXPORT_CHUNK_SIZE),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="recipes.{export_type}"'
+        )
+        return response
+
+    # Bulk endpoint: /recipes/bulk/ nhận JSON array, NDJSON hoặc MessagePack.
+    # Mỗi item được validate riêng, item lỗi không làm hỏng cả batch.
+    @action(
+        detail=False,
+        methods=['post', 'patch', 'delete'],
+        url_path='bulk',
+        parser_classes=[JSONParser, NDJSONParser, MessagePackParser],
+    )
+    def bulk(self, request):
+        """Create, update or delete many recipes in one request."""
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Expected a list of items.')
+        if len(items) > settings.RECIPE_BULK_MAX_ITEMS:
+            raise ValidationError(
+                f'At most {settings.RECIPE_BULK_MAX_ITEMS} items per request.'
+            )
+
+        if request.method == 'POST':
+            return self._bulk_create(items)
+        if request.method == 'PATCH':
+            return self._bulk_update(items)
+        return self._bulk_delete(items)
+
+    def _validate_items(self, items, partial=False):
+        """Validate each item, return (index, data) pairs and errors."""
+        # RecipeSerializer(many=True): dùng child để giữ lại các item hợp lệ.
+        child = self.get_serializer(many=True, partial=partial).child
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, child.run_validation(item)))
+            except ValidationError as exc:
+                errors.append({'index': index, 'errors': exc.detail})
+        return valid, errors
+
+    def _bulk_create(self, items):
+        valid, errors = self._validate_items(items)
+        recipes = [
+            Recipe(user=self.request.user, **data) for _, data in valid
+        ]
+        with transaction.atomic():
+            Recipe.objects.bulk_create(
+                recipes, batch_size=settings.RECIPE_BULK_BATCH_SIZE
+            )
+            if recipes:
+                get_user_model().objects.touch_recipes(
+                    self.request.user.pk, len(recipes)
+                )
+        return Response(
+            {
+                'created': self.get_serializer(recipes, many=True).data,
+                'errors': errors,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    def _bulk_update(self, items):
+        ids = [item.get('id') for item in items if isinstance(item, dict)]
+        # Một query để lấy tất cả recipe cần cập nhật (chỉ của user hiện tại).
+        existing = self.get_queryset().in_bulk(
+            [pk for pk in ids if isinstance(pk, int)]
+        )
+        valid, errors = self._validate_items(items, partial=True)
+
+        recipes, fields, now = {}, set(), timezone.now()
+        for index, data in valid:
+            recipe = existing.get(items[index].get('id'))
+            if recipe is None:
+                errors.append(
+                    {'index': index, 'errors': {'id': ['Not found.']}}
+                )
+                continue
+            for field, value in data.items():
+                setattr(recipe, field, value)
+            # bulk_update không tự cập nhật trường auto_now.
+            recipe.updated_at = now
+            fields.update(data)
+            recipes[recipe.pk] = recipe
+        errors.sort(key=lambda error: error['index'])
+
+        if recipes and fields:
+            with transaction.atomic():
+                Recipe.objects.bulk_update(
+                    recipes.values(),
+                    sorted(fields | {'updated_at'}),
+                    batch_size=settings.RECIPE_BULK_BATCH_SIZE,
+                )
+                get_user_model().objects.touch_recipes(self.request.user.pk)
+        return Response({
+            'updated': self.get_serializer(recipes.values(), many=True).data,
+            'errors': errors,
+        })
+
+    def _bulk_delete(self, items):
+        ids, errors = [], []
+        for index, item in enumerate(items):
+            pk = item.get('id') if isinstance(item, dict) else item
+            if isinstance(pk, int) and not isinstance(pk, bool):
+                ids.append(pk)
+            else:
+                errors.append(
+                    {'index': index, 'errors': {'id': ['Invalid id.']}}
+                )
+
+        deleted = 0
+        batch_size = settings.RECIPE_BULK_BATCH_SIZE
+        with transaction.atomic():
+            for start in range(0, len(ids), batch_size):
+                deleted += self.get_queryset().filter(
+                    id__in=ids[start:start + batch_size]
+                ).delete()[0]
+            if deleted:
+                get_user_model().objects.touch_recipes(
+                    self.request.user.pk, -deleted
+                )
+        return Response({'deleted': deleted, 'errors': errors})
+
+
+class RecipeStatsView(APIView):
+    """Recipe count, average price and average time of the user."""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'recipe-read'
+
+    # Đọc một dòng RecipeStats (theo primary key) do trigger cập nhật, không
+    # aggregate bảng recipe.
+    def get(self, request):
+        stats = RecipeStats.objects.filter(user_id=request.user.pk).first()
+        if stats is None:
+            stats = RecipeStats(user_id=request.user.pk)
+        return Response(serializers.RecipeStatsSerializer(stats).data)
+
+
+class CacheStatsView(APIView):
+    """Hit/miss counters of the recipe response and auth token caches."""
+    authentication_classes = [CachedTokenAuthentication]
+    # Chỉ staff xem được thống kê cache.
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'responses': response_cache_stats.as_dict(),
+            'auth_tokens': CachedTokenAuthentication.stats(),
+        })
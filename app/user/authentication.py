@@ -0,0 +1,205 @@
+"""Authentication classes for the APIs."""
+import hashlib
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import (
+    TokenAuthentication, get_authorization_header,
+)
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from core.async_orm import aget
+from core.db_router import pin_to_primary, reading_from_replica, use_primary
+
+
+class CacheStats:
+    """Thread-safe hit/miss counters for one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def as_dict(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+token_cache_stats = CacheStats()
+
+
+def get_token_cache():
+    """Return the cache configured for token lookups."""
+    return caches[settings.TOKEN_AUTH_CACHE]
+
+
+# Không dùng token thô làm cache key để tránh lộ token khi cache dùng chung.
+def token_cache_key(key):
+    """Return the cache key holding the (user, token, marker) of a token."""
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f'auth-token:{digest}'
+
+
+def marker_cache_key(key):
+    """Return the cache key holding the validity marker of a token."""
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f'auth-token-marker:{digest}'
+
+
+# Entry chỉ hợp lệ khi marker lưu cùng entry bằng marker hiện tại trong
+# cache. Invalidate = xóa marker; marker bị cache loại bỏ (LRU, hết hạn)
+# cũng làm entry hết hợp lệ, nên lỗi nào cũng dẫn tới đọc lại DB (fail
+# closed). Mỗi lần hit đọc cả hai key nên LRU giữ chúng cùng nhau.
+def get_cached(cache, key):
+    """Return the cached (user, token) of a token if still valid, or None."""
+    values = cache.get_many([token_cache_key(key), marker_cache_key(key)])
+    entry = values.get(token_cache_key(key))
+    if entry is None or entry[2] != values.get(marker_cache_key(key)):
+        return None
+    return entry[0], entry[1]
+
+
+# Marker được đọc (hoặc tạo) trước khi đọc DB: invalidate xảy ra giữa lúc
+# đọc DB và lúc ghi cache sẽ xóa marker này, entry ghi sau đó không hợp lệ.
+def get_marker(cache, key):
+    """Return the current validity marker of a token, creating one."""
+    cache.add(marker_cache_key(key), uuid.uuid4().hex)
+    return cache.get(marker_cache_key(key))
+
+
+async def aget_cached(cache, key):
+    """Async get_cached()."""
+    values = await cache.aget_many(
+        [token_cache_key(key), marker_cache_key(key)]
+    )
+    entry = values.get(token_cache_key(key))
+    if entry is None or entry[2] != values.get(marker_cache_key(key)):
+        return None
+    return entry[0], entry[1]
+
+
+async def aget_marker(cache, key):
+    """Async get_marker()."""
+    await cache.aadd(marker_cache_key(key), uuid.uuid4().hex)
+    return await cache.aget(marker_cache_key(key))
+
+
+# Token (và user) vừa tạo có thể chưa được replicate: phần còn lại của
+# request đọc ở primary, kể cả khi lookup token lấy từ cache.
+def pin_if_new(token):
+    """Pin the request to the primary if the token was just created."""
+    if not reading_from_replica():
+        return
+    age = timedelta(seconds=settings.DB_REPLICA_STICKY_SECONDS)
+    if token.created > timezone.now() - age:
+        pin_to_primary()
+
+
+def invalidate_token(key):
+    """Drop a cached token lookup."""
+    get_token_cache().delete_many(
+        [marker_cache_key(key), token_cache_key(key)]
+    )
+
+
+def invalidate_user(user_id):
+    """Drop the cached token lookups of a user."""
+    keys = Token.objects.filter(user_id=user_id).values_list('key', flat=True)
+    for key in keys:
+        invalidate_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches token -> user lookups.
+
+    Drop-in replacement for TokenAuthentication. TTL, size and eviction come
+    from the TOKEN_AUTH_CACHE cache alias (LocMemCache evicts least recently
+    used entries). Entries are invalidated by the signals in user.signals,
+    only in the processes sharing the cache (see get_cached).
+
+    Cache misses are always read from the primary: a lagging replica would
+    cache a token just deleted or a user just deactivated again.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cached = get_cached(cache, key)
+        if cached is not None:
+            token_cache_stats.hit()
+            pin_if_new(cached[1])
+            return cached
+
+        token_cache_stats.miss()
+        marker = get_marker(cache, key)
+        # Token sai hoặc user inactive sẽ raise AuthenticationFailed,
+        # nên không bị cache.
+        with use_primary():
+            user, token = super().authenticate_credentials(key)
+        pin_if_new(token)
+        if marker is not None:
+            cache.set(token_cache_key(key), (user, token, marker))
+        return user, token
+
+    # Bản async cho view async (ASGI): cùng cache và cùng thông báo lỗi.
+    async def aauthenticate(self, request):
+        """Async authenticate() for native async Django views."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed(_('Invalid token header.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed(_('Invalid token header.'))
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        cache = get_token_cache()
+        cached = await aget_cached(cache, key)
+        if cached is not None:
+            token_cache_stats.hit()
+            pin_if_new(cached[1])
+            return cached
+
+        token_cache_stats.miss()
+        marker = await aget_marker(cache, key)
+        model = self.get_model()
+        queryset = model.objects.select_related('user')
+        try:
+            with use_primary():
+                token = await aget(queryset, key=key)
+        except model.DoesNotExist:
+            raise AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+        pin_if_new(token)
+
+        if marker is not None:
+            await cache.aset(token_cache_key(key), (token.user, token, marker))
+        return token.user, token
+
+    @staticmethod
+    def stats():
+        """Return the hit/miss counters of this process."""
+        return token_cache_stats.as_dict()
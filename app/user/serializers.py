@@ -8,13 +8,20 @@ from rest_framework import serializers
 
 from django.utils.translation import gettext as _
 
-class UserSerializer(serializers.ModelSerializer):
+from core.metrics import TimedSerializerMixin
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     
     class Meta:
         # Lấy model người dùng tùy chỉnh.
         model = get_user_model() 
         # Chỉ định các trường cho phép trong API (email, password, name).
-        fields = ("email", "password", "name")
+        fields = (
+            "email", "password", "name", "recipe_count", "recipes_updated_at",
+        )
+        # Số recipe và thời điểm ghi recipe gần nhất: chỉ đọc, do
+        # User.objects.touch_recipes cập nhật.
+        read_only_fields = ("recipe_count", "recipes_updated_at")
         # Đặt password là write_only (không trả về trong response) và yêu cầu độ dài tối thiểu 5 ký tự.
         extra_kwargs = {"password": {"write_only": True, "min_length": 5}}
 
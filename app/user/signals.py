@@ -0,0 +1,22 @@
+"""Signal handlers keeping the token auth cache consistent."""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from user.authentication import invalidate_token, invalidate_user
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    """Forget a token as soon as it is deleted."""
+    invalidate_token(instance.key)
+
+
+# Invalidate mỗi khi User được lưu (is_active, name, email...) để cache
+# không bao giờ trả về user cũ.
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created, **kwargs):
+    """Forget the cached token lookup of a changed user."""
+    if not created:
+        invalidate_user(instance.pk)
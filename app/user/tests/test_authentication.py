@@ -0,0 +1,154 @@
+"""Tests for the cached token authentication."""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from core.checks import check_token_cache
+from user.authentication import (
+    CachedTokenAuthentication,
+    get_token_cache,
+    marker_cache_key,
+    token_cache_stats,
+)
+
+me_url = reverse('user:me')
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test token lookups are cached and invalidated."""
+
+    def setUp(self):
+        get_token_cache().clear()
+        token_cache_stats.reset()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='test name',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_second_lookup_is_cached(self):
+        """Test the second request authenticates without a DB query."""
+        res = self.client.get(me_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        auth = CachedTokenAuthentication()
+        with self.assertNumQueries(0):
+            user, token = auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+        self.assertEqual(token, self.token)
+        self.assertEqual(
+            CachedTokenAuthentication.stats(), {'hits': 1, 'misses': 1}
+        )
+
+    def test_invalid_token_not_cached(self):
+        """Test a bad token is rejected every time."""
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        for _ in range(2):
+            res = self.client.get(me_url)
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(token_cache_stats.hits, 0)
+
+    def test_deleted_token_invalidated(self):
+        """Test deleting a token drops its cached lookup."""
+        self.client.get(me_url)
+        self.token.delete()
+
+        res = self.client.get(me_url)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_invalidated(self):
+        """Test deactivating a user drops the cached lookup."""
+        self.client.get(me_url)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(me_url)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_evicted_marker_is_a_miss(self):
+        """Test a token entry without its marker is read again from the DB."""
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(self.token.key)
+        get_token_cache().delete(marker_cache_key(self.token.key))
+
+        with self.assertNumQueries(1):
+            auth.authenticate_credentials(self.token.key)
+        self.assertEqual(
+            CachedTokenAuthentication.stats(), {'hits': 0, 'misses': 2}
+        )
+
+    def test_deactivated_user_invalidated_past_max_entries(self):
+        """Test a busy token is revoked while other tokens fill the cache."""
+        caches = {
+            **settings.CACHES,
+            settings.TOKEN_AUTH_CACHE: {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'auth-tokens-small',
+                'OPTIONS': {'MAX_ENTRIES': 10},
+            },
+        }
+        others = [
+            Token.objects.create(user=get_user_model().objects.create_user(
+                email=f'other{i}@example.com', password='testpass123'
+            ))
+            for i in range(20)
+        ]
+        with override_settings(CACHES=caches):
+            get_token_cache().clear()
+            for other in others:
+                res = self.client.get(me_url)
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                client = APIClient()
+                client.credentials(HTTP_AUTHORIZATION=f'Token {other.key}')
+                client.get(me_url)
+            self.user.is_active = False
+            self.user.save()
+
+            res = self.client.get(me_url)
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_updated_user_not_stale(self):
+        """Test profile changes are visible on the next request."""
+        self.client.get(me_url)
+        self.client.patch(me_url, {'name': 'updated name'})
+
+        res = self.client.get(me_url)
+        self.assertEqual(res.data['name'], 'updated name')
+
+    async def test_async_lookup_shares_cache(self):
+        """Test aauthenticate_credentials uses the same cache entries."""
+        auth = CachedTokenAuthentication()
+        user, token = await auth.aauthenticate_credentials(self.token.key)
+        self.assertEqual(token, self.token)
+        self.assertEqual(
+            auth.authenticate_credentials(self.token.key), (user, token)
+        )
+        self.assertEqual(
+            CachedTokenAuthentication.stats(), {'hits': 1, 'misses': 1}
+        )
+
+    async def test_async_invalid_token(self):
+        """Test an unknown token fails like the sync path."""
+        with self.assertRaises(AuthenticationFailed):
+            await CachedTokenAuthentication().aauthenticate_credentials('bad')
+
+
+class TokenCacheCheckTests(TestCase):
+    """Test the warning about per-process token caches."""
+
+    def test_single_worker(self):
+        self.assertEqual(check_token_cache(None), [])
+
+    @override_settings(WEB_CONCURRENCY=4)
+    def test_several_workers_with_local_cache(self):
+        self.assertEqual(
+            [error.id for error in check_token_cache(None)], ['core.W001']
+        )
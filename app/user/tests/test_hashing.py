@@ -0,0 +1,83 @@
+"""Tests for password hashing on token issuance."""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.throttling import get_throttle_cache
+
+token_url = reverse('user:token')
+stats_url = reverse('user:hashing-stats')
+
+PBKDF2 = 'django.contrib.auth.hashers.PBKDF2PasswordHasher'
+ARGON2 = 'core.hashers.Argon2PasswordHasher'
+BCRYPT = 'core.hashers.BCryptSHA256PasswordHasher'
+
+
+class PasswordRehashTests(TestCase):
+    """Test old hashes are upgraded when the user logs in."""
+
+    def setUp(self):
+        get_throttle_cache().clear()
+        self.client = APIClient()
+        self.payload = {'email': 'test@example.com', 'password': 'pass12345'}
+
+    def create_user_with(self, hasher):
+        with override_settings(PASSWORD_HASHERS=[hasher]):
+            return get_user_model().objects.create_user(**self.payload)
+
+    @override_settings(PASSWORD_HASHERS=[ARGON2, PBKDF2])
+    def test_pbkdf2_rehashed_to_argon2_on_login(self):
+        user = self.create_user_with(PBKDF2)
+        res = self.client.post(token_url, self.payload)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('argon2$argon2id$'))
+        self.assertTrue(user.check_password(self.payload['password']))
+
+    @override_settings(
+        PASSWORD_HASHERS=[BCRYPT, ARGON2], PASSWORD_BCRYPT_ROUNDS=4
+    )
+    def test_argon2_rehashed_to_bcrypt_on_login(self):
+        user = self.create_user_with(ARGON2)
+        self.client.post(token_url, self.payload)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('bcrypt_sha256$'))
+
+    @override_settings(PASSWORD_HASHERS=[ARGON2])
+    def test_wrong_password_not_rehashed(self):
+        user = self.create_user_with(ARGON2)
+        encoded = user.password
+        with self.settings(PASSWORD_ARGON2_MEMORY_COST=8192):
+            res = self.client.post(
+                token_url, {**self.payload, 'password': 'wrong'}
+            )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        user.refresh_from_db()
+        self.assertEqual(user.password, encoded)
+
+
+class HashingStatsApiTests(TestCase):
+    """Test the hashing pool stats endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_stats_require_staff(self):
+        user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        self.client.force_authenticate(user)
+        res = self.client.get(stats_url)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_stats_for_staff(self):
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'testpass123'
+        )
+        self.client.force_authenticate(admin)
+        res = self.client.get(stats_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('queued', res.data)
+        self.assertGreaterEqual(res.data['completed'], 1)
@@ -3,6 +3,8 @@ from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from core.throttling import get_throttle_cache
+
 # Tạo URL từ tên view (URL name).
 # reverse được dùng để lấy URL tương ứng với một tên route (URL name) đã được định nghĩa trong file urls.py.
 # Trả về một chuỗi URL (ví dụ: '/api/user/token/').
@@ -13,6 +15,8 @@ class TokenAPITests(APITestCase):
 
     def setUp(self):
         """Set up common data for all tests."""
+        # Mọi request đến từ cùng IP: bucket token mới cho mỗi test.
+        get_throttle_cache().clear()
         self.user_details = {
             'name': 'test name',
             'email': 'test@example.com',
@@ -16,6 +16,9 @@ from rest_framework.test import APIClient
 # Cung cấp mã trạng thái HTTP (ví dụ: status.HTTP_201_CREATED).
 from rest_framework import status
 
+from core.models import Recipe
+from core.throttling import get_throttle_cache
+
 # Định nghĩa hằng số URL cho endpoint /user/create/ bằng reverse
 # user:create: Tên URL (namespace user, view create)
 # Ý nghĩa: Sử dụng hằng số để tái sử dụng URL trong các test, tránh hardcode, giúp truy cập endpoint dễ dàng và linh hoạt nếu URL thay đổi.
@@ -45,6 +48,8 @@ class PublicUserAPITests(TestCase):
         # Tạo instance của APIClient để gửi yêu cầu HTTP.
         # Đảm bảo mỗi test có client riêng để gửi yêu cầu tới API.
         self.client = APIClient()
+        # Mọi request đến từ cùng IP: bucket token/tạo user mới cho mỗi test.
+        get_throttle_cache().clear()
         self.user_details = {
             'name': 'test name',
             'email': 'test@example.com',
@@ -170,7 +175,9 @@ class PrivateUserAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, {
             'name': self.user.name,
-            'email': self.user.email
+            'email': self.user.email,
+            'recipe_count': 0,
+            'recipes_updated_at': None,
         })
         
     # Test 2: Không cho phép POST
@@ -190,13 +197,32 @@ class PrivateUserAPITests(TestCase):
         self.assertEqual(self.user.name, payload['name'])
         self.assertTrue(self.user.check_password(payload['password']))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        
-    
-        
-    
-    
-    
-        
-        
-    
-    
\ No newline at end of file
+
+    # Test 4: Conditional GET
+    def test_retrieve_profile_not_modified(self):
+        """Test an unchanged profile answers If-None-Match with 304."""
+        res = self.client.get(me_url)
+        etag = res['ETag']
+        res = self.client.get(me_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+        self.assertEqual(res['ETag'], etag)
+
+        self.client.patch(me_url, {'name': 'new name'})
+        res = self.client.get(me_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    # Test 5: Số recipe trong profile
+    def test_profile_recipe_count(self):
+        """Test the profile shows the recipe count without a stale ETag."""
+        etag = self.client.get(me_url)['ETag']
+        Recipe.objects.create(
+            user=self.user, title='Recipe', time_minutes=5, price=1
+        )
+
+        res = self.client.get(me_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['recipe_count'], 1)
+        self.assertIsNotNone(res.data['recipes_updated_at'])
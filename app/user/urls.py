@@ -16,4 +16,9 @@ urlpatterns = [
     path('token/', views.CreateTokenView.as_view(), name='token'),
     # ánh xạ /me/ đến ManageUserView
     path('me/', views.ManageUserView.as_view(), name='me'),
+    # Thống kê thread pool băm mật khẩu (staff).
+    path(
+        'hashing-stats/', views.HashingStatsView.as_view(),
+        name='hashing-stats',
+    ),
 ]
\ No newline at end of file
@@ -3,8 +3,14 @@ from user.serializers import UserSerializer
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
-from rest_framework import generics, authentication, permissions
+from django.contrib.auth import get_user_model
+from rest_framework import generics, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from user.serializers import UserSerializer, AuthTokenSerializer
+from user.authentication import CachedTokenAuthentication
+from core.conditional import make_etag, not_modified, set_validators
+from core.hashing import get_hashing_pool
 
 """
     CreateUserView là một class-based view trong DFR
@@ -27,14 +33,20 @@ class CreateUserView(generics.CreateAPIView):
     """Create a new user in the system."""
     # chỉ định view sẽ sử dụng UserSerializer để xử lý dữ liệu đầu vào và đầu ra
     serializer_class = UserSerializer
+    throttle_scope = 'user-create'
     
 # Kế thừa obtain_auth_token (view có sẵn của DRF) để tận dụng logic tạo token.
 class CreateTokenView(ObtainAuthToken):
     """Create a new auth token for a user."""
     # Ghi đè serializer_class để dùng AuthTokenSerializer tùy chỉnh (hỗ trợ email thay vì username).
     serializer_class = AuthTokenSerializer
-    # Thêm renderer_classes để đảm bảo giao diện API trong trình duyệt hoạt động
+    # ObtainAuthToken chỉ dùng JSONRenderer: dùng renderer/parser mặc định của
+    # project (orjson, MessagePack, giao diện API trong trình duyệt khi DEBUG).
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
+    # ObtainAuthToken tắt throttle: bật lại, giới hạn chặt theo IP.
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    throttle_scope = 'token'
     
 # Kế thừa RetrieveUpdateAPIView để hỗ trợ GET (truy xuất) và PATCH/PUT (cập nhật).
 class ManageUserView(generics.RetrieveUpdateAPIView):
@@ -42,14 +54,47 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     # Sử dụng serializer đã tùy chỉnh.
     serializer_class = UserSerializer
     
-    # Yêu cầu xác thực bằng token.
-    authentication_classes = [authentication.TokenAuthentication]
+    # Yêu cầu xác thực bằng token (có cache token -> user).
+    authentication_classes = [CachedTokenAuthentication]
     
     # Chỉ người dùng đã xác thực mới truy cập được.
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'user'
 
-    # Trả về user đã xác thực từ token
+    # Trả về user đã xác thực từ token. User trong cache token có thể có
+    # recipe_count/recipes_updated_at cũ: đọc lại hai trường này (một query
+    # theo primary key, không đếm bảng recipe).
     def get_object(self):
         """Retrieve and return the authenticated user."""
-        return self.request.user
-    
\ No newline at end of file
+        user = self.request.user
+        user.recipe_count, user.recipes_updated_at = (
+            get_user_model().objects.filter(pk=user.pk)
+            .values_list('recipe_count', 'recipes_updated_at').get()
+        )
+        return user
+
+    # Conditional GET: ETag tính từ chính các trường được trả về, không
+    # serialize; chỉ một query theo primary key (get_object) đọc lại số đếm
+    # recipe, user có sẵn từ authentication.
+    def retrieve(self, request, *args, **kwargs):
+        user = self.get_object()
+        etag = make_etag(
+            'me', user.pk, user.email, user.name, user.recipe_count,
+            user.recipes_updated_at, request.accepted_media_type,
+        )
+        response = not_modified(request, etag)
+        if response is None:
+            response = set_validators(
+                super().retrieve(request, *args, **kwargs), etag
+            )
+        return response
+
+
+class HashingStatsView(APIView):
+    """Queue depth and counters of the password hashing pool."""
+    authentication_classes = [CachedTokenAuthentication]
+    # Chỉ staff xem được thống kê.
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_hashing_pool().stats())